@@ -0,0 +1,47 @@
+from airflow import DAG
+from airflow.operators.bash import BashOperator
+from datetime import datetime, timedelta
+from airflow.models import Variable
+
+PROJECT_HOME = Variable.get("PROJECT_HOME")
+CONFIG_PATH = Variable.get("CONFIG_PATH")
+VENV_PATH = Variable.get("VENV_PATH")
+
+default_args = {
+    'owner': 'bishesh',
+    'depends_on_past': False,
+    'email_on_failure': False,
+    'email_on_retry': False,
+    'retries': 1,
+    'retry_delay': timedelta(minutes=5),
+}
+
+with DAG(
+    'ashrae_incremental_dag',
+    default_args=default_args,
+    description='ASHRAE daily warm-start model refresh (falls back to full retrain on schedule/drift)',
+    schedule_interval='@daily',
+    start_date=datetime(2026, 1, 1),
+    catchup=False,
+    tags=['mlops', 'training', 'ashrae'],
+) as dag:
+
+    preprocess_data = BashOperator(
+        task_id='preprocess_data',
+        bash_command=f"""
+            cd {PROJECT_HOME} &&
+            {VENV_PATH} \
+            main.py --stage preprocessing --config {CONFIG_PATH}
+        """
+    )
+
+    incremental_train = BashOperator(
+        task_id='incremental_train_model',
+        bash_command=f"""
+            cd {PROJECT_HOME} &&
+            {VENV_PATH}  \
+            main.py --stage train --mode incremental --config {CONFIG_PATH}
+        """
+    )
+
+    preprocess_data >> incremental_train
@@ -0,0 +1,46 @@
+"""
+Production serving: a gunicorn master with uvicorn workers.
+
+    gunicorn -c app/backend/gunicorn_conf.py app.backend.server:app
+
+The master imports the app (preload_app) and loads the preprocessor and
+serving models once, then forks the workers, which share those pages
+copy-on-write. Settings come from serving.server in the pipeline config;
+WEB_CONCURRENCY and SERVING_THREADS override the worker and thread counts
+(workers default to one per core).
+"""
+import gc
+import multiprocessing
+import os
+from src.common.config_loader import load_yaml_config
+
+server_cfg = (load_yaml_config("configs/pipeline_config.yaml").get('serving') or {}).get('server') or {}
+
+# Must be set before LightGBM's OpenMP runtime loads: parallelism comes from workers and threads.
+# Fixed at 1 rather than configurable: the master loads models and scores parity rows before
+# forking, and with more than one thread GNU OpenMP starts its thread pool there; forked
+# workers then hang on their first parallel region, since the pool's threads do not survive fork.
+os.environ["OMP_NUM_THREADS"] = "1"
+
+bind = os.getenv("BIND", server_cfg.get('bind', "0.0.0.0:8000"))
+workers = int(os.getenv("WEB_CONCURRENCY", server_cfg.get('workers') or multiprocessing.cpu_count()))
+worker_class = server_cfg.get('worker_class', "uvicorn.workers.UvicornWorker")
+timeout = server_cfg.get('timeout', 60)
+preload_app = True
+
+def when_ready(server):
+    from app.backend.services.model_service import ModelService
+    from app.backend.services.metrics import registry
+    # Before any snapshot is written: files left by a previous run would be summed in
+    registry.clear_multiprocess_dir()
+    ModelService().preload_models()
+    # The master's model load times, reported under its pid alongside the workers'
+    registry.write_snapshot()
+    # Keep the garbage collector from touching (and so un-sharing) the preloaded objects
+    gc.freeze()
+
+def post_fork(server, worker):
+    from app.backend.services.model_service import ModelService
+    from app.backend.services.metrics import registry
+    ModelService().after_fork()
+    registry.after_fork()
@@ -0,0 +1,27 @@
+from typing import List, Union
+from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
+from app.backend.schemas.request_schema import PredictionInput, ExplanationOutput
+from app.backend.services.model_service import ModelService
+
+router = APIRouter(prefix="/api/v1", tags=["Explainability"])
+model_service = ModelService()
+
+@router.post("/explain", response_model=ExplanationOutput)
+async def explain(data: Union[List[PredictionInput], PredictionInput]):
+    """
+    Per-feature TreeSHAP contributions for one record or a batch. Runs on
+    a worker thread so the event loop keeps serving other requests.
+    """
+    records = data if isinstance(data, list) else [data]
+    if not records:
+        raise HTTPException(status_code=422, detail="At least one record is required")
+
+    version = records[0].model_version
+    try:
+        explanations = await run_in_threadpool(
+            model_service.explain, [r.dict() for r in records], version
+        )
+        return ExplanationOutput(explanations=explanations, model_version=version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
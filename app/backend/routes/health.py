@@ -1,14 +1,28 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
 from app.backend.services.model_service import ModelService
+from app.backend.services.metrics import registry
 
 
 router = APIRouter(tags=["System"])
 
 @router.get("/health")
 def health_check():
-    return {"status": "online", "model_version": "LGBM-v1"}
+    served = ModelService().served_models()
+    return {"status": "online", "model_version": served.get("latest"), "served_models": served}
 
 @router.get("/metadata")
 def get_metadata():
     service = ModelService()
-    return service.get_detailed_metadata()
\ No newline at end of file
+    return service.get_detailed_metadata()
+
+@router.get("/admission")
+def get_admission_stats(request: Request):
+    """Per-route concurrency, queue depth and shed-request counters for this worker."""
+    limiters = getattr(request.app.state, "admission_limiters", {})
+    return {prefix: limiter.stats() for prefix, limiter in limiters.items()}
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """Request, inference-step, model-load and cache metrics in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,17 +1,63 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import HTMLResponse
+from functools import lru_cache
+from fastapi import APIRouter, Request
+from fastapi.responses import HTMLResponse, Response
+from starlette.concurrency import run_in_threadpool
 from src.monitoring.monitor import ModelMonitor
 from src.common.config_loader import load_yaml_config
+from app.backend.services.report_cache import ReportCache
+from app.backend.services.model_service import ModelService
+from app.backend.services.metrics import registry
 
 router = APIRouter(prefix="/api/v1/monitoring", tags=["Model Monitoring"])
 
 config = load_yaml_config("configs/pipeline_config.yaml")
+report_cfg = config['monitoring'].get('report') or {}
+
+@lru_cache(maxsize=1)
+def get_monitor() -> ModelMonitor:
+    """One monitor per process, so the cleaned reference data is loaded once."""
+    return ModelMonitor(config)
+
+report_cache = ReportCache(
+    render=lambda: get_monitor().render_html_report(),
+    path=report_cfg.get('path', "src/monitoring/reports/latest_monitoring_report.html"),
+    refresh_interval_s=report_cfg.get('refresh_interval_s', 300),
+    min_refresh_interval_s=report_cfg.get('min_refresh_interval_s', 30)
+)
 
 @router.get("/report", response_class=HTMLResponse)
-async def get_model_monitoring_report():
+async def get_model_monitoring_report(request: Request, refresh: bool = False):
+    """
+    Serves the latest Evidently AI health dashboard, rendered in the background.
+    `refresh=true` re-renders it first (at most once per min_refresh_interval_s;
+    concurrent refreshes share one render).
+    """
+    report = report_cache.current()
+    if refresh or report is None:
+        report = await run_in_threadpool(report_cache.refresh, 0 if report is None else report_cache.min_refresh_interval)
+    if report is None:
+        detail = report_cache.last_error or "Report is not available yet"
+        return HTMLResponse(f"<html><body><h1>Monitoring Error</h1><p>{detail}</p></body></html>", status_code=503)
+
+    headers = {"ETag": report.etag, "Last-Modified": report.last_modified, "Cache-Control": "no-cache"}
+    if report.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=report.html, status_code=200, headers=headers)
+
+@router.get("/report/status")
+def get_report_status():
+    """Age of the served report and background render counters for this worker."""
+    return report_cache.stats()
+
+@router.get("/drift")
+def get_streaming_drift():
     """
-    Generates and serves a real-time Evidently AI health dashboard.
+    PSI / Jensen-Shannon / KS drift scores of recent inferences against the
+    reference profile, pooled over every worker that shares the metrics
+    multiprocess_dir (other workers' windows lag by up to flush_interval_s).
+    Without a multiprocess_dir only this worker's window is scored.
     """
-    monitor = ModelMonitor(config)
-    html_report = monitor.generate_html_report()
-    return HTMLResponse(content=html_report, status_code=200)
\ No newline at end of file
+    drift_monitor = ModelService().drift_monitor
+    if drift_monitor is None:
+        return {"status": "disabled", "drift_share": None, "features": {}}
+    return drift_monitor.report(registry.gather("drift"))
@@ -1,17 +1,68 @@
-from fastapi import APIRouter, HTTPException
-from app.backend.schemas.request_schema import PredictionInput, PredictionOutput
+from fastapi import APIRouter, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+from app.backend.schemas.request_schema import PredictionInput, PredictionOutput, BatchPredictionOutput
 from app.backend.services.model_service import ModelService
+from app.backend.services import batch_codec
+from app.backend.services.batcher import MicroBatcher
+from app.backend.services.metrics import observe_request_parsing
 
 router = APIRouter(prefix="/api/v1", tags=["Inference"])
 model_service = ModelService()
 
+batching_cfg = (model_service.config.get('serving') or {}).get('micro_batching') or {}
+batcher = None
+if batching_cfg.get('enabled', False):
+    batcher = MicroBatcher(
+        model_service.predict_records,
+        max_batch_size=batching_cfg.get('max_batch_size', 64),
+        max_wait_ms=batching_cfg.get('max_wait_ms', 2.0)
+    )
+
 @router.post("/predict", response_model=PredictionOutput)
-async def predict(data: PredictionInput):
+async def predict(data: PredictionInput, request: Request):
+    observe_request_parsing(request.scope)
     try:
-        print(f"Received prediction request: {data}")
-        result = model_service.predict(data.dict(), version=data.model_version)
-        return PredictionOutput(meter_reading=result)
+        if batcher is not None:
+            result = await batcher.submit(data.dict(), version=data.model_version)
+            return PredictionOutput(meter_reading=result, model_version=data.model_version)
+
+        # CPU-bound scoring (and any cold model load) runs on the sized thread pool, not the event loop
+        result = await run_in_threadpool(model_service.predict, data.dict(), data.model_version)
+        return PredictionOutput(meter_reading=result, model_version=data.model_version)
     except Exception as e:
         import traceback
         print(traceback.format_exc())
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+REQUIRED_COLUMNS = [name for name in PredictionInput.__fields__ if name != "model_version"]
+
+@router.post("/predict/batch", response_model=BatchPredictionOutput)
+async def predict_batch(request: Request, model_version: str = "latest"):
+    """
+    Scores many records in one call. The body is a JSON array of
+    PredictionInput records, an Arrow IPC stream or a Parquet file (set
+    Content-Type accordingly); predictions come back in the same format.
+    """
+    content_type = request.headers.get("content-type", batch_codec.JSON)
+    try:
+        frame = batch_codec.decode_batch(await request.body(), content_type)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Could not decode batch: {e}")
+    observe_request_parsing(request.scope)
+
+    missing = batch_codec.missing_columns(frame, REQUIRED_COLUMNS)
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing columns: {missing}")
+
+    try:
+        predictions = await run_in_threadpool(model_service.predict_batch, frame, model_version)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if batch_codec.media_type(content_type) == batch_codec.JSON:
+        return BatchPredictionOutput(
+            meter_readings=predictions.tolist(), count=len(predictions), model_version=model_version
+        )
+
+    body, media_type = batch_codec.encode_predictions(predictions, model_version, content_type)
+    return Response(content=body, media_type=media_type)
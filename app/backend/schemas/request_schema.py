@@ -1,4 +1,7 @@
-from pydantic import BaseModel, Field
+import calendar
+from typing import Dict, List
+from pydantic import BaseModel, Field, root_validator
+from src.preprocessing.fast_path import INFERENCE_YEAR
 
 class PredictionInput(BaseModel):
     building_id: int = Field(..., example=10)
@@ -13,15 +16,39 @@ class PredictionInput(BaseModel):
     sea_level_pressure: float = Field(..., example=1012.0)
     wind_direction: float = Field(..., example=160.0)
     wind_speed: float = Field(..., example=4.0)
-    day: int = Field(..., example=1)
-    month: int = Field(..., example=5)
+    day: int = Field(..., example=1, ge=1, le=31)
+    month: int = Field(..., example=5, ge=1, le=12)
     week: int = Field(..., example=18)
-    hour: int = Field(..., example=12)
+    hour: int = Field(..., example=12, ge=0, le=23)
     is_weekend: int = Field(..., example=0)
 
     model_version: str = Field(default="latest", description="The version of the model to use for inference")
 
+    @root_validator(skip_on_failure=True)
+    def day_exists_in_month(cls, values):
+        """Rejects dates like February 30 with a 422 rather than failing in feature engineering."""
+        month, day = values["month"], values["day"]
+        if day > calendar.monthrange(INFERENCE_YEAR, month)[1]:
+            raise ValueError(f"day {day} does not exist in month {month} of {INFERENCE_YEAR}")
+        return values
+
 class PredictionOutput(BaseModel):
     meter_reading: float
     status: str = "success"
-    model_version: str = "latest"
\ No newline at end of file
+    model_version: str = "latest"
+
+class BatchPredictionOutput(BaseModel):
+    meter_readings: List[float]
+    count: int
+    status: str = "success"
+    model_version: str = "latest"
+
+class FeatureExplanation(BaseModel):
+    meter_reading: float
+    expected_value: float
+    contributions: Dict[str, float]
+
+class ExplanationOutput(BaseModel):
+    explanations: List[FeatureExplanation]
+    status: str = "success"
+    model_version: str = "latest"
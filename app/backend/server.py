@@ -1,14 +1,78 @@
+import os
 import uvicorn
+from anyio import to_thread
 from fastapi import FastAPI
 
 # Always import starting from the project root
-from app.backend.routes import predict, health, monitoring 
+from app.backend.routes import predict, health, monitoring, explain
+from app.backend.services.model_service import ModelService
+from app.backend.services.admission import AdmissionMiddleware, build_limiters
+from app.backend.services.metrics import MetricsMiddleware, registry
 
 app = FastAPI(title="ASHRAE MLOps API")
 
+admission_cfg = (ModelService().config.get('serving') or {}).get('admission') or {}
+app.state.admission_limiters = build_limiters(admission_cfg) if admission_cfg.get('enabled', True) else {}
+if app.state.admission_limiters:
+    app.add_middleware(
+        AdmissionMiddleware,
+        limiters=app.state.admission_limiters,
+        retry_after_s=admission_cfg.get('retry_after_s', 1)
+    )
+
+metrics_cfg = (ModelService().config.get('serving') or {}).get('metrics') or {}
+if metrics_cfg.get('enabled', True):
+    registry.configure(metrics_cfg.get('multiprocess_dir'), metrics_cfg.get('flush_interval_s', 5))
+    # Added last, so it is outermost: requests shed by admission control show up as 503s
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(predict.router)
 app.include_router(health.router)
 app.include_router(monitoring.router)
+app.include_router(explain.router)
+
+@app.on_event("startup")
+async def size_thread_pool():
+    """Caps the thread pool that CPU-bound handlers are offloaded to (per worker process)."""
+    server_cfg = (ModelService().config.get('serving') or {}).get('server') or {}
+    threads = int(os.getenv("SERVING_THREADS", server_cfg.get('threads', 4)))
+    to_thread.current_default_thread_limiter().total_tokens = threads
+
+@app.on_event("startup")
+def preload_models():
+    """Loads the configured model versions and starts registry polling before traffic arrives."""
+    service = ModelService()
+    service.preload_models()
+    service.start_model_refresher()
+    service.metadata_cache.refresh_async()
+
+@app.on_event("startup")
+def start_metrics_flusher():
+    registry.start_flusher()
+
+@app.on_event("startup")
+def start_report_refresher():
+    """Renders the monitoring report in the background so requests only read the last one."""
+    monitoring.report_cache.start()
+
+@app.on_event("shutdown")
+def stop_model_refresher():
+    ModelService().stop_model_refresher()
+
+@app.on_event("shutdown")
+def stop_report_refresher():
+    monitoring.report_cache.stop()
+
+@app.on_event("shutdown")
+def stop_metrics_flusher():
+    registry.stop_flusher()
+
+@app.on_event("shutdown")
+def flush_inference_logs():
+    """Writes any buffered inference log rows before the process exits."""
+    inference_logger = ModelService().inference_logger
+    if inference_logger is not None:
+        inference_logger.close()
 
 @app.get("/")
 def root():
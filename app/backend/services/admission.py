@@ -0,0 +1,139 @@
+import asyncio
+import json
+import time
+from collections import deque
+from typing import Dict, Optional
+
+class ConcurrencyLimiter:
+    """
+    Admission control for one route: at most `max_concurrent` requests run
+    at once and at most `max_queue` wait for a slot, in arrival order, for
+    up to `queue_timeout_ms`. Anything beyond that is rejected immediately,
+    so a spike costs the excess requests a fast error instead of costing
+    every request its latency. Slots are handed directly from a finishing
+    request to the next waiter. Per event loop (i.e. per worker process).
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int = 0, queue_timeout_ms: Optional[float] = None):
+        self.max_concurrent = max(int(max_concurrent), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.queue_timeout = queue_timeout_ms / 1000.0 if queue_timeout_ms else None
+        self.in_flight = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self) -> bool:
+        """True once the caller holds a slot; False if it was shed (queue full or wait timed out)."""
+        if self.in_flight < self.max_concurrent and not self._waiters:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except asyncio.TimeoutError:
+            # A slot may have been handed over just as the wait expired; if so, keep it
+            if not waiter.done():
+                self._drop_waiter(waiter)
+                self.timed_out += 1
+                return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._drop_waiter(waiter)
+            raise
+
+        self.admitted += 1
+        return True
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _drop_waiter(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        waiter.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent, "max_queue": self.max_queue,
+            "in_flight": self.in_flight, "queued": self.queued,
+            "admitted": self.admitted, "rejected": self.rejected, "timed_out": self.timed_out
+        }
+
+
+def build_limiters(admission_cfg: dict) -> Dict[str, ConcurrencyLimiter]:
+    """One limiter per configured route prefix (serving.admission.routes)."""
+    return {
+        prefix: ConcurrencyLimiter(
+            max_concurrent=limits.get('max_concurrent', 32),
+            max_queue=limits.get('max_queue', 0),
+            queue_timeout_ms=limits.get('queue_timeout_ms')
+        )
+        for prefix, limits in (admission_cfg.get('routes') or {}).items()
+    }
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware applying the limiter of the longest matching route
+    prefix to each HTTP request. Shed requests get a 503 with Retry-After
+    without reaching the application; unmatched routes are not limited.
+    The matched prefix and the admission time are left in the scope
+    ("admission.route", "admission.admitted_at") for outer middleware such
+    as the metrics, which never sees a route for shed requests.
+    """
+
+    def __init__(self, app, limiters: Dict[str, ConcurrencyLimiter], retry_after_s: int = 1):
+        self.app = app
+        self.limiters = limiters
+        self._prefixes = sorted(limiters, key=len, reverse=True)
+        self._rejection = json.dumps({"detail": "Server is at capacity, retry later"}).encode()
+        self._headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self._rejection)).encode()),
+            (b"retry-after", str(int(retry_after_s)).encode())
+        ]
+
+    def prefix_for(self, path: str) -> Optional[str]:
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return prefix
+        return None
+
+    async def __call__(self, scope, receive, send):
+        prefix = self.prefix_for(scope["path"]) if scope["type"] == "http" else None
+        if prefix is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[prefix]
+        scope["admission.route"] = prefix
+        if not await limiter.acquire():
+            await send({"type": "http.response.start", "status": 503, "headers": self._headers})
+            await send({"type": "http.response.body", "body": self._rejection})
+            return
+        scope["admission.admitted_at"] = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
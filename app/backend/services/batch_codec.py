@@ -0,0 +1,53 @@
+import io
+import json
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import List, Tuple
+
+JSON = "application/json"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+PARQUET = "application/vnd.apache.parquet"
+
+_ALIASES = {
+    "application/x-parquet": PARQUET,
+    "application/parquet": PARQUET,
+    "application/vnd.apache.arrow.file": ARROW_STREAM,
+    "application/x-arrow": ARROW_STREAM
+}
+
+def media_type(content_type: str) -> str:
+    """Normalised media type of a Content-Type header (parameters stripped, aliases resolved)."""
+    base = (content_type or JSON).split(";")[0].strip().lower()
+    return _ALIASES.get(base, base)
+
+def decode_batch(body: bytes, content_type: str) -> pd.DataFrame:
+    """Request body (JSON records, Arrow IPC stream/file or Parquet) as a DataFrame of records."""
+    kind = media_type(content_type)
+    if kind == PARQUET:
+        return pq.read_table(io.BytesIO(body)).to_pandas()
+    if kind == ARROW_STREAM:
+        reader = pa.ipc.open_stream(body) if body[:6] != b"ARROW1" else pa.ipc.open_file(body)
+        return reader.read_all().to_pandas()
+    if kind == JSON:
+        return pd.DataFrame(json.loads(body))
+    raise ValueError(f"Unsupported batch content type: {content_type}")
+
+def encode_predictions(predictions, model_version: str, content_type: str) -> Tuple[bytes, str]:
+    """Predictions in the same format the batch arrived in, as (body, media type)."""
+    kind = media_type(content_type)
+    if kind == JSON:
+        raise ValueError("JSON responses are built by the route's response model")
+
+    table = pa.table({"meter_reading": pa.array(predictions, type=pa.float64())},
+                     metadata={"model_version": model_version})
+    sink = io.BytesIO()
+    if kind == PARQUET:
+        pq.write_table(table, sink)
+    else:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    return sink.getvalue(), kind
+
+def missing_columns(frame: pd.DataFrame, required: List[str]) -> List[str]:
+    return [col for col in required if col not in frame.columns]
@@ -0,0 +1,87 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from starlette.concurrency import run_in_threadpool
+
+class MicroBatcher:
+    """
+    Dynamic batching of concurrent single-record requests. Requests for the
+    same model version are queued; once the first one arrives the batcher
+    collects more until `max_wait_ms` has passed or `max_batch_size` are
+    collected, whichever comes first, runs one vectorised predict over the
+    batch on a worker thread, and resolves each caller's future with its
+    own result. If the batch fails, its records are retried one by one, so
+    only the callers whose record fails get the error.
+    """
+
+    def __init__(self, predict_fn: Callable[[List[dict], str], Sequence[Any]],
+                 max_batch_size: int = 64, max_wait_ms: float = 2.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+
+    async def submit(self, record: dict, version: str = "latest") -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self._queue_for(version).put_nowait((record, future))
+        return await future
+
+    def _queue_for(self, version: str) -> asyncio.Queue:
+        queue = self._queues.get(version)
+        if queue is None:
+            queue = self._queues[version] = asyncio.Queue()
+            self._workers[version] = asyncio.get_running_loop().create_task(self._run(version, queue))
+        return queue
+
+    async def _run(self, version: str, queue: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch: List[Tuple[dict, asyncio.Future]] = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            batch = [(record, future) for record, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+
+            records = [record for record, _ in batch]
+            try:
+                outcomes = [(result, None) for result in await run_in_threadpool(self.predict_fn, records, version)]
+            except Exception as e:
+                # One bad record must not fail the callers batched with it: retry each on its own
+                outcomes = [(None, e)] if len(batch) == 1 else await run_in_threadpool(self._predict_each, records, version)
+
+            for (_, future), (result, error) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def _predict_each(self, records: List[dict], version: str) -> List[Tuple[Any, Optional[Exception]]]:
+        """(result, None) or (None, error) per record, each scored on its own."""
+        outcomes = []
+        for record in records:
+            try:
+                outcomes.append((self.predict_fn([record], version)[0], None))
+            except Exception as e:
+                outcomes.append((None, e))
+        return outcomes
+
+    async def close(self):
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._queues.clear()
+        self._workers.clear()
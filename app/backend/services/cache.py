@@ -0,0 +1,136 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+import numpy as np
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache with a fixed entry budget and an
+    optional per-entry time-to-live. Used by the serving layer to memoise
+    per-row results keyed by model version and the request features.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data), "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "expirations": self.expirations
+            }
+
+
+class PredictionCache:
+    """
+    Prediction memo keyed by the token of the concrete model that scored
+    the row and a hash of the model-ready float32 feature vector, so
+    requests that differ only in irrelevant fields or key order share an
+    entry. The in-process LRU is the first tier; an optional Redis client
+    (shared across workers) is the second, with the same TTL. When the
+    model behind a version alias changes, the alias is re-bound and local
+    entries are dropped; Redis entries of the old model are no longer
+    looked up and expire on their TTL.
+    """
+
+    def __init__(self, max_entries: int = 100_000, ttl_seconds: Optional[float] = 300,
+                 redis_client=None, key_prefix: str = "ashrae_pred"):
+        self.local = LRUCache(max_entries, ttl_seconds)
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self.key_prefix = key_prefix
+        self._served: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.invalidations = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+
+    def bind_version(self, alias: str, model_token: str):
+        """Records which concrete model serves `alias`; a change invalidates cached predictions."""
+        with self._lock:
+            previous = self._served.get(alias)
+            self._served[alias] = model_token
+        if previous is not None and previous != model_token:
+            self.local.clear()
+            self.invalidations += 1
+
+    def key(self, model_token: str, features: np.ndarray) -> str:
+        """Cache key for one model input row scored by the model identified by `model_token`."""
+        row = np.ascontiguousarray(features, dtype=np.float32).reshape(-1)
+        digest = hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest()
+        return f"{self.key_prefix}:{model_token}:{digest}"
+
+    def get(self, key: str) -> Optional[float]:
+        value = self.local.get(key)
+        if value is not None or self.redis is None:
+            return value
+        try:
+            raw = self.redis.get(key)
+        except Exception as e:
+            self.redis_errors += 1
+            print(f"--- Warning: prediction cache Redis read failed: {e} ---")
+            return None
+        if raw is None:
+            return None
+        value = float(raw)
+        self.redis_hits += 1
+        self.local.put(key, value)
+        return value
+
+    def put(self, key: str, value: float):
+        self.local.put(key, value)
+        if self.redis is None:
+            return
+        try:
+            ttl = int(np.ceil(self.ttl_seconds)) if self.ttl_seconds else None
+            self.redis.set(key, repr(float(value)), ex=ttl)
+        except Exception as e:
+            self.redis_errors += 1
+            print(f"--- Warning: prediction cache Redis write failed: {e} ---")
+
+    def stats(self) -> dict:
+        return {
+            **self.local.stats(), "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors, "invalidations": self.invalidations
+        }
@@ -0,0 +1,123 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import mlflow
+
+TERMINAL_RUN_STATES = {"FINISHED", "FAILED", "KILLED"}
+
+class RegistryMetadataCache:
+    """
+    Registry metadata (versions with their run metrics) served from memory.
+    Reads return the last fetched snapshot immediately; a snapshot older
+    than `ttl_seconds` triggers one background refresh, and concurrent
+    reads meanwhile keep getting the old one. Run metrics of finished runs
+    never change, so they are fetched once per run, concurrently; a refresh
+    costs one search_model_versions call plus a get_run per new version.
+    If MLflow is slow or down, the last-known snapshot is served, marked
+    stale, with the error.
+    """
+
+    def __init__(self, model_name: str, ttl_seconds: float = 30, initial_wait_s: float = 2.0, max_workers: int = 8):
+        self.model_name = model_name
+        self.ttl_seconds = ttl_seconds
+        self.initial_wait_s = initial_wait_s
+        self.max_workers = max(int(max_workers), 1)
+
+        # (snapshot, fetched_at), swapped as one reference
+        self._state: Optional[Tuple[dict, float]] = None
+        self._runs: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._first_fetch = threading.Event()
+        self.last_error: Optional[str] = None
+        self.refreshes = 0
+        self.failures = 0
+
+    def get(self) -> dict:
+        """The cached metadata; never waits on MLflow except briefly before the first fetch completes."""
+        state = self._state
+        if state is None or time.time() - state[1] >= self.ttl_seconds:
+            self.refresh_async()
+        if state is None:
+            self._first_fetch.wait(self.initial_wait_s)
+            state = self._state
+            if state is None:
+                return {"status": "offline", "error": self.last_error or "Model registry did not respond in time"}
+
+        snapshot, fetched_at = state
+        age = time.time() - fetched_at
+        result = {**snapshot, "as_of": fetched_at, "age_s": round(age, 1),
+                  "stale": age >= self.ttl_seconds or self.last_error is not None}
+        if self.last_error is not None:
+            result["registry_error"] = self.last_error
+        return result
+
+    def refresh_async(self):
+        """Starts a background refresh unless one is already running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh, name="registry-metadata-refresh", daemon=True).start()
+
+    def _refresh(self):
+        try:
+            self._state = (self._fetch(), time.time())
+            self.last_error = None
+            self.refreshes += 1
+        except Exception as e:
+            self.last_error = str(e)
+            self.failures += 1
+            print(f"--- Warning: registry metadata refresh failed, serving last-known data: {e} ---")
+        finally:
+            with self._lock:
+                self._refreshing = False
+            self._first_fetch.set()
+
+    def _fetch(self) -> dict:
+        client = mlflow.tracking.MlflowClient()
+        versions = client.search_model_versions(f"name='{self.model_name}'")
+
+        missing = list({v.run_id for v in versions if v.run_id and v.run_id not in self._runs})
+        fetched: Dict[str, Optional[dict]] = {}
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as pool:
+                fetched = dict(zip(missing, pool.map(lambda run_id: self._get_run(client, run_id), missing)))
+            # Runs still in progress are fetched again on the next refresh
+            self._runs.update({run_id: run for run_id, run in fetched.items()
+                               if run is not None and run["status"] in TERMINAL_RUN_STATES})
+
+        version_list: List[dict] = []
+        for v in versions:
+            run = self._runs.get(v.run_id) or fetched.get(v.run_id)
+            if run is None:
+                continue
+            version_list.append({
+                "version": v.version,
+                "stage": v.current_stage,
+                "rmse": f"{run['metrics'].get('avg_rmse', 0):.2f} kWh",
+                "accuracy": f"{(run['metrics'].get('avg_r2', 0) * 100):.1f}%",
+                "last_updated": v.last_updated_timestamp
+            })
+        return {"status": "online", "versions": version_list}
+
+    @staticmethod
+    def _get_run(client, run_id: str) -> Optional[dict]:
+        try:
+            run = client.get_run(run_id)
+            return {"status": run.info.status, "metrics": dict(run.data.metrics)}
+        except Exception:
+            return None
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def stats(self) -> dict:
+        return {
+            "age_s": None if self._state is None else round(time.time() - self._state[1], 1),
+            "ttl_seconds": self.ttl_seconds, "cached_runs": len(self._runs),
+            "refreshes": self.refreshes, "failures": self.failures, "last_error": self.last_error
+        }
@@ -0,0 +1,422 @@
+import bisect
+import json
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LOAD_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+Labels = Tuple[str, ...]
+
+class _Shard:
+    """A thread's value array, held in thread-local storage so it is released when the thread exits."""
+    __slots__ = ("values", "__weakref__")
+
+    def __init__(self, values: List[float]):
+        self.values = values
+
+
+class _ThreadShards:
+    """
+    One value array per live recording thread, summed when read. Recording
+    touches only the calling thread's array, so it takes no lock; the lock
+    is held only when a thread records for the first time, when a thread
+    exits (its values are folded into `_base`) and on reads. The number of
+    arrays is bounded by the number of live threads, however many
+    short-lived worker threads come and go.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._base = [0.0] * size
+        self._shards: List[List[float]] = []
+        self._lock = threading.Lock()
+
+    def mine(self) -> List[float]:
+        try:
+            return self._local.shard.values
+        except AttributeError:
+            values = [0.0] * self.size
+            shard = _Shard(values)
+            with self._lock:
+                self._shards.append(values)
+            weakref.finalize(shard, self._retire, values)
+            self._local.shard = shard
+            return values
+
+    def _retire(self, values: List[float]):
+        """Folds an exited thread's values into the base (arrays dropped by reset are ignored)."""
+        with self._lock:
+            for i, shard in enumerate(self._shards):
+                if shard is values:
+                    del self._shards[i]
+                    self._base = [a + b for a, b in zip(self._base, values)]
+                    break
+
+    def total(self) -> List[float]:
+        with self._lock:
+            shards = [self._base, *self._shards]
+        return [sum(column) for column in zip(*shards)]
+
+    def reset(self):
+        with self._lock:
+            self._base = [0.0] * self.size
+            self._shards = []
+            stale, self._local = self._local, threading.local()
+        # Dropped outside the lock: releasing the old holders runs their finalizers
+        del stale
+
+
+class _CounterChild(_ThreadShards):
+    def inc(self, amount: float = 1.0):
+        self.mine()[0] += amount
+
+
+class _HistogramChild(_ThreadShards):
+    def __init__(self, buckets: Tuple[float, ...]):
+        # One slot per bucket, one for +Inf, then the running sum
+        super().__init__(len(buckets) + 2)
+        self.buckets = buckets
+
+    def observe(self, value: float):
+        values = self.mine()
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-1] += value
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("child", "start")
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.child.observe(time.perf_counter() - self.start)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Labels, _ThreadShards] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self) -> _ThreadShards:
+        return _CounterChild(1)
+
+    def labels(self, *values: str):
+        """The series for these label values; hold on to it to skip the lookup on hot paths."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        return {labels: child.total() for labels, child in list(self._children.items())}
+
+    def reset(self):
+        """Zeroes every series in place, so children held by callers keep working."""
+        for child in list(self._children.values()):
+            child.reset()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        self.labels(*labels).inc(amount)
+
+
+class CallbackCounter(_Metric):
+    """Counter read from a callable at collection time (e.g. a cache's own hit counter)."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._sources: Dict[Labels, Callable[[], float]] = {}
+
+    def track(self, source: Callable[[], float], *labels: str):
+        self._sources[labels] = source
+
+    def collect(self) -> Dict[Labels, List[float]]:
+        return {labels: [float(source())] for labels, source in list(self._sources.items())}
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float, *labels: str):
+        self.labels(*labels).observe(value)
+
+    def time(self, *labels: str) -> _Timer:
+        return _Timer(self.labels(*labels))
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _label_str(names: Sequence[str], values: Sequence[str], le: Optional[str] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """
+    In-process metrics rendered in the Prometheus text exposition format.
+    Under gunicorn each worker keeps its own values; with a
+    `multiprocess_dir`, every process periodically writes a snapshot
+    there and a scrape of any worker sums the snapshots of all live
+    processes, so /metrics reports the whole server. Other workers' values
+    lag by up to `flush_interval_s`. State that is not a metric (e.g. the
+    drift monitor's window counts) can ride along via `share` and be
+    pooled across processes with `gather`.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._ratios: List[Tuple[str, str, str, str]] = []
+        self._shared: Dict[str, Callable[[], Any]] = {}
+        self.multiprocess_dir: Optional[Path] = None
+        self.flush_interval = 5.0
+        self._stop = threading.Event()
+        self._flusher = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def callback_counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> CallbackCounter:
+        return self._register(CallbackCounter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def hit_ratio(self, name: str, help: str, hits: str, misses: str):
+        """Gauge derived at render time from two (summed) counters with the same labels."""
+        self._ratios.append((name, help, hits, misses))
+
+    def share(self, name: str, source: Callable[[], Any]):
+        """Writes `source()` (JSON-serialisable) with every snapshot of this process, as `<pid>.<name>.json`."""
+        self._shared[name] = source
+
+    def gather(self, name: str) -> List[Any]:
+        """This process's current `name` state, followed by the last one written by each other live process."""
+        return [self._shared[name](), *self._other_snapshots(f".{name}.json")]
+
+    def configure(self, multiprocess_dir: Optional[str] = None, flush_interval_s: float = 5.0):
+        self.multiprocess_dir = Path(multiprocess_dir) if multiprocess_dir else None
+        self.flush_interval = flush_interval_s
+        if self.multiprocess_dir is not None:
+            self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+
+    def clear_multiprocess_dir(self):
+        """
+        Removes every snapshot in multiprocess_dir. Called by the gunicorn
+        master before forking: snapshots are trusted by pid liveness, and a
+        previous run's pid may belong to a live process again after a restart.
+        """
+        if self.multiprocess_dir is None:
+            return
+        for path in [*self.multiprocess_dir.glob("*.json"), *self.multiprocess_dir.glob("*.tmp")]:
+            path.unlink(missing_ok=True)
+
+    def snapshot(self) -> Dict[str, List]:
+        return {name: [[list(labels), values] for labels, values in metric.collect().items()]
+                for name, metric in self._metrics.items()}
+
+    def write_snapshot(self):
+        if self.multiprocess_dir is None:
+            return
+        pid = os.getpid()
+        self._write_json(self.multiprocess_dir / f"{pid}.json", self.snapshot())
+        for name, source in list(self._shared.items()):
+            self._write_json(self.multiprocess_dir / f"{pid}.{name}.json", source())
+
+    @staticmethod
+    def _write_json(path: Path, payload: Any):
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(payload))
+        os.replace(tmp_path, path)
+
+    def _other_snapshots(self, suffix: str) -> List[Any]:
+        """Contents of `<pid><suffix>` for every other live process; files of exited ones are removed."""
+        found = []
+        if self.multiprocess_dir is None:
+            return found
+        for path in self.multiprocess_dir.glob(f"*{suffix}"):
+            pid = path.name[:-len(suffix)]
+            if not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            if not _pid_alive(int(pid)):
+                # Values of exited workers drop out, like a counter reset
+                path.unlink(missing_ok=True)
+                continue
+            try:
+                found.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return found
+
+    def _merged(self) -> Dict[str, Dict[Labels, List[float]]]:
+        snapshots = [self.snapshot(), *self._other_snapshots(".json")]
+
+        merged: Dict[str, Dict[Labels, List[float]]] = {}
+        for snapshot in snapshots:
+            for name, series in snapshot.items():
+                target = merged.setdefault(name, {})
+                for labels, values in series:
+                    current = target.get(tuple(labels))
+                    target[tuple(labels)] = values if current is None else [a + b for a, b in zip(current, values)]
+        return merged
+
+    def render(self) -> str:
+        merged = self._merged()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines += [f"# HELP {name} {metric.help}", f"# TYPE {name} {metric.kind}"]
+            for labels, values in sorted(merged.get(name, {}).items()):
+                if isinstance(metric, Histogram):
+                    cumulative = 0.0
+                    for le, count in zip([*map(repr, metric.buckets), "+Inf"], values[:-1]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_label_str(metric.labelnames, labels, le)} {_fmt(cumulative)}")
+                    lines.append(f"{name}_sum{_label_str(metric.labelnames, labels)} {_fmt(values[-1])}")
+                    lines.append(f"{name}_count{_label_str(metric.labelnames, labels)} {_fmt(cumulative)}")
+                else:
+                    lines.append(f"{name}{_label_str(metric.labelnames, labels)} {_fmt(values[0])}")
+
+        for name, help, hits_name, misses_name in self._ratios:
+            hits, misses = merged.get(hits_name, {}), merged.get(misses_name, {})
+            labelnames = self._metrics[hits_name].labelnames
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+            for labels in sorted(hits):
+                total = hits[labels][0] + misses.get(labels, [0.0])[0]
+                lines.append(f"{name}{_label_str(labelnames, labels)} {_fmt(hits[labels][0] / total if total else 0.0)}")
+        return "\n".join(lines) + "\n"
+
+    def start_flusher(self):
+        """Writes this process's snapshot every flush_interval_s (only with a multiprocess_dir)."""
+        if self.multiprocess_dir is None or (self._flusher is not None and self._flusher.is_alive()):
+            return
+        self._stop.clear()
+
+        def _flush():
+            while not self._stop.wait(self.flush_interval):
+                self.write_snapshot()
+
+        self._flusher = threading.Thread(target=_flush, name="metrics-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop_flusher(self):
+        self._stop.set()
+        self.write_snapshot()
+
+    def after_fork(self):
+        """Drops values inherited from the gunicorn master, which reports them under its own pid."""
+        for metric in self._metrics.values():
+            metric.reset()
+        self._stop = threading.Event()
+        self._flusher = None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def observe_request_parsing(scope: dict):
+    """
+    Time from the request being admitted (or reaching the app, if its route
+    is not admission-limited) until the handler runs: body read, decoding
+    and validation, but not the wait for an admission slot.
+    """
+    start = scope.get("admission.admitted_at", scope.get("metrics.start"))
+    if start is not None:
+        STEP_LATENCY.observe(time.perf_counter() - start, "request_parsing")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency and status of every HTTP request,
+    labelled with the route template (so path parameters do not create new
+    series) and "unmatched" for unknown paths. It must be the outermost
+    middleware, so requests shed by admission control (503) are counted,
+    under the admission route prefix they were shed on.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = scope["metrics.start"] = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", None) or scope.get("admission.route", "unmatched")
+            REQUEST_LATENCY.observe(time.perf_counter() - start, scope["method"], route)
+            REQUESTS.inc(scope["method"], route, str(status))
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    "ashrae_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route"))
+REQUESTS = registry.counter(
+    "ashrae_http_requests_total", "HTTP requests by route and response status.", ("method", "route", "status"))
+STEP_LATENCY = registry.histogram(
+    "ashrae_inference_step_duration_seconds", "Latency of each inference step.", ("step",))
+PREDICTIONS = registry.counter(
+    "ashrae_predictions_total", "Rows scored, by requested model version and the model serving it.",
+    ("model_version", "served_model"))
+MODEL_LOAD = registry.histogram(
+    "ashrae_model_load_duration_seconds", "Model load time by source.", ("source",), buckets=LOAD_BUCKETS)
+CACHE_HITS = registry.callback_counter("ashrae_cache_hits_total", "Cache hits by cache.", ("cache",))
+CACHE_MISSES = registry.callback_counter("ashrae_cache_misses_total", "Cache misses by cache.", ("cache",))
+registry.hit_ratio("ashrae_cache_hit_ratio", "Cache hit ratio by cache.", "ashrae_cache_hits_total", "ashrae_cache_misses_total")
@@ -1,20 +1,34 @@
 import joblib
+import lightgbm as lgb
 import mlflow
 import os
 import pandas as pd
 import numpy as np
-import requests
+import threading
+from dataclasses import replace
 import time
-from typing import Dict, Any
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple, Union
 from src.common.config_loader import load_yaml_config
+from src.common.mlflow_tracker import load_registered_model
+from src.training.base import ServedModel
+from src.training.serving_bundle import SERVING_BUNDLE_ARTIFACT, load_serving_bundle, read_manifest
+from src.training.fast_predict import FastBoosterPredictor
 from src.preprocessing.preprocessing import MLPreprocessor
 from src.monitoring.collector import InferenceLogger
+from src.monitoring.drift import build_drift_monitor
 from src.database.connection import DBClient
 from src.preprocessing.feature_engineering import FeatureEngineer
+from src.preprocessing.fast_path import RowFeatureAssembler
+from src.evaluation.explainer import TreeShapExplainer
+from src.common.redis_client import RedisClient
+from app.backend.services.cache import LRUCache, PredictionCache
+from app.backend.services.metadata_cache import RegistryMetadataCache
+from app.backend.services.metrics import STEP_LATENCY, PREDICTIONS, MODEL_LOAD, CACHE_HITS, CACHE_MISSES, registry
 
 class ModelService:
     _instance = None
-    _model_cache: Dict[str, Any] = {} 
+    _model_cache: "OrderedDict[str, ServedModel]" = OrderedDict()
 
     def __new__(cls):
         if cls._instance is None:
@@ -27,98 +41,508 @@ class ModelService:
         self.model_name = self.config['mlflow']['model_name']
         self.tracking_uri = self.config['mlflow']['tracking_uri']
         self.local_model_path = self.config['training']['model_save_path']
+        self.bundle_path = self.config['training'].get('serving_bundle_path')
         prep_path = "saved_models/preprocessor.joblib"
 
-        self._preprocessor = joblib.load(prep_path) if os.path.exists(prep_path) else MLPreprocessor()
+        self._local_bundle = self._load_local_bundle()
+        # Preprocessing for models that do not come with their own (pickles, registry runs without a bundle)
+        if self._local_bundle is not None:
+            self._default_preprocessor = self._local_bundle.preprocessor
+        else:
+            self._default_preprocessor = joblib.load(prep_path) if os.path.exists(prep_path) else MLPreprocessor()
         self._feature_eng = FeatureEngineer()
 
+        serving_cfg = self.config.get('serving') or {}
+        self.models_cfg = serving_cfg.get('models') or {}
+        self.max_cached_models = self.models_cfg.get('max_cached_models', 3)
+        self.predictor_kind = serving_cfg.get('predictor', "booster")
+        self._model_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop_refresher = threading.Event()
+
+        self._explainer = TreeShapExplainer()
+        self._explain_cache = LRUCache(serving_cfg.get('explain_cache_size', 10_000))
+        self._prediction_cache = self._build_prediction_cache(serving_cfg.get('prediction_cache') or {})
+        self.drift_monitor = build_drift_monitor(self.config)
+        if self.drift_monitor is not None:
+            # Written with the metrics snapshots, so /drift can pool every worker's window
+            registry.share("drift", self.drift_monitor.window_state)
+        metadata_cfg = serving_cfg.get('metadata') or {}
+        self.metadata_cache = RegistryMetadataCache(
+            self.model_name,
+            ttl_seconds=metadata_cfg.get('ttl_seconds', 30),
+            initial_wait_s=metadata_cfg.get('initial_wait_s', 2.0),
+            max_workers=metadata_cfg.get('max_workers', 8)
+        )
+        self._track_cache_metrics()
+
         try:
             db_client = DBClient(self.config['db'])
-            self.inference_logger = InferenceLogger(db_client)
+            self.inference_logger = InferenceLogger(db_client, serving_cfg.get('inference_log'))
         except Exception as e:
             self.inference_logger = None
             print(f"--- Warning: DB Logging Offline: {e} ---")
         
+        # Registry calls run off the request path, but an outage should fail fast rather than retry for minutes
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_TIMEOUT", str(self.models_cfg.get('registry_timeout_s', 5)))
+        os.environ.setdefault("MLFLOW_HTTP_REQUEST_MAX_RETRIES", str(self.models_cfg.get('registry_max_retries', 1)))
         mlflow.set_tracking_uri(self.tracking_uri)
 
-    def _get_model(self, version: str = "latest"):
+    def _load_local_bundle(self):
+        """Serving bundle (native model + preprocessing spec) if one has been exported."""
+        if not self.bundle_path or read_manifest(self.bundle_path) is None:
+            return None
+        try:
+            with MODEL_LOAD.time("bundle"):
+                bundle = load_serving_bundle(self.bundle_path)
+            print(f"--- Loaded serving bundle {bundle.content_hash[:12]} from {self.bundle_path} ---")
+            return bundle
+        except Exception as e:
+            print(f"--- Warning: serving bundle unusable, falling back to pickles: {e} ---")
+            return None
+
+    def _build_row_assembler(self, preprocessor) -> Optional[RowFeatureAssembler]:
+        """Single-row fast path, unless disabled or the preprocessor is not fitted."""
+        if not (self.config.get('serving') or {}).get('fast_path', True):
+            return None
+        try:
+            return RowFeatureAssembler(preprocessor)
+        except RuntimeError as e:
+            print(f"--- Warning: single-row fast path disabled: {e} ---")
+            return None
+
+    def _build_prediction_cache(self, cache_cfg: dict) -> Optional[PredictionCache]:
+        """Prediction memo when enabled, with the shared Redis tier if configured and reachable."""
+        if not cache_cfg.get('enabled', False):
+            return None
+
+        redis_client = None
+        if cache_cfg.get('redis', False):
+            try:
+                redis_client = RedisClient(self.config['redis']).client
+            except Exception as e:
+                print(f"--- Warning: prediction cache running without Redis: {e} ---")
+
+        return PredictionCache(
+            max_entries=cache_cfg.get('max_entries', 100_000),
+            ttl_seconds=cache_cfg.get('ttl_seconds', 300),
+            redis_client=redis_client
+        )
+
+    def _track_cache_metrics(self):
+        CACHE_HITS.track(lambda: self._explain_cache.hits, "explain")
+        CACHE_MISSES.track(lambda: self._explain_cache.misses, "explain")
+        if self._prediction_cache is not None:
+            # Redis hits are local misses
+            cache = self._prediction_cache
+            CACHE_HITS.track(lambda: cache.local.hits + cache.redis_hits, "prediction")
+            CACHE_MISSES.track(lambda: cache.local.misses - cache.redis_hits, "prediction")
+
+    def _served(self, model, preprocessor, token: str) -> ServedModel:
+        return ServedModel(model, preprocessor, self._build_row_assembler(preprocessor), token)
+
+    def _served_bundle(self, bundle) -> ServedModel:
+        return self._served(bundle.model, bundle.preprocessor, f"local-bundle-{bundle.content_hash[:16]}")
+
+    def _wrap_predictor(self, model):
+        """Booster behind the low-overhead C API predictor if serving.predictor is "fast" and parity holds."""
+        if self.predictor_kind != "fast" or not isinstance(model, lgb.Booster):
+            return model
+        try:
+            return FastBoosterPredictor(model)
+        except Exception as e:
+            print(f"--- Warning: fast predictor disabled, serving through Booster.predict: {e} ---")
+            return model
+
+    def _set_served_model(self, version: str, served: ServedModel) -> ServedModel:
         """
-        PRIORITY LOGIC:
-        1. Internal RAM Cache
-        2. MLflow Registry (Remote)
-        3. Local .pkl file (Fallback)
+        Publishes the model behind `version`, together with its preprocessing,
+        with a single reference swap, so in-flight requests finish on the old
+        model and preprocessor. The cache is bounded: beyond
+        `max_cached_models`, the least recently used version that is not
+        preloaded is dropped. The prediction cache is re-keyed if the model
+        changed. Returns the published unit (model possibly wrapped).
         """
-        if version in self._model_cache:
-            return self._model_cache[version]
+        served = replace(served, model=self._wrap_predictor(served.model))
+        pinned = {str(v) for v in self.models_cfg.get('preload_versions', ["latest"])}
+        with self._model_lock:
+            self._model_cache[version] = served
+            self._model_cache.move_to_end(version)
+            evictable = [v for v in self._model_cache if v not in pinned and v != version]
+            while len(self._model_cache) > max(self.max_cached_models, 1) and evictable:
+                evicted = evictable.pop(0)
+                del self._model_cache[evicted]
+                print(f"--- Model cache full: unloaded version {evicted} ---")
+        if self._prediction_cache is not None:
+            self._prediction_cache.bind_version(version, served.token)
+        return served
 
+    def _registry_token(self, version: str) -> Optional[str]:
+        """
+        Token of the registry model behind `version`, or None if the registry
+        is unreachable or has no such model. "latest" is resolved with one
+        query for the highest version number.
+        """
+        if version != "latest":
+            return f"{self.model_name}-v{version}"
         try:
-            requests.get(self.tracking_uri, timeout=2)
-            
-            model_version_tag = "latest" if version == "latest" else version
-            model_uri = f"models:/{self.model_name}/{model_version_tag}"
+            client = mlflow.tracking.MlflowClient()
+            versions = client.search_model_versions(
+                f"name='{self.model_name}'", max_results=1, order_by=["version_number DESC"]
+            )
+        except Exception:
+            return None
+        return f"{self.model_name}-v{versions[0].version}" if versions else None
+
+    def _local_token(self) -> Optional[str]:
+        manifest = read_manifest(self.bundle_path) if self.bundle_path else None
+        if manifest is not None:
+            return f"local-bundle-{manifest['content_hash'][:16]}"
+        if not os.path.exists(self.local_model_path):
+            return None
+        return f"local-{int(os.path.getmtime(self.local_model_path))}"
+
+    def _registry_preprocessor(self, model_version: str):
+        """
+        Preprocessor of the training run behind a registry model version, from
+        the serving bundle logged with it. Runs without one fall back to the
+        local preprocessor.
+        """
+        try:
+            run_id = mlflow.tracking.MlflowClient().get_model_version(self.model_name, model_version).run_id
+            local_dir = mlflow.artifacts.download_artifacts(run_id=run_id, artifact_path=SERVING_BUNDLE_ARTIFACT)
+            return load_serving_bundle(local_dir).preprocessor
+        except Exception as e:
+            print(f"--- Warning: no serving bundle logged for model version {model_version} ({e}); "
+                  f"using the local preprocessor ---")
+            return self._default_preprocessor
+
+    def _load_model(self, version: str, token: Optional[str] = None) -> ServedModel:
+        """
+        PRIORITY LOGIC:
+        1. MLflow Registry (Remote), pinned to the version "latest" resolves to
+           (`token` if the caller already resolved it; a local token skips the registry)
+        2. Local serving bundle, then the local .pkl file (Fallback)
+        The model comes back with the preprocessing it was trained with.
+        """
+        if token is None:
+            token = self._registry_token(version)
+        try:
+            if token is None or token.startswith("local-"):
+                raise ConnectionError(f"no registry model for version {version} at {self.tracking_uri}")
+
+            model_version = token.rsplit('-v', 1)[1]
+            model_uri = f"models:/{self.model_name}/{model_version}"
             
             print(f"--- [PRIORITY] Fetching model from MLflow: {model_uri} ---")
-            model = mlflow.lightgbm.load_model(model_uri)
-            
-            self._model_cache[version] = model
-            return model
+            with MODEL_LOAD.time("registry"):
+                model = load_registered_model(model_uri)
+                preprocessor = self._registry_preprocessor(model_version)
+            return self._served(model, preprocessor, token)
 
         except Exception as e:
             print(f"--- MLflow unavailable or version not found ({e}). Trying Local fallback... ---")
 
+        token = self._local_token()
+        if token is not None and token.startswith("local-bundle-"):
+            bundle = self._local_bundle
+            if bundle is None or token != f"local-bundle-{bundle.content_hash[:16]}":
+                print(f"--- [FALLBACK] Loading serving bundle: {self.bundle_path} ---")
+                with MODEL_LOAD.time("bundle"):
+                    bundle = self._local_bundle = load_serving_bundle(self.bundle_path)
+            return self._served_bundle(bundle)
+
         if os.path.exists(self.local_model_path):
             print(f"--- [FALLBACK] Loading model from local disk: {self.local_model_path} ---")
-            model = joblib.load(self.local_model_path)
-            self._model_cache[version] = model
-            return model
+            with MODEL_LOAD.time("pickle"):
+                model = joblib.load(self.local_model_path)
+            return self._served(model, self._default_preprocessor, self._local_token())
         
         raise FileNotFoundError(f"Critical: Model version {version} not found in MLflow or at {self.local_model_path}")
 
+    def _get_served(self, version: str = "latest") -> ServedModel:
+        """
+        Served unit (model, preprocessing, token) for `version`, read as one
+        reference, so a concurrent swap cannot pair a model with another
+        model's preprocessing or token. Only a version that was neither
+        preloaded nor requested before loads here.
+        """
+        with self._model_lock:
+            served = self._model_cache.get(version)
+            if served is not None:
+                self._model_cache.move_to_end(version)
+                return served
+
+        with self._load_lock:
+            served = self._model_cache.get(version)
+            if served is None:
+                served = self._set_served_model(version, self._load_model(version))
+            return served
+
+    def is_model_loaded(self, version: str) -> bool:
+        return version in self._model_cache
+
+    def served_models(self) -> Dict[str, str]:
+        """Version alias -> the concrete model currently serving it."""
+        with self._model_lock:
+            return {version: served.token for version, served in self._model_cache.items()}
+
+    def ensure_model(self, version: str):
+        """Loads `version` unless it is already served."""
+        self._get_served(version)
+
+    def preload_models(self):
+        """
+        Loads every configured version before traffic arrives, so no request
+        pays the cold start. With `preload_from_bundle`, aliases start on the
+        local serving bundle (no registry round trip or download); the
+        refresher's first poll then swaps in the registry model if it differs.
+        """
+        from_bundle = self.models_cfg.get('preload_from_bundle', False) and self._local_bundle is not None
+        for version in self.models_cfg.get('preload_versions', ["latest"]):
+            version = str(version)
+            if self.is_model_loaded(version):
+                # e.g. already loaded by the gunicorn master before forking this worker
+                continue
+            if from_bundle and not version.isdigit():
+                self._set_served_model(version, self._served_bundle(self._local_bundle))
+                continue
+            try:
+                self.ensure_model(version)
+            except Exception as e:
+                print(f"--- Warning: could not preload model version {version}: {e} ---")
+
+    def after_fork(self):
+        """
+        Resets per-process state in a worker forked from a master that
+        preloaded the service: fresh locks, no inherited refresher thread,
+        and a restarted inference log writer with its own DB connections.
+        The loaded models stay shared with the master copy-on-write.
+        """
+        self._model_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._refresher = None
+        self._stop_refresher = threading.Event()
+        if self.inference_logger is not None:
+            self.inference_logger.after_fork()
+        if self.drift_monitor is not None:
+            self.drift_monitor.after_fork()
+        self.metadata_cache.after_fork()
+
+    def refresh_models(self):
+        """
+        Reloads every cached alias (e.g. "latest") whose registry version
+        moved on, off the request path, then swaps it in. Pinned numeric
+        versions are immutable and never re-checked. A model served from the
+        local fallback is replaced once the registry is reachable again, or
+        when the local file changes; a registry outage keeps the current
+        model.
+        """
+        for version, current in list(self.served_models().items()):
+            if version.isdigit():
+                continue
+            token = self._registry_token(version)
+            if token is None and current.startswith("local-"):
+                token = self._local_token()
+            if token is None or token == current:
+                continue
+
+            try:
+                with self._load_lock:
+                    served = self._set_served_model(version, self._load_model(version, token))
+                print(f"--- Hot-swapped model version {version}: {current} -> {served.token} ---")
+            except Exception as e:
+                print(f"--- Warning: model refresh for version {version} failed: {e} ---")
+
+    def start_model_refresher(self):
+        """Polls the registry every `poll_interval_s` seconds on a daemon thread."""
+        interval = self.models_cfg.get('poll_interval_s', 60)
+        if not interval or (self._refresher is not None and self._refresher.is_alive()):
+            return
+
+        self._stop_refresher.clear()
+
+        def _poll():
+            # First check right away, so a model preloaded from the bundle is replaced promptly
+            self.refresh_models()
+            while not self._stop_refresher.wait(interval):
+                self.refresh_models()
+
+        self._refresher = threading.Thread(target=_poll, name="model-refresher", daemon=True)
+        self._refresher.start()
+
+    def stop_model_refresher(self):
+        self._stop_refresher.set()
+
+    def _prepare_features(self, records: Union[List[dict], pd.DataFrame], preprocessor) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """Engineered and model-ready feature frames for a batch of raw request records."""
+        df = pd.DataFrame(records)
+
+        if 'hour' in df.columns:
+            with STEP_LATENCY.time("feature_engineering"):
+                df['timestamp'] = pd.to_datetime(pd.DataFrame({
+                    'year': 2025, 'month': df['month'], 'day': df['day'], 'hour': df['hour']
+                }))
+                df = self._feature_eng.engineer(df)
+
+        with STEP_LATENCY.time("preprocessing"):
+            df_processed = preprocessor.prepare_inference_features(df.copy())
+        return df, df_processed
+
+    def _predict_log(self, served: ServedModel, features: Union[np.ndarray, pd.DataFrame]) -> np.ndarray:
+        """
+        Log-space predictions for model-ready rows, taken from the prediction
+        cache where possible. Entries are keyed by the token of the model that
+        scores them, not by the alias, so scores computed on a model being
+        swapped out are never filed under its successor.
+        """
+        model = served.model
+        if self._prediction_cache is None:
+            with STEP_LATENCY.time("model_predict"):
+                return np.asarray(model.predict(features), dtype=np.float64)
+
+        matrix = features.to_numpy(dtype=np.float32) if isinstance(features, pd.DataFrame) else features
+        keys = [self._prediction_cache.key(served.token, row) for row in matrix]
+        cached = [self._prediction_cache.get(key) for key in keys]
+
+        log_predictions = np.array([np.nan if value is None else value for value in cached], dtype=np.float64)
+        missing = [i for i, value in enumerate(cached) if value is None]
+        if missing:
+            rows = features.iloc[missing] if isinstance(features, pd.DataFrame) else features[missing]
+            with STEP_LATENCY.time("model_predict"):
+                scores = np.asarray(model.predict(rows), dtype=np.float64).reshape(-1)
+            log_predictions[missing] = scores
+            for i, score in zip(missing, scores):
+                self._prediction_cache.put(keys[i], float(score))
+        return log_predictions
+
+    def _score_row_fast(self, served: ServedModel, input_data: dict) -> Tuple[float, Optional[int]]:
+        """Log-space prediction from the pandas-free 1xN float32 vector, plus the derived is_weekend."""
+        with STEP_LATENCY.time("feature_assembly"):
+            features, derived = served.row_assembler.assemble(input_data)
+        return float(self._predict_log(served, features)[0]), derived['is_weekend']
+
+    def _score_row_frame(self, served: ServedModel, input_data: dict) -> Tuple[float, Optional[int]]:
+        """Log-space prediction through the DataFrame feature pipeline, plus the derived is_weekend."""
+        df, df_processed = self._prepare_features([input_data], served.preprocessor)
+        is_weekend = int(df['is_weekend'].iloc[0]) if 'is_weekend' in df.columns else None
+        return float(self._predict_log(served, df_processed)[0]), is_weekend
+
     def predict(self, input_data: dict, version: str = "latest") -> float:
-        model = self._get_model(version)
+        served = self._get_served(version)
 
         used_version = version 
 
         input_data.pop('model_version', None)
-        df = pd.DataFrame([input_data])
-
-        if 'hour' in input_data:
-            df['timestamp'] = pd.to_datetime(f"2025-{input_data['month']}-{input_data['day']} {input_data['hour']}:00:00")
-            df = self._feature_eng.engineer(df)
+        if served.row_assembler is not None and 'hour' in input_data:
+            log_prediction, is_weekend = self._score_row_fast(served, input_data)
+        else:
+            log_prediction, is_weekend = self._score_row_frame(served, input_data)
 
-        df_processed = self._preprocessor.prepare_inference_features(df)
-
-        log_prediction = model.predict(df_processed)
-        final_prediction = float(np.expm1(log_prediction[0]))
+        final_prediction = float(np.expm1(log_prediction))
         final_prediction = max(0, final_prediction)
 
-        if self.inference_logger:
+        if self.inference_logger or self.drift_monitor:
             input_data['meter_reading'] = final_prediction
-            if 'is_weekend' in df.columns:
-                input_data['is_weekend'] = int(df['is_weekend'].iloc[0])
-            self.inference_logger.log_inference(input_data, final_prediction, version=used_version)
+            if is_weekend is not None:
+                input_data['is_weekend'] = is_weekend
+        if self.inference_logger:
+            with STEP_LATENCY.time("inference_logging"):
+                self.inference_logger.log_inference(input_data, final_prediction, version=used_version)
+        if self.drift_monitor:
+            with STEP_LATENCY.time("drift_tracking"):
+                self.drift_monitor.observe(input_data)
 
+        PREDICTIONS.inc(version, served.token)
         return final_prediction
 
+    def predict_records(self, records: List[dict], version: str = "latest") -> List[float]:
+        """Scores a list of request dicts with one vectorised feature pass and one model.predict call."""
+        served = self._get_served(version)
+
+        for record in records:
+            record.pop('model_version', None)
+
+        if served.row_assembler is not None and all('hour' in record for record in records):
+            with STEP_LATENCY.time("feature_assembly"):
+                features, derived = served.row_assembler.assemble_many(records)
+            log_predictions = self._predict_log(served, features)
+            for record, extra in zip(records, derived):
+                record['is_weekend'] = extra['is_weekend']
+        else:
+            df, df_processed = self._prepare_features(records, served.preprocessor)
+            log_predictions = self._predict_log(served, df_processed)
+
+        predictions = np.maximum(np.expm1(log_predictions), 0.0)
+
+        if self.inference_logger or self.drift_monitor:
+            logged = pd.DataFrame(records)
+            self._record_batch(logged, predictions, version)
+
+        PREDICTIONS.inc(version, served.token, amount=len(records))
+        return predictions.tolist()
+
+    def predict_batch(self, records: pd.DataFrame, version: str = "latest") -> np.ndarray:
+        """Scores a whole batch of raw records with one preprocessing pass and one model.predict call."""
+        served = self._get_served(version)
+
+        records = records.drop(columns=['model_version'], errors='ignore')
+        df, df_processed = self._prepare_features(records, served.preprocessor)
+
+        with STEP_LATENCY.time("model_predict"):
+            predictions = np.maximum(np.expm1(served.model.predict(df_processed)), 0.0)
+
+        if self.inference_logger or self.drift_monitor:
+            logged = records.copy()
+            if 'is_weekend' in df.columns:
+                logged['is_weekend'] = df['is_weekend'].to_numpy()
+            self._record_batch(logged, predictions, version)
+
+        PREDICTIONS.inc(version, served.token, amount=len(records))
+        return predictions
+
+    def _record_batch(self, logged: pd.DataFrame, predictions: np.ndarray, version: str):
+        """Logs a scored batch and adds it to the drift window."""
+        if self.inference_logger:
+            with STEP_LATENCY.time("inference_logging"):
+                self.inference_logger.log_batch(logged, predictions, version=version)
+        if self.drift_monitor:
+            with STEP_LATENCY.time("drift_tracking"):
+                self.drift_monitor.observe_frame(logged.assign(meter_reading=predictions))
+
+    def explain(self, records: List[dict], version: str = "latest") -> List[dict]:
+        """
+        TreeSHAP contributions (log space) per record. Results are cached by
+        the concrete model serving `version` (its token, so a hot swap of
+        "latest" never serves the previous model's contributions) and the
+        normalised (key-sorted) request features, so cache hits skip
+        preprocessing entirely; misses are preprocessed and explained
+        together in one batched pred_contrib call.
+        """
+        served = self._get_served(version)
+
+        for record in records:
+            record.pop('model_version', None)
+        keys = [(served.token, tuple(sorted(record.items()))) for record in records]
+        explanations = [self._explain_cache.get(key) for key in keys]
+
+        missing = [i for i, explanation in enumerate(explanations) if explanation is None]
+        if missing:
+            _, df_processed = self._prepare_features([records[i] for i in missing], served.preprocessor)
+            contribs = self._explainer.contributions(served.model, df_processed).to_numpy()
+            feature_names = list(df_processed.columns)
+            for row, i in zip(contribs, missing):
+                explanation = {
+                    "meter_reading": max(0.0, float(np.expm1(row.sum()))),
+                    "expected_value": float(row[-1]),
+                    "contributions": dict(zip(feature_names, row[:-1].tolist()))
+                }
+                self._explain_cache.put(keys[i], explanation)
+                explanations[i] = explanation
+
+        return explanations
+
     def get_detailed_metadata(self) -> dict:
-        """API metadata endpoint logic."""
-        try:
-            client = mlflow.tracking.MlflowClient()
-            versions = client.search_model_versions(f"name='{self.model_name}'")
-            
-            version_list = []
-            for v in versions:
-                try:
-                    run = client.get_run(v.run_id)
-                    version_list.append({
-                        "version": v.version,
-                        "stage": v.current_stage,
-                        "rmse": f"{run.data.metrics.get('avg_rmse', 0):.2f} kWh",
-                        "accuracy": f"{(run.data.metrics.get('avg_r2', 0) * 100):.1f}%",
-                        "last_updated": v.last_updated_timestamp
-                    })
-                except: continue
-
-            return {"status": "online", "versions": version_list}
-        except Exception as e:
-            return {"status": "offline", "error": str(e)}
\ No newline at end of file
+        """API metadata endpoint logic: cached registry metadata, refreshed in the background."""
+        return self.metadata_cache.get()
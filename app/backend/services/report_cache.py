@@ -0,0 +1,163 @@
+import fcntl
+import hashlib
+import os
+import threading
+import time
+from email.utils import formatdate
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+
+class RenderedReport(NamedTuple):
+    html: bytes
+    etag: str
+    generated_at: float
+
+    @property
+    def last_modified(self) -> str:
+        return formatdate(self.generated_at, usegmt=True)
+
+
+class ReportCache:
+    """
+    Serves the last rendered monitoring report while a background thread
+    re-renders it every `refresh_interval_s`. The rendered HTML lives in
+    `path` (replaced atomically), so every worker process serves the same
+    report; a read is a stat of that file, and the file is only re-read
+    when it changes. Renders are coalesced: concurrent refresh calls in a
+    process share one render, and a file lock makes workers that are due
+    at the same time wait for the one already rendering instead of
+    repeating it. A failed render keeps the previous report.
+    """
+
+    def __init__(self, render: Callable[[], str], path: str, refresh_interval_s: float = 300,
+                 min_refresh_interval_s: float = 30):
+        self.render = render
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.refresh_interval = refresh_interval_s
+        self.min_refresh_interval = min_refresh_interval_s
+
+        self._report: Optional[RenderedReport] = None
+        self._file_stamp = None
+        self._lock = threading.Lock()
+        self._in_flight: Optional[threading.Event] = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.renders = 0
+        self.coalesced = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+        self.last_render_s: Optional[float] = None
+
+    def current(self) -> Optional[RenderedReport]:
+        """The latest report rendered by any worker, or None if there is none yet."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return self._report
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp != self._file_stamp:
+            html = self.path.read_bytes()
+            report = RenderedReport(html, f'"{hashlib.blake2b(html, digest_size=16).hexdigest()}"', st.st_mtime)
+            with self._lock:
+                self._report, self._file_stamp = report, stamp
+        return self._report
+
+    def age(self) -> Optional[float]:
+        report = self.current()
+        return None if report is None else time.time() - report.generated_at
+
+    def refresh(self, min_age_s: float = 0) -> Optional[RenderedReport]:
+        """
+        Renders a new report unless the current one is younger than
+        `min_age_s`. Callers arriving while a render is running wait for
+        it and get its result rather than starting another.
+        """
+        with self._lock:
+            in_flight = self._in_flight
+            if in_flight is None:
+                in_flight = self._in_flight = threading.Event()
+                owner = True
+            else:
+                owner = False
+                self.coalesced += 1
+        if not owner:
+            in_flight.wait()
+            return self.current()
+
+        try:
+            age = self.age()
+            if age is None or age >= min_age_s:
+                self._render_locked(requested_at=time.time())
+        finally:
+            with self._lock:
+                self._in_flight = None
+            in_flight.set()
+        return self.current()
+
+    def _render_locked(self, requested_at: float):
+        with open(self.path.with_suffix(".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another worker rendered while we waited for the lock
+                report = self.current()
+                if report is not None and report.generated_at >= requested_at:
+                    self.coalesced += 1
+                    return
+                self._render_to_file()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _render_to_file(self):
+        started = time.perf_counter()
+        try:
+            html = self.render()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            print(f"--- Warning: monitoring report render failed, serving the previous one: {e} ---")
+            return
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(html, encoding="utf-8")
+        os.replace(tmp_path, self.path)
+        self.renders += 1
+        self.last_error = None
+        self.last_render_s = time.perf_counter() - started
+
+    def start(self):
+        """Starts the background refresher (per worker process; workers share renders through the file)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="monitoring-report-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            age = self.age()
+            if age is None or age >= self.refresh_interval:
+                self.refresh(min_age_s=self.refresh_interval)
+                age = self.age()
+                if age is None or age >= self.refresh_interval:
+                    # Render failed: retry after a full interval rather than in a tight loop
+                    age = 0.0
+            self._stop.wait(max(self.refresh_interval - age, 1.0))
+
+    def stats(self) -> dict:
+        report = self.current()
+        return {
+            "available": report is not None,
+            "generated_at": report.last_modified if report else None,
+            "age_s": round(time.time() - report.generated_at, 1) if report else None,
+            "refresh_interval_s": self.refresh_interval,
+            "rendering": self._in_flight is not None,
+            "renders": self.renders, "coalesced": self.coalesced, "failures": self.failures,
+            "last_render_s": self.last_render_s, "last_error": self.last_error
+        }
@@ -8,6 +8,7 @@ from src.common.config_loader import load_yaml_config
 from src.ingestion.ingestion import run_ingestion_stage
 from src.preprocessing.preprocessor import run_preprocessing_stage
 from src.training.trainer import run_training_stage
+from src.training.tuner import run_tuning_stage
 from src.deployment.deploy import run_deployment_stage
 from src.evaluation.evaluation import run_evaluation_stage
 
@@ -24,10 +25,18 @@ def parse_arguments():
         "--stage", 
         type=str, 
         required=True, 
-        choices=["ingestion", "preprocessing", "train", "evaluate", "deploy"],
+        choices=["ingestion", "preprocessing", "tune", "train", "evaluate", "deploy"],
         help="The specific pipeline stage to execute."
     )
     
+    parser.add_argument(
+        "--mode",
+        type=str,
+        default=None,
+        choices=["cv", "segmented", "incremental", "backtest"],
+        help="Overrides training.mode from the config for the train stage."
+    )
+
     parser.add_argument(
         "--config", 
         type=str, 
@@ -49,6 +58,9 @@ def main():
             
         config = load_yaml_config(str(config_path))
         logger.info(f"Configuration loaded from {args.config}")
+
+        if args.mode:
+            config['training']['mode'] = args.mode
     except Exception as e:
         logger.error(f"Failed to load configuration: {e}")
         sys.exit(1)
@@ -69,6 +81,11 @@ def main():
             run_preprocessing_stage(config)
             logger.info("Preprocessing stage completed successfully.")
 
+        elif args.stage == "tune":
+            logger.info("Starting Hyperparameter Search...")
+            best_params = run_tuning_stage(config)
+            logger.warning(f"Tuning stage completed successfully. Best params: {best_params}")
+
         elif args.stage == "train":
             logger.info("Starting Model Training...")
             metrics = run_training_stage(config)
@@ -0,0 +1,98 @@
+"""
+Single-row inference latency: DataFrame feature pipeline vs the
+pandas-free fast path, measured in-process against the serving model,
+then model-only latency of Booster.predict vs FastBoosterPredictor for
+small batches.
+
+    python scripts/benchmark_predict_latency.py --requests 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.backend.services.model_service import ModelService
+from src.training.fast_predict import FastBoosterPredictor
+
+SAMPLE_REQUEST = {
+    "building_id": 10, "meter": 0, "site_id": 0, "primary_use": "Education",
+    "square_feet": 50000, "air_temperature": 22.5, "cloud_coverage": 2.0,
+    "dew_temperature": 10.0, "precip_depth_1_hr": 0.0, "sea_level_pressure": 1012.0,
+    "wind_direction": 160.0, "wind_speed": 4.0, "day": 1, "month": 5, "week": 18,
+    "hour": 12, "is_weekend": 0
+}
+
+def make_requests(n: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    return [{
+        **SAMPLE_REQUEST,
+        "building_id": int(rng.integers(0, 1449)),
+        "meter": int(rng.integers(0, 4)),
+        "air_temperature": float(rng.normal(15, 10)),
+        "day": int(rng.integers(1, 29)),
+        "month": int(rng.integers(1, 13)),
+        "hour": int(rng.integers(0, 24))
+    } for _ in range(n)]
+
+def measure(score, served, requests, warmup: int = 20):
+    for record in requests[:warmup]:
+        score(served, dict(record))
+    latencies, outputs = [], []
+    for record in requests:
+        start = time.perf_counter()
+        outputs.append(score(served, dict(record))[0])
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e3, np.array(outputs)
+
+def measure_model(predict, rows, repeats: int):
+    predict(rows)
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(rows)
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e3
+
+def compare_predictors(model, batch_sizes, repeats: int):
+    booster = getattr(model, "booster", model)
+    fast = FastBoosterPredictor(booster)
+    rows = fast.probe_rows(max(batch_sizes), seed=1)
+
+    print(f"\n{'batch':<8}{'booster p50 ms':>16}{'fast p50 ms':>14}{'speed-up':>10}")
+    for size in batch_sizes:
+        batch = np.ascontiguousarray(rows[:size])
+        base = np.percentile(measure_model(booster.predict, batch, repeats), 50)
+        quick = np.percentile(measure_model(fast.predict, batch, repeats), 50)
+        print(f"{size:<8}{base:>16.3f}{quick:>14.3f}{base / quick:>9.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-row predict latency benchmark")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--version", type=str, default="latest")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 16, 64])
+    args = parser.parse_args()
+
+    service = ModelService()
+    served = service._get_served(args.version)
+    if served.row_assembler is None:
+        sys.exit("Fast path unavailable (preprocessor not fitted or serving.fast_path disabled)")
+
+    requests = make_requests(args.requests)
+
+    frame_ms, frame_out = measure(service._score_row_frame, served, requests)
+    fast_ms, fast_out = measure(service._score_row_fast, served, requests)
+
+    print(f"{'path':<12}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for name, ms in (("dataframe", frame_ms), ("fast", fast_ms)):
+        print(f"{name:<12}{np.percentile(ms, 50):>10.3f}{np.percentile(ms, 99):>10.3f}{ms.mean():>10.3f}")
+    print(f"p50 speed-up: {np.percentile(frame_ms, 50) / np.percentile(fast_ms, 50):.1f}x | "
+          f"max |log-prediction diff|: {np.abs(frame_out - fast_out).max():.3e}")
+
+    compare_predictors(served.model, args.batch_sizes, repeats=max(args.requests // 4, 50))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Converts the pickled serving artifacts (model.pkl + preprocessor.joblib)
+into a serving bundle, and optionally compares cold load time and
+resident memory of both formats, each in a fresh interpreter (Linux).
+
+    python scripts/build_serving_bundle.py --compare
+"""
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+import joblib
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.common.config_loader import load_yaml_config
+from src.training.serving_bundle import write_serving_bundle
+
+PROBES = {
+    "pickle": (
+        "import joblib; joblib.load('{model}'); joblib.load('{prep}')"
+    ),
+    "bundle": (
+        "from src.training.serving_bundle import load_serving_bundle; load_serving_bundle('{bundle}')"
+    )
+}
+
+# Imports are timed separately so the comparison isolates artifact loading
+PROBE_TEMPLATE = """
+import os, time
+import lightgbm, sklearn.preprocessing, src.training.serving_bundle
+rss = lambda: int(open('/proc/self/statm').read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+before = rss()
+start = time.perf_counter()
+{probe}
+elapsed = time.perf_counter() - start
+print(elapsed, rss() - before)
+"""
+
+def probe(kind: str, paths: dict, repeats: int):
+    code = PROBE_TEMPLATE.format(probe=PROBES[kind].format(**paths))
+    runs = []
+    for _ in range(repeats):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        seconds, rss_bytes = out.stdout.split()[-2:]
+        runs.append((float(seconds), int(rss_bytes)))
+    return min(r[0] for r in runs), min(r[1] for r in runs)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the serving bundle from pickled artifacts")
+    parser.add_argument("--config", type=str, default="configs/pipeline_config.yaml")
+    parser.add_argument("--preprocessor", type=str, default="saved_models/preprocessor.joblib")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    training_cfg = load_yaml_config(args.config)['training']
+    paths = {
+        "model": training_cfg['model_save_path'],
+        "prep": args.preprocessor,
+        "bundle": training_cfg.get('serving_bundle_path', "saved_models/serving_bundle")
+    }
+
+    bundle_dir = write_serving_bundle(joblib.load(paths["model"]), joblib.load(paths["prep"]), paths["bundle"])
+    print(f"Serving bundle written to {bundle_dir}")
+
+    if args.compare:
+        print(f"{'format':<10}{'load ms':>10}{'RSS +MB':>10}")
+        for kind in PROBES:
+            seconds, rss_bytes = probe(kind, paths, args.repeats)
+            print(f"{kind:<10}{seconds * 1e3:>10.1f}{rss_bytes / 2**20:>10.1f}")
+
+if __name__ == "__main__":
+    main()
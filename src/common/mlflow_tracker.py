@@ -1,5 +1,7 @@
+import os
 import mlflow
 import mlflow.lightgbm
+import mlflow.pyfunc
 import pandas as pd
 from typing import Dict, Any, Optional
 from src.common.logger import get_logger
@@ -16,23 +18,46 @@ class MLflowTracker:
         mlflow.set_tracking_uri(self.cfg['tracking_uri'])
         mlflow.set_experiment(self.cfg['experiment_name'])
         
-    def start_run(self, run_name: Optional[str] = None):
-        """Starts a new MLflow run."""
-        return mlflow.start_run(run_name=run_name)
+    def start_run(self, run_name: Optional[str] = None, nested: bool = False, run_id: Optional[str] = None,
+                  tags: Optional[Dict[str, str]] = None):
+        """Starts (or resumes, given run_id) an MLflow run, optionally nested under the active one."""
+        return mlflow.start_run(run_id=run_id, run_name=run_name, nested=nested, tags=tags)
 
-    def log_metadata(self, params: Dict[str, Any], metrics: Dict[str, Any]):
+    def set_tags(self, tags: Dict[str, Any]):
+        """Tags the active run (e.g. model lineage)."""
+        mlflow.set_tags(tags)
+
+    def last_run_time(self, tags: Dict[str, str]) -> Optional[pd.Timestamp]:
+        """Start time of the most recent finished run in this experiment carrying all given tags."""
+        filters = [f"tags.{k} = '{v}'" for k, v in tags.items()] + ["attributes.status = 'FINISHED'"]
+        runs = mlflow.search_runs(
+            experiment_names=[self.cfg['experiment_name']],
+            filter_string=" and ".join(filters),
+            order_by=["attributes.start_time DESC"],
+            max_results=1
+        )
+        if runs.empty:
+            return None
+        return pd.Timestamp(runs.iloc[0]["start_time"])
+
+    def log_metadata(self, params: Dict[str, Any], metrics: Dict[str, Any], step: Optional[int] = None):
         """Logs multiple parameters and metrics at once."""
         mlflow.log_params(params)
-        mlflow.log_metrics(metrics)
+        mlflow.log_metrics(metrics, step=step)
         self.logger.info("Metadata logged to MLflow.")
 
-    def log_model(self, model: Any, model_type: str = "lightgbm", input_example=None):
-        """Logs the model to the MLflow Registry."""
-        if model_type == "lightgbm":
-            signature = None
-            if input_example is not None:
-                signature = infer_signature(input_example, model.predict(input_example))
+    def log_model(self, model: Any, model_type: str = "lightgbm", input_example=None,
+                  bundle_dir: Optional[str] = None):
+        """
+        Logs the model to the MLflow Registry. Multi-booster bundles
+        (model_type="segmented") are registered as a pyfunc model whose
+        artifacts are the bundle directory written by the model's save().
+        """
+        signature = None
+        if input_example is not None:
+            signature = infer_signature(input_example, model.predict(input_example))
 
+        if model_type == "lightgbm":
             mlflow.lightgbm.log_model(
                 lgb_model=model,
                 artifact_path="model",
@@ -40,12 +65,51 @@ class MLflowTracker:
                 input_example=input_example,
                 signature=signature
             )
+        elif model_type == "segmented":
+            from src.training.bundle import SegmentedPyfuncModel
+
+            mlflow.pyfunc.log_model(
+                artifact_path="model",
+                python_model=SegmentedPyfuncModel(),
+                artifacts={"bundle": bundle_dir},
+                registered_model_name=self.cfg['model_name'],
+                input_example=input_example,
+                signature=signature
+            )
 
         self.logger.info(
             f"Model logged to MLflow Registry as '{self.cfg['model_name']}'"
         )
 
-    def log_artifact(self, local_path: str):
-        """Uploads a local file (like model.pkl) to MLflow."""
-        mlflow.log_artifact(local_path)
-        self.logger.info(f"Artifact {local_path} uploaded to MLflow.")
\ No newline at end of file
+    def log_table(self, data: pd.DataFrame, artifact_file: str):
+        """Logs a DataFrame as a run table artifact (viewable in the MLflow UI)."""
+        mlflow.log_table(data=data, artifact_file=artifact_file)
+        self.logger.info(f"Table {artifact_file} logged to MLflow.")
+
+    def log_artifact(self, local_path: str, artifact_path: Optional[str] = None):
+        """Uploads a local file (like model.pkl) or a directory (like the serving bundle) to MLflow."""
+        if os.path.isdir(local_path):
+            mlflow.log_artifacts(local_path, artifact_path=artifact_path or os.path.basename(os.path.normpath(local_path)))
+        else:
+            mlflow.log_artifact(local_path)
+        self.logger.info(f"Artifact {local_path} uploaded to MLflow.")
+
+
+def resolve_latest_version(model_name: str):
+    """Highest registered ModelVersion of `model_name`, or None if nothing is registered."""
+    client = mlflow.tracking.MlflowClient()
+    versions = client.search_model_versions(f"name='{model_name}'")
+    if not versions:
+        return None
+    return max(versions, key=lambda v: int(v.version))
+
+def load_registered_model(model_uri: str) -> Any:
+    """
+    Loads a registered model for inference: LightGBM-flavoured models come
+    back as a Booster, pyfunc bundles (e.g. SegmentedModel) are unwrapped
+    so callers always get an object with a batched predict().
+    """
+    flavors = mlflow.models.get_model_info(model_uri).flavors
+    if "lightgbm" in flavors:
+        return mlflow.lightgbm.load_model(model_uri)
+    return mlflow.pyfunc.load_model(model_uri).unwrap_python_model().bundle
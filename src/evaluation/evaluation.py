@@ -2,8 +2,9 @@ import mlflow
 import pandas as pd
 import numpy as np
 from src.common.redis_client import RedisClient
-from src.common.mlflow_tracker import MLflowTracker
-from src.evaluation.explainer import LimeExplainer
+from src.common.mlflow_tracker import MLflowTracker, load_registered_model
+from src.training.dataset import load_feature_sample
+from src.evaluation.explainer import LimeExplainer, TreeShapExplainer
 from src.common.logger import get_logger
 
 class EvaluationStage:
@@ -16,12 +17,34 @@ class EvaluationStage:
     def run(self):
         self.logger.info("--- STARTING MODEL EVALUATION & XAI STAGE ---")
 
-        X_test = self.redis_client.load_dataframe("ashrae_pipeline_X_train").iloc[:1000] 
+        eval_cfg = self.config.get('evaluation') or {}
+        mode = eval_cfg.get('explainer', 'treeshap')
+        sample_rows = eval_cfg.get('sample_rows', 5000)
+
+        X_test = load_feature_sample(self.config, self.redis_client, sample_rows)
         
         mlflow.set_tracking_uri(self.config['mlflow']['tracking_uri'])
         model_uri = f"models:/{self.config['mlflow']['model_name']}/latest"
-        model = mlflow.lightgbm.load_model(model_uri)
+        model = load_registered_model(model_uri)
+
+        if mode == "lime":
+            self._run_lime(model, X_test)
+        else:
+            self._run_treeshap(model, X_test, eval_cfg.get('segment_keys', []))
+
+        self.logger.info("--- EVALUATION STAGE COMPLETE ---")
 
+    def _run_treeshap(self, model, X_test: pd.DataFrame, segment_keys: list):
+        explainer = TreeShapExplainer()
+
+        with self.tracker.start_run(run_name="Model_Explainability_TreeSHAP"):
+            report_paths = explainer.write_reports(model, X_test, segment_keys)
+            for path in report_paths.values():
+                self.tracker.log_artifact(path)
+            self.tracker.log_metadata(params={"explained_rows": len(X_test)}, metrics={})
+            self.logger.info(f"TreeSHAP summaries for {len(X_test)} rows logged to MLflow artifacts.")
+
+    def _run_lime(self, model, X_test: pd.DataFrame):
         explainer = LimeExplainer(training_data=X_test.head(500), feature_names=X_test.columns.tolist())
 
         sample_row = X_test.head(1)
@@ -32,8 +55,6 @@ class EvaluationStage:
             self.tracker.log_artifact(html_path)
             self.logger.info("LIME explanation logged to MLflow artifacts.")
 
-        self.logger.info("--- EVALUATION STAGE COMPLETE ---")
-
 def run_evaluation_stage(config: dict):
     stage = EvaluationStage(config)
     stage.run()
\ No newline at end of file
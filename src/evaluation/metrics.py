@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from src.evaluation.base import BaseEvaluator
+
+OVERALL = "overall"
+
+class RegressionMetricsAccumulator(BaseEvaluator):
+    """
+    One-pass, mergeable regression metrics. Each update adds per-group sums
+    (count, y, y^2, squared and absolute error) with np.bincount, plus a
+    log-bucketed histogram of absolute errors for quantiles with bounded
+    relative error. Groups are non-negative integer codes (e.g. meter,
+    site_id or an encoded primary_use); the group table grows as new codes
+    appear, so accumulators from folds or shards can be merged freely.
+    """
+
+    MIN_VALUE = 1e-9
+    MAX_VALUE = 1e12
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self.gamma)
+        self._min_key = int(np.ceil(np.log(self.MIN_VALUE) / self._log_gamma))
+        # Bucket i holds errors in (gamma^(k-1), gamma^k] for k = _min_key + i; bucket 0 also takes anything smaller
+        self.n_buckets = int(np.ceil(np.log(self.MAX_VALUE) / self._log_gamma)) - self._min_key + 1
+
+        self.stats = np.zeros((0, 5), dtype=np.float64)  # count, sum_y, sum_y2, sse, sae
+        self.sketch = np.zeros((0, self.n_buckets), dtype=np.int64)
+
+    @property
+    def n_groups(self) -> int:
+        return len(self.stats)
+
+    def evaluate(self, y_true, y_pred) -> dict:
+        """Metrics for a single, ungrouped pair of arrays."""
+        return RegressionMetricsAccumulator(self.relative_accuracy).update(y_true, y_pred).result()
+
+    def update(self, y_true, y_pred, groups: Optional[np.ndarray] = None) -> "RegressionMetricsAccumulator":
+        y_true = np.asarray(y_true, dtype=np.float64).reshape(-1)
+        y_pred = np.asarray(y_pred, dtype=np.float64).reshape(-1)
+        err = y_pred - y_true
+        abs_err = np.abs(err)
+        buckets = self._bucket(abs_err)
+
+        if groups is None:
+            self._grow(1)
+            self.stats[0] += (len(y_true), y_true.sum(), np.dot(y_true, y_true), np.dot(err, err), abs_err.sum())
+            self.sketch[0] += np.bincount(buckets, minlength=self.n_buckets)
+            return self
+
+        groups = np.asarray(groups).astype(np.int64, copy=False).reshape(-1)
+        if len(groups) and groups.min() < 0:
+            raise ValueError("Group codes must be non-negative integers")
+
+        n_groups = int(groups.max()) + 1 if len(groups) else 0
+        self._grow(n_groups)
+        for col, weights in enumerate((None, y_true, y_true * y_true, err * err, abs_err)):
+            self.stats[:n_groups, col] += np.bincount(groups, weights=weights, minlength=n_groups)
+
+        buckets += groups * self.n_buckets
+        self.sketch[:n_groups] += np.bincount(
+            buckets, minlength=n_groups * self.n_buckets
+        ).reshape(n_groups, self.n_buckets)
+        return self
+
+    def merge(self, other: "RegressionMetricsAccumulator") -> "RegressionMetricsAccumulator":
+        if other.n_buckets != self.n_buckets:
+            raise ValueError("Cannot merge accumulators with different relative accuracy")
+        self._grow(other.n_groups)
+        self.stats[:other.n_groups] += other.stats
+        self.sketch[:other.n_groups] += other.sketch
+        return self
+
+    def result(self, group: Optional[int] = None) -> Dict[str, float]:
+        """Metrics for one group code, or pooled over all groups."""
+        if group is None:
+            stats, sketch = self.stats.sum(axis=0), self.sketch.sum(axis=0)
+        else:
+            stats, sketch = self.stats[group], self.sketch[group]
+
+        count, sum_y, sum_y2, sse, sae = stats
+        if count == 0:
+            return {}
+        mse = sse / count
+        sst = sum_y2 - sum_y * sum_y / count
+        r2 = 1.0 - sse / sst if sst > 0 else (1.0 if sse == 0 else 0.0)
+
+        return {
+            "RMSE": float(np.sqrt(mse)),
+            "MSE": float(mse),
+            "MAE": float(sae / count),
+            "R2": float(r2),
+            "Median_AE": self._quantile(sketch, 0.5),
+            "P90_AE": self._quantile(sketch, 0.9)
+        }
+
+    def table(self, labels: Optional[Dict[int, str]] = None) -> pd.DataFrame:
+        """One row per observed group code, with its row count and metrics."""
+        rows = []
+        for group in np.flatnonzero(self.stats[:, 0] > 0):
+            group = int(group)
+            label = labels.get(group, group) if labels else group
+            rows.append({"segment": label, "rows": int(self.stats[group, 0]), **self.result(group)})
+        return pd.DataFrame(rows)
+
+    def _bucket(self, abs_err: np.ndarray) -> np.ndarray:
+        scratch = np.maximum(abs_err, self.MIN_VALUE)
+        np.log(scratch, out=scratch)
+        scratch *= 1.0 / self._log_gamma
+        np.ceil(scratch, out=scratch)
+        buckets = scratch.astype(np.int64)
+        buckets -= self._min_key
+        return np.clip(buckets, 0, self.n_buckets - 1, out=buckets)
+
+    def _quantile(self, sketch: np.ndarray, q: float) -> float:
+        cumulative = np.cumsum(sketch)
+        rank = q * (cumulative[-1] - 1)
+        bucket = int(np.searchsorted(cumulative, rank, side='right'))
+        if bucket == 0:
+            return 0.0
+        key = bucket + self._min_key
+        return float(2 * self.gamma ** key / (self.gamma + 1))
+
+    def _grow(self, n_groups: int):
+        if n_groups > self.n_groups:
+            extra = n_groups - self.n_groups
+            self.stats = np.vstack([self.stats, np.zeros((extra, 5))])
+            self.sketch = np.vstack([self.sketch, np.zeros((extra, self.n_buckets), dtype=np.int64)])
+
+
+def merge_accumulators(breakdowns: List[Dict[str, RegressionMetricsAccumulator]]) -> Dict[str, RegressionMetricsAccumulator]:
+    """Merges per-fold (or per-shard) breakdowns key by key into fresh accumulators."""
+    merged = {}
+    for breakdown in breakdowns:
+        for key, acc in breakdown.items():
+            if key not in merged:
+                merged[key] = RegressionMetricsAccumulator(acc.relative_accuracy)
+            merged[key].merge(acc)
+    return merged
+
+
+def breakdown_tables(results, task_labels: Optional[Dict[int, str]] = None) -> Dict[str, pd.DataFrame]:
+    """
+    MLflow-ready tables from FoldResult breakdowns: one row per task
+    ("tasks") and the pooled out-of-fold metrics per segment key
+    ("by_<key>").
+    """
+    task_rows = []
+    for result in results:
+        label = task_labels.get(result.fold, result.fold) if task_labels else result.fold
+        task_rows.append({"task": label, "rows": result.val_rows, **result.breakdown[OVERALL].result()})
+
+    tables = {"tasks": pd.DataFrame(task_rows)}
+    merged = merge_accumulators([r.breakdown for r in results])
+    for key, acc in merged.items():
+        if key != OVERALL:
+            tables[f"by_{key}"] = acc.table()
+    return tables
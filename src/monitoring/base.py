@@ -0,0 +1,21 @@
+from dataclasses import dataclass, field
+from typing import List
+
+@dataclass(frozen=True)
+class FeatureProfile:
+    """
+    Reference distribution of one monitored feature. Numeric features are
+    bucketed by `edges` (len(edges) + 1 value buckets); categorical ones by
+    `categories` plus an "other" bucket for everything unseen. The last
+    bucket of either kind counts missing values. `reference` holds the
+    reference share of each bucket.
+    """
+    name: str
+    kind: str
+    reference: List[float]
+    edges: List[float] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+
+    @property
+    def n_buckets(self) -> int:
+        return len(self.reference)
@@ -1,5 +1,8 @@
+import atexit
+import threading
 import pandas as pd
 import logging
+from typing import List, Optional, Union
 from sqlalchemy import text
 from src.database.connection import DBClient
 from src.schemas.raw_schemas import RAW_DATA_TYPES
@@ -8,6 +11,13 @@ class InferenceLogger:
     """
     Handles logging of real-time API inferences to MariaDB.
     Automatically creates the logging table based on the unified schema.
+
+    With buffering enabled, log calls only append rows to a bounded
+    in-memory buffer; a background thread writes them as multi-row inserts
+    every `flush_rows` rows or `flush_interval_ms`, so request latency does
+    not depend on the database. When the buffer is full, rows are dropped
+    (overflow="drop") or the caller waits up to `block_timeout_ms` for
+    space (overflow="block"). Pending rows are flushed on close/exit.
     """
 
     TYPE_MAP = {
@@ -17,11 +27,31 @@ class InferenceLogger:
         "category": "VARCHAR(255)"
     }
 
-    def __init__(self, db_client: DBClient):
+    def __init__(self, db_client: DBClient, buffer_cfg: Optional[dict] = None):
         self.engine = db_client.get_engine()
         self.table_name = "inference_logs"
         self._ensure_table_exists()
 
+        cfg = buffer_cfg or {}
+        self.buffered = bool(cfg.get('enabled', False))
+        self.max_buffer_rows = int(cfg.get('max_buffer_rows', 50_000))
+        self.flush_rows = int(cfg.get('flush_rows', 500))
+        self.flush_interval = cfg.get('flush_interval_ms', 1000) / 1000.0
+        self.overflow = cfg.get('overflow', 'drop')
+        self.block_timeout = cfg.get('block_timeout_ms', 50) / 1000.0
+
+        self.dropped_rows = 0
+        self._pending: List[Union[dict, pd.DataFrame]] = []
+        self._pending_rows = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._writer = None
+
+        if self.buffered:
+            self._writer = threading.Thread(target=self._run_writer, name="inference-log-writer", daemon=True)
+            self._writer.start()
+            atexit.register(self.close)
+
     def _ensure_table_exists(self):
         """Creates the inference_logs table if it does not exist using raw_schemas."""
         schema = RAW_DATA_TYPES["inference"]
@@ -47,10 +77,95 @@ class InferenceLogger:
         """
         Saves a single inference event to the database.
         """
+        row = {**input_data, "meter_reading": prediction, "model_version": version}
+        if self.buffered:
+            self._enqueue(row, 1)
+        else:
+            self._write([row])
+
+    def log_batch(self, inputs: pd.DataFrame, predictions, version: str):
+        """
+        Saves a batch of inference events with a single insert.
+        """
+        df = inputs.copy()
+        df["meter_reading"] = predictions
+        df["model_version"] = version
+        if self.buffered:
+            self._enqueue(df, len(df))
+        else:
+            self._write([df])
+
+    def flush(self):
+        """Writes everything buffered so far on the calling thread."""
+        with self._cond:
+            chunks = self._take_pending()
+        if chunks:
+            self._write(chunks)
+
+    def close(self):
+        """Stops the background writer after a final flush. Safe to call more than once."""
+        if not self.buffered or self._closed:
+            return
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._writer is not None:
+            self._writer.join(timeout=30)
+        self.flush()
+        if self.dropped_rows:
+            logging.warning(f"Inference logger dropped {self.dropped_rows} rows on a full buffer")
+
+    def after_fork(self):
+        """Re-creates the writer thread and DB pool in a forked child; rows pending in the parent stay there."""
+        self.engine.dispose(close=False)
+        self._pending, self._pending_rows = [], 0
+        self._cond = threading.Condition()
+        if self.buffered and not self._closed:
+            self._writer = threading.Thread(target=self._run_writer, name="inference-log-writer", daemon=True)
+            self._writer.start()
+
+    def _enqueue(self, chunk: Union[dict, pd.DataFrame], n_rows: int):
+        with self._cond:
+            has_space = lambda: self._pending_rows + n_rows <= self.max_buffer_rows or self._closed
+            if not has_space():
+                if self.overflow != "block" or not self._cond.wait_for(has_space, timeout=self.block_timeout):
+                    self.dropped_rows += n_rows
+                    return
+            if not self._closed:
+                self._pending.append(chunk)
+                self._pending_rows += n_rows
+                if self._pending_rows >= self.flush_rows:
+                    self._cond.notify_all()
+                return
+        # Writer already stopped (shutdown): write through
+        self._write([chunk])
+
+    def _take_pending(self) -> List[Union[dict, pd.DataFrame]]:
+        chunks, self._pending, self._pending_rows = self._pending, [], 0
+        self._cond.notify_all()
+        return chunks
+
+    def _run_writer(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending_rows >= self.flush_rows or self._closed,
+                                    timeout=self.flush_interval)
+                chunks = self._take_pending()
+                closed = self._closed
+            if chunks:
+                self._write(chunks)
+            if closed:
+                return
+
+    def _write(self, chunks: List[Union[dict, pd.DataFrame]]):
+        """One multi-row insert for buffered single rows and batch frames."""
         try:
-            log_entry = {**input_data, "meter_reading": prediction, "model_version": version}
-            df = pd.DataFrame([log_entry])
-            
+            rows = [c for c in chunks if isinstance(c, dict)]
+            frames = [c for c in chunks if isinstance(c, pd.DataFrame)]
+            if rows:
+                frames.append(pd.DataFrame(rows))
+            df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
             schema = RAW_DATA_TYPES["inference"]
             for col, dtype in schema.items():
                 if col in df.columns:
@@ -62,7 +177,9 @@ class InferenceLogger:
                     name=self.table_name,
                     con=conn,
                     if_exists="append",
-                    index=False
+                    index=False,
+                    method="multi",
+                    chunksize=1_000
                 )
         except Exception as e:
-            logging.error(f"Failed to log inference: {e}")
\ No newline at end of file
+            logging.error(f"Failed to log inference: {e}")
@@ -0,0 +1,277 @@
+import json
+import math
+import threading
+from bisect import bisect_right
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+from src.common.logger import get_logger
+from src.monitoring.base import FeatureProfile
+from src.schemas.raw_schemas import RAW_DATA_TYPES
+
+# Identifiers are not distributions worth monitoring
+UNMONITORED = {"building_id", "model_version"}
+CATEGORICAL_DTYPES = {"category", "int8"}
+EPS = 1e-4
+
+logger = get_logger("DriftMonitor")
+
+def monitored_features() -> Dict[str, str]:
+    """Monitored inference columns and their kind ("numeric" or "categorical")."""
+    return {
+        col: "categorical" if dtype in CATEGORICAL_DTYPES else "numeric"
+        for col, dtype in RAW_DATA_TYPES["inference"].items() if col not in UNMONITORED
+    }
+
+def _category_key(value) -> Optional[str]:
+    """Category label as logged: 3, 3.0 and "3" are the same category."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (float, np.floating)):
+        if math.isnan(value):
+            return None
+        if float(value).is_integer():
+            return str(int(value))
+    if isinstance(value, np.integer):
+        return str(int(value))
+    return str(value)
+
+def _numeric_profile(name: str, values: pd.Series, bins: int, sample_rows: int, seed: int) -> FeatureProfile:
+    x = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+    present = x[~np.isnan(x)]
+    sample = present
+    if len(present) > sample_rows:
+        sample = np.random.default_rng(seed).choice(present, sample_rows, replace=False)
+    edges = np.unique(np.quantile(sample, np.linspace(0, 1, bins + 1)[1:-1])) if len(sample) else np.array([])
+
+    counts = np.bincount(np.searchsorted(edges, present, side="right"), minlength=len(edges) + 1)
+    counts = np.append(counts, len(x) - len(present)).astype(np.float64)
+    return FeatureProfile(name, "numeric", (counts / max(len(x), 1)).tolist(), edges=edges.tolist())
+
+def _categorical_profile(name: str, values: pd.Series, max_categories: int) -> FeatureProfile:
+    freq: Dict[str, float] = {}
+    for value, count in pd.Series(values).value_counts(dropna=False).items():
+        key = _category_key(value)
+        freq[key] = freq.get(key, 0) + count
+    missing = freq.pop(None, 0)
+
+    categories = sorted(freq, key=freq.get, reverse=True)[:max_categories]
+    other = sum(freq.values()) - sum(freq[c] for c in categories)
+    counts = np.array([freq[c] for c in categories] + [other, missing], dtype=np.float64)
+    return FeatureProfile(name, "categorical", (counts / max(counts.sum(), 1)).tolist(), categories=categories)
+
+def build_reference_profiles(columns: Mapping[str, Any], bins: int = 10, max_categories: int = 50,
+                             sample_rows: int = 1_000_000, seed: int = 42) -> List[FeatureProfile]:
+    """
+    Reference histograms (quantile bins) and category frequencies for each
+    monitored feature present in `columns` (column name -> values).
+    """
+    profiles = []
+    for name, kind in monitored_features().items():
+        if name not in columns:
+            continue
+        values = columns[name]
+        if kind == "numeric":
+            profiles.append(_numeric_profile(name, values, bins, sample_rows, seed))
+        else:
+            profiles.append(_categorical_profile(name, values, max_categories))
+    return profiles
+
+def save_reference_profiles(profiles: List[FeatureProfile], path: str):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"features": [asdict(p) for p in profiles]}, indent=2))
+
+def load_reference_profiles(path: str) -> Optional[List[FeatureProfile]]:
+    path = Path(path)
+    if not path.exists():
+        return None
+    return [FeatureProfile(**p) for p in json.loads(path.read_text())["features"]]
+
+def drift_scores(reference: np.ndarray, counts: np.ndarray, numeric: bool) -> Dict[str, Optional[float]]:
+    """PSI and Jensen-Shannon distance over all buckets; for numeric features also
+    the KS statistic approximated on bucket CDFs (missing values excluded)."""
+    p = np.clip(reference, EPS, None)
+    q = np.clip(counts / counts.sum(), EPS, None)
+    p, q = p / p.sum(), q / q.sum()
+
+    psi = float(np.sum((q - p) * np.log(q / p)))
+    m = (p + q) / 2
+    js = float(np.sqrt(max(0.5 * np.sum(p * np.log2(p / m)) + 0.5 * np.sum(q * np.log2(q / m)), 0.0)))
+
+    ks = None
+    if numeric:
+        ref_values, cur_values = reference[:-1], counts[:-1]
+        if ref_values.sum() > 0 and cur_values.sum() > 0:
+            ks = float(np.max(np.abs(np.cumsum(ref_values / ref_values.sum()) - np.cumsum(cur_values / cur_values.sum()))))
+    return {"psi": psi, "js": js, "ks": ks}
+
+
+class StreamingDriftMonitor:
+    """
+    Drift of the most recent `window_size` inferences against precomputed
+    reference profiles. Each observed row is reduced to one bucket per
+    feature and kept in a ring buffer with running bucket counts, so
+    observing costs O(features) and scoring O(features x buckets),
+    independent of the window size. A feature counts as drifted when its
+    `metric` (psi, js or ks) reaches `threshold`. State is per process;
+    `report` can pool the `window_state` of several processes (e.g. every
+    gunicorn worker), in which case the pooled window holds up to
+    `window_size` rows per process.
+    """
+
+    def __init__(self, profiles: List[FeatureProfile], window_size: int = 5000, min_rows: int = 500,
+                 metric: str = "psi", threshold: float = 0.2):
+        self.profiles = profiles
+        self.window_size = max(int(window_size), 1)
+        self.min_rows = min_rows
+        self.metric = metric
+        self.threshold = threshold
+
+        sizes = [p.n_buckets for p in profiles]
+        self._offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        self._references = [np.asarray(p.reference, dtype=np.float64) for p in profiles]
+        self._edges = [np.asarray(p.edges, dtype=np.float64) for p in profiles]
+        self._category_index = [{c: i for i, c in enumerate(p.categories)} for p in profiles]
+
+        self._counts = np.zeros(sum(sizes), dtype=np.int64)
+        self._window = np.zeros((self.window_size, len(profiles)), dtype=np.int64)
+        self._pos = 0
+        self._filled = 0
+        self.observed = 0
+        self._lock = threading.Lock()
+
+    def _bucket(self, i: int, value) -> int:
+        profile = self.profiles[i]
+        if profile.kind == "numeric":
+            try:
+                x = float(value)
+            except (TypeError, ValueError):
+                x = math.nan
+            return profile.n_buckets - 1 if math.isnan(x) else bisect_right(profile.edges, x)
+        key = _category_key(value)
+        if key is None:
+            return profile.n_buckets - 1
+        return self._category_index[i].get(key, profile.n_buckets - 2)
+
+    def _buckets(self, i: int, values: pd.Series) -> np.ndarray:
+        profile = self.profiles[i]
+        if profile.kind == "numeric":
+            x = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+            return np.where(np.isnan(x), profile.n_buckets - 1, np.searchsorted(self._edges[i], x, side="right"))
+        keys = values.astype(object).map(_category_key)
+        codes = keys.map(self._category_index[i]).fillna(profile.n_buckets - 2).to_numpy(dtype=np.int64)
+        return np.where(keys.isna().to_numpy(), profile.n_buckets - 1, codes)
+
+    def observe(self, record: dict):
+        """Adds one logged inference (request fields plus meter_reading)."""
+        codes = self._offsets + np.array(
+            [self._bucket(i, record.get(p.name)) for i, p in enumerate(self.profiles)], dtype=np.int64
+        )
+        with self._lock:
+            if self._filled == self.window_size:
+                self._counts[self._window[self._pos]] -= 1
+            else:
+                self._filled += 1
+            self._window[self._pos] = codes
+            self._counts[codes] += 1
+            self._pos = (self._pos + 1) % self.window_size
+            self.observed += 1
+
+    def observe_frame(self, df: pd.DataFrame):
+        """Adds a batch of logged inferences."""
+        if df.empty:
+            return
+        n = len(df)
+        missing = pd.Series(np.nan, index=df.index)
+        codes = np.column_stack([
+            self._buckets(i, df[p.name] if p.name in df.columns else missing)
+            for i, p in enumerate(self.profiles)
+        ]) + self._offsets
+
+        with self._lock:
+            self.observed += n
+            if n >= self.window_size:
+                self._window[:] = codes[-self.window_size:]
+                self._counts[:] = np.bincount(self._window.ravel(), minlength=len(self._counts))
+                self._pos, self._filled = 0, self.window_size
+                return
+            slots = (self._pos + np.arange(n)) % self.window_size
+            # Rows beyond the free slots overwrite the oldest ones
+            n_evicted = max(0, n - (self.window_size - self._filled))
+            if n_evicted:
+                evicted = self._window[slots[n - n_evicted:]].ravel()
+                self._counts -= np.bincount(evicted, minlength=len(self._counts))
+            self._window[slots] = codes
+            self._counts += np.bincount(codes.ravel(), minlength=len(self._counts))
+            self._pos = (self._pos + n) % self.window_size
+            self._filled = min(self._filled + n, self.window_size)
+
+    def window_state(self) -> dict:
+        """JSON-serialisable bucket counts of the current window, for pooling across processes."""
+        with self._lock:
+            return {"counts": self._counts.tolist(), "rows": self._filled, "observed": self.observed}
+
+    def report(self, states: Optional[List[dict]] = None) -> dict:
+        """
+        Per-feature PSI / JS / KS scores of the current window and the share of
+        drifted features. With `states` (`window_state` of each process), their
+        windows are pooled; states of a different reference profile are skipped.
+        """
+        if states is None:
+            states = [self.window_state()]
+        states = [s for s in states if len(s["counts"]) == len(self._counts)]
+        counts = np.sum([s["counts"] for s in states], axis=0, dtype=np.int64)
+        rows = sum(s["rows"] for s in states)
+        summary = {
+            "window_rows": rows, "window_size": self.window_size, "processes": len(states),
+            "observed": sum(s["observed"] for s in states), "metric": self.metric, "threshold": self.threshold
+        }
+        if rows < max(self.min_rows, 1):
+            return {**summary, "status": "insufficient_data", "drift_share": None, "drifted_features": [], "features": {}}
+
+        features = {}
+        for i, profile in enumerate(self.profiles):
+            start = self._offsets[i]
+            scores = drift_scores(self._references[i], counts[start:start + profile.n_buckets].astype(np.float64),
+                                  numeric=profile.kind == "numeric")
+            value = scores.get(self.metric)
+            features[profile.name] = {
+                "kind": profile.kind, **scores,
+                "drifted": value is not None and value >= self.threshold
+            }
+        drifted = [name for name, f in features.items() if f["drifted"]]
+        return {
+            **summary, "status": "ok", "drift_share": len(drifted) / max(len(features), 1),
+            "drifted_features": drifted, "features": features
+        }
+
+    def drift_share(self) -> Optional[float]:
+        return self.report()["drift_share"]
+
+    def after_fork(self):
+        self._lock = threading.Lock()
+
+
+def build_drift_monitor(config: dict) -> Optional[StreamingDriftMonitor]:
+    """Streaming monitor from monitoring.drift, or None if disabled or no reference profile exists."""
+    drift_cfg = (config.get('monitoring') or {}).get('drift') or {}
+    if not drift_cfg.get('enabled', True):
+        return None
+    path = drift_cfg.get('reference_profile_path', "saved_models/drift_reference.json")
+    profiles = load_reference_profiles(path)
+    if not profiles:
+        logger.warning(f"No drift reference profile at {path}; streaming drift disabled")
+        return None
+    return StreamingDriftMonitor(
+        profiles,
+        window_size=drift_cfg.get('window_size', 5000),
+        min_rows=drift_cfg.get('min_rows', 500),
+        metric=drift_cfg.get('metric', "psi"),
+        threshold=drift_cfg.get('threshold', 0.2)
+    )
@@ -17,6 +17,10 @@ class ModelMonitor:
         self.report_dir = Path("src/monitoring/reports")
         self.report_dir.mkdir(parents=True, exist_ok=True)
 
+        # Cleaned reference frame, re-read only when the reference file changes
+        self._reference = None
+        self._reference_stamp = None
+
     def _load_reference_data(self) -> pd.DataFrame:
         """Loads reference data from Parquet or CSV."""
         if self.ref_path.exists() and self.ref_path.suffix == '.parquet':
@@ -28,68 +32,108 @@ class ModelMonitor:
         
         raise FileNotFoundError(f"Reference data not found at {self.ref_path}")
 
-    def generate_html_report(self) -> str:
+    def _reference_frame(self) -> pd.DataFrame:
+        """The cleaned reference frame, cached per monitor instance."""
+        path = self.ref_path if self.ref_path.exists() else self.ref_path.with_suffix('.csv')
+        stamp = path.stat().st_mtime_ns if path.exists() else None
+        if self._reference is None or stamp != self._reference_stamp:
+            self._reference = self._clean_frame(self._load_reference_data())
+            self._reference_stamp = stamp
+        return self._reference
+
+    @staticmethod
+    def _clean_frame(df: pd.DataFrame) -> pd.DataFrame:
+        cols_to_drop = ['id', 'logged_at', 'timestamp', 'datetime', 'ingested_at', 'model_version']
+        df = df.drop(columns=[c for c in cols_to_drop if c in df.columns])
+
+        cat_cols = ['primary_use', 'is_weekend', 'meter', 'site_id', 'week', 'month', 'day', 'hour']
+        for col in cat_cols:
+            if col in df.columns:
+                df[col] = df[col].astype(str)
+
+        num_cols = df.select_dtypes(include=[np.number]).columns
+        df[num_cols] = df[num_cols].astype(float)
+        return df
+
+    def _load_frames(self):
+        """
+        Loads reference data and the latest logged inferences, cleaned for
+        Evidently, plus the column mapping. Returns None if nothing is logged yet.
+        """
+        reference_df = self._reference_frame()
+        query = "SELECT * FROM inference_logs ORDER BY logged_at DESC LIMIT 5000"
+        current_df = pd.read_sql(query, con=self.db_client.get_engine())
+
+        if current_df.empty:
+            return None
+
+        current_df = self._clean_frame(current_df)
+
+        column_mapping = ColumnMapping()
+        
+        column_mapping.id = 'building_id'        
+        column_mapping.target = 'meter_reading'    
+        column_mapping.prediction = 'meter_reading' 
+        
+        column_mapping.numerical_features = [
+            'air_temperature', 'cloud_coverage', 'dew_temperature', 
+            'precip_depth_1_hr', 'sea_level_pressure', 'wind_direction', 
+            'wind_speed', 'square_feet'
+        ]
+
+     
+        column_mapping.categorical_features = [
+            'primary_use', 'is_weekend', 'meter', 'site_id', 'week', 'month', 'day', 'hour',
+        ]
+
+        return reference_df, current_df, column_mapping
+
+    def compute_drift_share(self) -> float:
+        """Share of monitored columns flagged as drifted (0.0 when nothing is logged yet)."""
+        frames = self._load_frames()
+        if frames is None:
+            return 0.0
+
+        reference_df, current_df, column_mapping = frames
+        report = Report(metrics=[DataDriftPreset()])
+        report.run(reference_data=reference_df, current_data=current_df, column_mapping=column_mapping)
+
+        result = report.as_dict()["metrics"][0]["result"]
+        return float(result.get("share_of_drifted_columns", 0.0))
+
+    def render_html_report(self) -> str:
+        """Runs the full health report and returns its HTML; raises on failure."""
         self.logger.info("Generating Model Health Report...")
+        frames = self._load_frames()
 
-        try:
-            reference_df = self._load_reference_data()
-            query = "SELECT * FROM inference_logs ORDER BY logged_at DESC LIMIT 5000"
-            current_df = pd.read_sql(query, con=self.db_client.get_engine())
-
-            if current_df.empty:
-                return "<html><body><h1>No data collected yet.</h1></body></html>"
-
-            for df in [reference_df, current_df]:
-                cols_to_drop = ['id', 'logged_at', 'timestamp', 'datetime', 'ingested_at', 'model_version']
-                df.drop(columns=[c for c in cols_to_drop if c in df.columns], inplace=True)
-                
-                cat_cols = ['primary_use', 'is_weekend', 'meter', 'site_id', 'week', 'month', 'day', 'hour']
-                for col in cat_cols:
-                    if col in df.columns:
-                        df[col] = df[col].astype(str)
-
-                num_cols = df.select_dtypes(include=[np.number]).columns
-                df[num_cols] = df[num_cols].astype(float)
-
-            column_mapping = ColumnMapping()
-            
-            column_mapping.id = 'building_id'        
-            column_mapping.target = 'meter_reading'    
-            column_mapping.prediction = 'meter_reading' 
-            
-            column_mapping.numerical_features = [
-                'air_temperature', 'cloud_coverage', 'dew_temperature', 
-                'precip_depth_1_hr', 'sea_level_pressure', 'wind_direction', 
-                'wind_speed', 'square_feet'
-            ]
-
-         
-            column_mapping.categorical_features = [
-                'primary_use', 'is_weekend', 'meter', 'site_id', 'week', 'month', 'day', 'hour',
-            ]
-
-            report = Report(metrics=[
-                DataQualityPreset(),
-                DataDriftPreset(),
-                TargetDriftPreset()
-            ])
-
-            self.logger.info("Running drift analysis with categorical-focused mapping...")
-
-            print("Test1", reference_df.dtypes)
-            print("Test2", current_df.dtypes)
-
-            report.run(
-                reference_data=reference_df, 
-                current_data=current_df,
-                column_mapping=column_mapping 
-            )
+        if frames is None:
+            return "<html><body><h1>No data collected yet.</h1></body></html>"
+
+        reference_df, current_df, column_mapping = frames
 
+        report = Report(metrics=[
+            DataQualityPreset(),
+            DataDriftPreset(),
+            TargetDriftPreset()
+        ])
+
+        self.logger.info("Running drift analysis with categorical-focused mapping...")
+
+        report.run(
+            reference_data=reference_df, 
+            current_data=current_df,
+            column_mapping=column_mapping 
+        )
+
+        return report.get_html()
+
+    def generate_html_report(self) -> str:
+        try:
+            html = self.render_html_report()
             report_path = self.report_dir / "latest_monitoring_report.html"
-            report.save_html(str(report_path))
-            
-            return report.get_html()
+            report_path.write_text(html, encoding="utf-8")
+            return html
 
         except Exception as e:
             self.logger.error(f"Failed to generate monitoring report: {e}", exc_info=True)
-            return f"<html><body><h1>Monitoring Error</h1><p>{str(e)}</p></body></html>"
\ No newline at end of file
+            return f"<html><body><h1>Monitoring Error</h1><p>{str(e)}</p></body></html>"
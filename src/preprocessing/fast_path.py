@@ -0,0 +1,68 @@
+import datetime
+import numpy as np
+from typing import Dict, List, Tuple
+from src.preprocessing.preprocessing import MLPreprocessor
+
+INFERENCE_YEAR = 2025
+
+class RowFeatureAssembler:
+    """
+    Pandas-free equivalent of FeatureEngineer.engineer followed by
+    MLPreprocessor.prepare_inference_features. The fitted preprocessor is
+    flattened once into per-feature lookups (category maps, scaler mean and
+    scale in feature order), so a request dict becomes the model's 1xN
+    float32 feature vector with a handful of dict and numpy operations.
+    The arithmetic mirrors StandardScaler.transform on float32 input, so
+    the vector is bit-identical to the DataFrame path.
+    """
+
+    def __init__(self, preprocessor: MLPreprocessor):
+        if preprocessor.feature_columns_ is None:
+            raise RuntimeError("Preprocessor has not been fitted.")
+
+        self.feature_columns = list(preprocessor.feature_columns_)
+        self.category_maps = {
+            col: preprocessor.category_maps[col]
+            for col in preprocessor.categorical_cols if col in self.feature_columns
+        }
+
+        scaled = [col for col in preprocessor.numeric_scaled_cols if col in self.feature_columns]
+        self.scaled_positions = np.array([self.feature_columns.index(col) for col in scaled], dtype=np.intp)
+        self.scaled_columns = scaled
+        self.means = np.array([preprocessor.scaler_map[col].mean_[0] for col in scaled], dtype=np.float64)
+        self.scales = np.array([preprocessor.scaler_map[col].scale_[0] for col in scaled], dtype=np.float64)
+
+        self._scaled_set = set(scaled)
+
+    def time_features(self, record: dict) -> Dict[str, int]:
+        """is_weekend and hour, as FeatureEngineer derives them from the request's synthetic timestamp."""
+        day = datetime.date(INFERENCE_YEAR, int(record['month']), int(record['day']))
+        return {"is_weekend": int(day.weekday() >= 5), "hour": int(record['hour'])}
+
+    def assemble(self, record: dict) -> Tuple[np.ndarray, Dict[str, int]]:
+        """The 1xN float32 model input for one request, plus the derived time features."""
+        rows, derived = self.assemble_many([record])
+        return rows, derived[0]
+
+    def assemble_many(self, records: List[dict]) -> Tuple[np.ndarray, List[Dict[str, int]]]:
+        """The NxF float32 model input for a list of requests, plus each one's derived time features."""
+        derived = [self.time_features(record) for record in records]
+        values = [{**record, **extra} for record, extra in zip(records, derived)]
+
+        rows = np.zeros((len(records), len(self.feature_columns)), dtype=np.float32)
+        for pos, col in enumerate(self.feature_columns):
+            mapping = self.category_maps.get(col)
+            if mapping is not None:
+                rows[:, pos] = [mapping.get(str(v[col]), -1) if col in v else -1 for v in values]
+            elif col not in self._scaled_set:
+                rows[:, pos] = [v.get(col, 0) for v in values]
+
+        if len(self.scaled_positions):
+            raw = np.array([[v.get(col, np.nan) for col in self.scaled_columns] for v in values],
+                           dtype=np.float32).reshape(len(records), len(self.scaled_columns))
+            centred = (raw.astype(np.float64) - self.means).astype(np.float32)
+            scaled = (centred.astype(np.float64) / self.scales).astype(np.float32)
+            # Scaled columns absent from the request are filled with 0.0 after scaling
+            rows[:, self.scaled_positions] = np.where(np.isnan(raw), np.float32(0.0), scaled)
+
+        return rows, derived
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import gc
+from typing import Tuple
 
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
@@ -120,4 +121,52 @@ class MLPreprocessor:
         df = df.reindex(columns=self.feature_columns_, fill_value=0)
 
         self.logger.info("Inference preprocessing completed successfully")
-        return df
\ No newline at end of file
+        return df
+
+
+    def to_spec(self) -> Tuple[dict, np.ndarray]:
+        """
+        Fitted state as a JSON-safe spec plus a (2, n_scaled) float64 array
+        of scaler means and scales, in numeric_scaled_cols order.
+        """
+        if self.feature_columns_ is None:
+            raise RuntimeError("Preprocessor has not been fitted.")
+
+        spec = {
+            "target_column": self.target_column,
+            "categorical_cols": list(self.categorical_cols),
+            "numeric_scaled_cols": list(self.numeric_scaled_cols),
+            "feature_columns": list(self.feature_columns_),
+            "exclude_numeric_cols": sorted(self.exclude_numeric_cols),
+            "drop_cols": sorted(self.drop_cols),
+            # Inference maps values through astype(str), so string keys lose nothing
+            "category_maps": {
+                col: {str(k): int(v) for k, v in mapping.items()}
+                for col, mapping in self.category_maps.items()
+            }
+        }
+        scaler_params = np.array([
+            [self.scaler_map[col].mean_[0] for col in self.numeric_scaled_cols],
+            [self.scaler_map[col].scale_[0] for col in self.numeric_scaled_cols]
+        ], dtype=np.float64).reshape(2, len(self.numeric_scaled_cols))
+        return spec, scaler_params
+
+    @classmethod
+    def from_spec(cls, spec: dict, scaler_params: np.ndarray) -> "MLPreprocessor":
+        """Rebuilds a fitted preprocessor from to_spec() output without unpickling sklearn objects."""
+        prep = cls(target_column=spec["target_column"])
+        prep.categorical_cols = list(spec["categorical_cols"])
+        prep.numeric_scaled_cols = list(spec["numeric_scaled_cols"])
+        prep.feature_columns_ = list(spec["feature_columns"])
+        prep.exclude_numeric_cols = set(spec["exclude_numeric_cols"])
+        prep.drop_cols = set(spec["drop_cols"])
+        prep.category_maps = {col: dict(mapping) for col, mapping in spec["category_maps"].items()}
+
+        for i, col in enumerate(prep.numeric_scaled_cols):
+            scaler = StandardScaler()
+            scaler.mean_ = np.array([scaler_params[0, i]], dtype=np.float64)
+            scaler.scale_ = np.array([scaler_params[1, i]], dtype=np.float64)
+            scaler.var_ = scaler.scale_ ** 2
+            scaler.n_features_in_ = 1
+            prep.scaler_map[col] = scaler
+        return prep
@@ -6,6 +6,8 @@ from src.common.logger import get_logger
 from src.preprocessing.preprocessing import MLPreprocessor  
 from src.preprocessing.feature_engineering import FeatureEngineer   
 from src.common.redis_client import RedisClient
+from src.training.shards import ShardWriter
+from src.monitoring.drift import build_reference_profiles, save_reference_profiles
 import gc
 import pandas as pd
 import joblib
@@ -49,6 +51,9 @@ class PreprocessingStage:
         gc.collect()
 
         self._save_monitoring_reference(df_engineered)
+        self._save_drift_reference(df_engineered)
+
+        timestamps = df_engineered[['timestamp']].reset_index(drop=True)
 
         X, y = self.ml_prep.prepare_ml_features(df_engineered)
 
@@ -59,15 +64,20 @@ class PreprocessingStage:
 
         # X_train, X_test, y_train, y_test = self.ml_prep.split_data(X, y)
 
-        logger.info("Caching split data in Redis...")
+        if self.config['training'].get('data_source', 'redis') == "shards":
+            logger.info("Writing training data as Parquet shards...")
+            ShardWriter(self.config['training']).write(X, y, timestamps['timestamp'])
+        else:
+            logger.info("Caching split data in Redis...")
 
-        self.redis_client.store_dataframe(X, "ashrae_pipeline_X_train")
-        self.redis_client.store_dataframe(pd.DataFrame(y, columns=['target']), "ashrae_pipeline_y_train")
+            self.redis_client.store_dataframe(X, "ashrae_pipeline_X_train")
+            self.redis_client.store_dataframe(pd.DataFrame(y, columns=['target']), "ashrae_pipeline_y_train")
+            self.redis_client.store_dataframe(timestamps, "ashrae_pipeline_ts_train")
 
         # self.redis_client.store_dataframe(X_test, "X_test")
         # self.redis_client.store_dataframe(pd.DataFrame(y_test, columns=['target']), "y_test")
 
-        del X, y
+        del X, y, timestamps
         gc.collect()
 
         return
@@ -99,6 +109,24 @@ class PreprocessingStage:
             df_ref.to_csv(csv_fallback, index=False)
             logger.warning(f"Saved fallback reference CSV to {csv_fallback}")
 
+    def _save_drift_reference(self, df: pd.DataFrame):
+        """Precomputes the reference histograms the streaming drift monitor compares against."""
+        drift_cfg = self.config['monitoring'].get('drift') or {}
+        path = drift_cfg.get('reference_profile_path', "saved_models/drift_reference.json")
+
+        columns = {col: df[col] for col in RAW_DATA_TYPES["inference"] if col in df.columns}
+        if 'meter_reading' in columns:
+            # Logged predictions are on the original scale
+            columns['meter_reading'] = np.expm1(columns['meter_reading'].astype(np.float64))
+
+        profiles = build_reference_profiles(
+            columns,
+            bins=drift_cfg.get('bins', 10),
+            max_categories=drift_cfg.get('max_categories', 50)
+        )
+        save_reference_profiles(profiles, path)
+        logger.info(f"Drift reference profile ({len(profiles)} features) saved to {path}")
+
 def run_preprocessing_stage(config: dict):
     stage = PreprocessingStage(config)
     return stage.run()
\ No newline at end of file
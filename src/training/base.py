@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
 import pandas as pd
 
 class BaseModel(ABC):
@@ -14,4 +15,43 @@ class BaseModel(ABC):
 
     @abstractmethod
     def save_model(self, path: str):
-        pass
\ No newline at end of file
+        pass
+
+@dataclass(frozen=True)
+class FoldResult:
+    """
+    Outcome of training and validating a single CV fold. `breakdown` holds
+    mergeable metric accumulators ("overall" plus one per segment key).
+    """
+    fold: int
+    model: Any
+    metrics: Dict[str, float]
+    train_rows: int
+    val_rows: int
+    execution_time_seconds: float
+    breakdown: Dict[str, Any] = field(default_factory=dict)
+
+@dataclass(frozen=True)
+class ServingBundle:
+    """
+    A loaded serving bundle: the native LightGBM model (or SegmentedModel),
+    the preprocessor rebuilt from its spec, the model's feature order and
+    the bundle's content hash, which identifies it for caching and swaps.
+    """
+    model: Any
+    preprocessor: Any
+    feature_columns: List[str]
+    content_hash: str
+    manifest: Dict[str, Any]
+
+@dataclass(frozen=True)
+class ServedModel:
+    """
+    What serving swaps as one unit: a model together with the preprocessing
+    it was trained with (and the fast-path row assembler built from it), and
+    the token identifying that model for caching and hot swaps.
+    """
+    model: Any
+    preprocessor: Any
+    row_assembler: Any
+    token: str
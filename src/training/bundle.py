@@ -0,0 +1,112 @@
+import json
+import lightgbm as lgb
+import mlflow.pyfunc
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+FALLBACK_SEGMENT = "__fallback__"
+
+class SegmentedModel:
+    """
+    Bundle of per-segment LightGBM boosters (e.g. one per meter, or per
+    meter and site). Each input row is routed to its segment's booster;
+    rows are grouped by segment so every booster is called once per batch.
+    Rows whose segment has no dedicated model go to the fallback booster.
+    """
+
+    def __init__(self, segment_keys: List[str], models: Dict[Tuple, lgb.Booster],
+                 fallback: Optional[lgb.Booster] = None):
+        self.segment_keys = list(segment_keys)
+        self.models = models
+        self.fallback = fallback
+
+    @staticmethod
+    def segment_name(segment_keys: List[str], segment: Tuple) -> str:
+        return "|".join(f"{k}={v}" for k, v in zip(segment_keys, segment))
+
+    def feature_name(self) -> List[str]:
+        booster = self.fallback or next(iter(self.models.values()))
+        return booster.feature_name()
+
+    def predict(self, X, **kwargs) -> np.ndarray:
+        """
+        Predicts a DataFrame (or 2D array in feature order), one booster call
+        per segment. Booster kwargs such as pred_contrib=True pass through, and
+        the output keeps the booster's per-row shape.
+        """
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(np.asarray(X), columns=self.feature_name())
+
+        key_values = X[self.segment_keys].to_numpy(dtype=np.int64)
+        segments, inverse = np.unique(key_values, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        routed, fallback_rows = [], []
+        for group_id, segment in enumerate(segments):
+            rows = np.flatnonzero(inverse == group_id)
+            model = self.models.get(tuple(int(v) for v in segment))
+            if model is None:
+                fallback_rows.append(rows)
+            else:
+                routed.append((rows, model))
+
+        if fallback_rows:
+            if self.fallback is None:
+                raise KeyError(f"No segment model or fallback for {len(fallback_rows)} segment(s)")
+            routed.append((np.concatenate(fallback_rows), self.fallback))
+
+        preds = None
+        for rows, model in routed:
+            out = model.predict(X.iloc[rows], **kwargs)
+            if preds is None:
+                preds = np.empty((len(X),) + out.shape[1:], dtype=np.float64)
+            preds[rows] = out
+
+        return preds if preds is not None else np.empty(0, dtype=np.float64)
+
+    def save(self, path: str) -> str:
+        """Writes every booster in LightGBM's native text format plus a JSON manifest."""
+        bundle_dir = Path(path)
+        bundle_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = {"segment_keys": self.segment_keys, "segments": []}
+        for i, (segment, model) in enumerate(sorted(self.models.items())):
+            file_name = f"segment_{i:03d}.txt"
+            model.save_model(str(bundle_dir / file_name))
+            manifest["segments"].append({"values": [int(v) for v in segment], "file": file_name})
+
+        if self.fallback is not None:
+            self.fallback.save_model(str(bundle_dir / "fallback.txt"))
+            manifest["fallback"] = "fallback.txt"
+
+        with open(bundle_dir / "manifest.json", "w") as f:
+            json.dump(manifest, f, indent=2)
+        return str(bundle_dir)
+
+    @classmethod
+    def load(cls, path: str) -> "SegmentedModel":
+        bundle_dir = Path(path)
+        with open(bundle_dir / "manifest.json", "r") as f:
+            manifest = json.load(f)
+
+        models = {
+            tuple(entry["values"]): lgb.Booster(model_file=str(bundle_dir / entry["file"]))
+            for entry in manifest["segments"]
+        }
+        fallback = None
+        if manifest.get("fallback"):
+            fallback = lgb.Booster(model_file=str(bundle_dir / manifest["fallback"]))
+
+        return cls(manifest["segment_keys"], models, fallback)
+
+
+class SegmentedPyfuncModel(mlflow.pyfunc.PythonModel):
+    """MLflow pyfunc wrapper so a SegmentedModel can be registered and served like a booster."""
+
+    def load_context(self, context):
+        self.bundle = SegmentedModel.load(context.artifacts["bundle"])
+
+    def predict(self, context, model_input, params=None):
+        return self.bundle.predict(model_input)
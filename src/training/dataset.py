@@ -0,0 +1,175 @@
+import hashlib
+import json
+import os
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from src.common.logger import get_logger
+from src.common.redis_client import RedisClient
+from src.training.shards import ParquetShardStore
+
+def load_training_data(config: dict, redis_client: RedisClient):
+    """
+    Loads the preprocessed X/y cached by the preprocessing stage, sampled if configured.
+    With `training.data_source: shards`, X is a ParquetShardStore streamed from disk
+    instead of an in-memory DataFrame, and y is a float32 array.
+    """
+    training_cfg = config['training']
+    if training_cfg.get('data_source', 'redis') == "shards":
+        max_rows = training_cfg['sample_size'] if training_cfg['use_sample'] else None
+        X = ParquetShardStore(training_cfg['shard_dir'], max_rows=max_rows)
+        return X, X.load_labels()
+
+    X = redis_client.load_dataframe("ashrae_pipeline_X_train")
+    y = redis_client.load_dataframe("ashrae_pipeline_y_train").iloc[:, 0]
+
+    if config['training']['use_sample']:
+        size = config['training']['sample_size']
+        X, y = X.iloc[:size], y.iloc[:size]
+
+    return X, y
+
+def load_feature_sample(config: dict, redis_client: RedisClient, n_rows: int) -> pd.DataFrame:
+    """First `n_rows` rows of the preprocessed training features, from the same source training reads."""
+    training_cfg = config['training']
+    if training_cfg.get('data_source', 'redis') == "shards":
+        X = ParquetShardStore(training_cfg['shard_dir'], max_rows=n_rows)
+        return take_rows(X, np.arange(len(X)))
+    return redis_client.load_dataframe("ashrae_pipeline_X_train").iloc[:n_rows]
+
+def load_training_timestamps(config: dict, redis_client: RedisClient) -> np.ndarray:
+    """Row-aligned reading timestamps (datetime64[ns]) for the cached training matrix."""
+    training_cfg = config['training']
+    if training_cfg.get('data_source', 'redis') == "shards":
+        max_rows = training_cfg['sample_size'] if training_cfg['use_sample'] else None
+        return ParquetShardStore(training_cfg['shard_dir'], max_rows=max_rows).load_timestamps()
+
+    ts = redis_client.load_dataframe("ashrae_pipeline_ts_train")['timestamp'].to_numpy()
+
+    if config['training']['use_sample']:
+        ts = ts[:config['training']['sample_size']]
+
+    return ts
+
+def take_rows(X, indices: np.ndarray) -> pd.DataFrame:
+    """Rows of an in-memory frame, memory-mapped matrix or shard store by position."""
+    if isinstance(X, pd.DataFrame):
+        return X.iloc[indices]
+    if isinstance(X, ParquetShardStore):
+        return pd.DataFrame(X.take(indices), columns=X.columns)
+    return X[indices]
+
+class DatasetBuilder:
+    """
+    Builds a single binned LightGBM Dataset for the full training matrix.
+    Fold train/validation sets are derived by index subsetting, so histogram
+    binning runs once per run (or once across runs with the binary cache).
+    """
+
+    def __init__(self, config: dict):
+        self.logger = get_logger("DatasetBuilder")
+        self.training_cfg = config['training']
+        self.cache_path = self.training_cfg.get('dataset_cache_path')
+        self.dataset_params = dict(self.training_cfg.get('dataset_params') or {})
+        self.dataset_params.setdefault('verbosity', -1)
+
+    def build(self, X: pd.DataFrame, y: pd.Series) -> lgb.Dataset:
+        """Returns a constructed Dataset, loading the binary cache when it matches X/y."""
+        fingerprint = self._fingerprint(X, y)
+
+        if self.cache_path and self._cache_is_valid(fingerprint):
+            self.logger.info(f"Loading binned Dataset from cache: {self.cache_path}")
+            dataset = lgb.Dataset(self.cache_path, params=self.dataset_params, free_raw_data=True)
+            return dataset.construct()
+
+        self.logger.info(f"Binning full training matrix once: {X.shape}")
+        if isinstance(X, ParquetShardStore):
+            dataset = lgb.Dataset(
+                X.sequences(), label=y, feature_name=X.columns,
+                params=self.dataset_params, free_raw_data=True
+            ).construct()
+        else:
+            dataset = lgb.Dataset(X, label=y, params=self.dataset_params, free_raw_data=True).construct()
+
+        if self.cache_path:
+            self._save_cache(dataset, fingerprint)
+
+        return dataset
+
+    @staticmethod
+    def subset(full: lgb.Dataset, indices: np.ndarray) -> lgb.Dataset:
+        """
+        Index-based view of an already-binned Dataset that reuses its bin mappers.
+        `Dataset.subset` runs Python's sorted() over the indices, which builds a
+        list of numpy scalars per fold; the int32 array is assigned directly instead.
+        """
+        fold_set = full.subset([])
+        fold_set.used_indices = np.sort(np.asarray(indices, dtype=np.int32))
+        return fold_set
+
+    def fold_sets(self, full: lgb.Dataset, train_idx: np.ndarray, val_idx: np.ndarray):
+        """Train/validation Datasets for one fold, both sharing the full Dataset bins."""
+        return self.subset(full, train_idx), self.subset(full, val_idx)
+
+    def _fingerprint(self, X: pd.DataFrame, y: pd.Series) -> dict:
+        return {
+            "rows": int(len(X)),
+            "columns": [str(c) for c in X.columns],
+            "label_sum": round(float(np.asarray(y, dtype=np.float64).sum()), 4),
+            "features": self._feature_digest(X),
+            "dataset_params": self.dataset_params
+        }
+
+    @staticmethod
+    def _feature_digest(X, sample_rows: int = 4096) -> str:
+        """
+        Hash of the feature values, so re-preprocessed data with the same
+        shape and labels does not reuse stale bins: a strided row sample,
+        plus per-column sums for an in-memory frame or the shard files'
+        sizes and modification times for a shard store (one cheap pass
+        instead of re-reading every shard).
+        """
+        digest = hashlib.sha256()
+        indices = np.unique(np.linspace(0, len(X) - 1, min(sample_rows, len(X))).astype(np.int64))
+        sample = take_rows(X, indices)
+        digest.update(pd.util.hash_pandas_object(sample, index=False).to_numpy().tobytes())
+
+        if isinstance(X, ParquetShardStore):
+            for path in X.paths:
+                stat = os.stat(path)
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        else:
+            sums = X.select_dtypes("number").sum().to_numpy(dtype=np.float64)
+            digest.update(sums.tobytes())
+        return digest.hexdigest()
+
+    def _meta_path(self) -> Path:
+        return Path(f"{self.cache_path}.meta.json")
+
+    def _cache_is_valid(self, fingerprint: dict) -> bool:
+        meta_path = self._meta_path()
+        if not Path(self.cache_path).exists() or not meta_path.exists():
+            return False
+
+        try:
+            with open(meta_path, "r") as f:
+                cached = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable Dataset cache metadata: {e}")
+            return False
+
+        if cached != fingerprint:
+            self.logger.info("Dataset cache is stale (training data changed). Rebuilding...")
+            return False
+        return True
+
+    def _save_cache(self, dataset: lgb.Dataset, fingerprint: dict):
+        try:
+            Path(self.cache_path).parent.mkdir(parents=True, exist_ok=True)
+            dataset.save_binary(self.cache_path)
+            with open(self._meta_path(), "w") as f:
+                json.dump(fingerprint, f)
+            self.logger.info(f"Binned Dataset cached at: {self.cache_path}")
+        except Exception as e:
+            self.logger.warning(f"Could not cache binned Dataset: {e}")
@@ -0,0 +1,42 @@
+import lightgbm as lgb
+from typing import List
+
+def merge_fold_boosters(models: List[lgb.Booster]) -> lgb.Booster:
+    """
+    Merges K fold boosters into one booster whose prediction is their mean.
+
+    A regression booster's raw score is the sum of its tree outputs, so
+    concatenating every fold's trees (up to its best iteration) and scaling
+    each leaf value by 1/K gives the fold average in a single predict call.
+    The result is a plain LightGBM booster: it is saved, registered, warm
+    started and explained exactly like a single fold model.
+    """
+    if len(models) == 1:
+        return models[0]
+
+    scale = 1.0 / len(models)
+    header, footer, trees = None, None, []
+
+    for model in models:
+        text = model.model_to_string()
+        trees_start = text.index("\nTree=")
+        trees_end = text.index("end of trees")
+        if header is None:
+            header = text[:trees_start + 1]
+            footer = text[text.index("\nparameters:"):]
+        trees.extend(text[trees_start + 1:trees_end].strip().split("\n\n\n"))
+
+    merged = []
+    for tree_id, tree in enumerate(trees):
+        lines = tree.split("\n")
+        lines[0] = f"Tree={tree_id}"
+        for i, line in enumerate(lines):
+            key, _, values = line.partition("=")
+            if key in ("leaf_value", "internal_value"):
+                lines[i] = f"{key}=" + " ".join(repr(float(v) * scale) for v in values.split(" "))
+        merged.append("\n".join(lines))
+
+    # tree_sizes would describe the first model only; without it LightGBM parses trees sequentially
+    header = "\n".join(line for line in header.split("\n") if not line.startswith("tree_sizes="))
+    model_str = header + "\n".join(t + "\n\n" for t in merged) + "end of trees\n" + footer
+    return lgb.Booster(model_str=model_str)
@@ -0,0 +1,174 @@
+import ctypes
+import re
+import threading
+import weakref
+import lightgbm as lgb
+import numpy as np
+from typing import Any
+from src.common.logger import get_logger
+
+try:
+    # LightGBM's ctypes handle to the C API; not part of the public Python API
+    from lightgbm.basic import _LIB, _safe_call, _c_str
+except ImportError:  # pragma: no cover - depends on the installed LightGBM
+    _LIB = None
+
+_PREDICT_NORMAL = 0
+_DTYPES = {np.dtype(np.float32): 0, np.dtype(np.float64): 1}
+_ROW_MAJOR = 1
+# C API functions the predictor calls (pinned by tests/test_fast_predict.py)
+REQUIRED_SYMBOLS = (
+    "LGBM_BoosterPredictForMatSingleRowFastInit", "LGBM_BoosterPredictForMatSingleRowFast",
+    "LGBM_BoosterPredictForMat", "LGBM_FastConfigFree"
+)
+
+def _free_fast_config(config: ctypes.c_void_p, booster: lgb.Booster):
+    # `booster` is only held so its handle outlives the FastConfig that points at it
+    if config.value:
+        _LIB.LGBM_FastConfigFree(config)
+        config.value = None
+
+
+class _RowScorer:
+    """
+    One thread's FastConfig and output buffer for single-row scoring. The
+    FastConfig is freed when the thread exits or the predictor goes away.
+    """
+    __slots__ = ("config", "out", "out_ptr", "out_len", "__weakref__")
+
+    def __init__(self, booster: lgb.Booster, num_iteration: int, num_features: int, params):
+        self.config = ctypes.c_void_p()
+        _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFastInit(
+            booster._handle,
+            ctypes.c_int(_PREDICT_NORMAL),
+            ctypes.c_int(0),
+            ctypes.c_int(num_iteration),
+            ctypes.c_int(_DTYPES[np.dtype(np.float32)]),
+            ctypes.c_int32(num_features),
+            params,
+            ctypes.byref(self.config)
+        ))
+        weakref.finalize(self, _free_fast_config, self.config, booster)
+        self.out = np.zeros(1, dtype=np.float64)
+        self.out_ptr = self.out.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        self.out_len = ctypes.c_int64(0)
+
+
+class FastBoosterPredictor:
+    """
+    Low-overhead scoring for a LightGBM booster on serving-sized inputs.
+    Booster.predict re-validates its input, re-parses prediction parameters
+    and sets up the thread pool on every call, which costs more than walking
+    the trees for a single row. This predictor talks to the C API directly:
+    single rows go through LGBM_BoosterPredictForMatSingleRowFast with a
+    FastConfig prepared once, small batches through LGBM_BoosterPredictForMat
+    with a fixed parameter string. Anything else (DataFrames, or kwargs such
+    as pred_contrib) is delegated to the booster, as are all other
+    attributes, so the predictor can stand in for the booster it wraps.
+    Each thread scores single rows through its own FastConfig and output
+    buffer, so concurrent requests do not queue on a Python lock.
+
+    The C API is reached through LightGBM's private ctypes handle, which is
+    why lightgbm is pinned; if an installed version lacks any of
+    REQUIRED_SYMBOLS the constructor raises and callers keep using
+    Booster.predict.
+
+    Output parity with Booster.predict is checked at construction on probe
+    rows drawn from the booster's feature ranges (with missing values);
+    any difference raises, so callers can fall back to the booster.
+    """
+
+    def __init__(self, booster: lgb.Booster, num_threads: int = 1, parity_rows: int = 256, seed: int = 0):
+        missing = list(REQUIRED_SYMBOLS) if _LIB is None else [s for s in REQUIRED_SYMBOLS if not hasattr(_LIB, s)]
+        if missing:
+            raise RuntimeError(f"LightGBM {lgb.__version__} does not expose {', '.join(missing)}")
+
+        self.logger = get_logger("FastBoosterPredictor")
+        self.booster = booster
+        self.num_features = booster.num_feature()
+        self.num_iteration = booster.best_iteration if booster.best_iteration > 0 else -1
+        self._params = _c_str(f"num_threads={num_threads}")
+        self._local = threading.local()
+        # Fails here rather than on the first request if the booster cannot be scored this way
+        self._scorer()
+
+        if parity_rows:
+            self.verify_parity(self.probe_rows(parity_rows, seed))
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("booster", "_local"):
+            raise AttributeError(name)
+        return getattr(self.booster, name)
+
+    def _scorer(self) -> _RowScorer:
+        try:
+            return self._local.scorer
+        except AttributeError:
+            scorer = self._local.scorer = _RowScorer(self.booster, self.num_iteration, self.num_features, self._params)
+            return scorer
+
+    def predict(self, X, **kwargs) -> np.ndarray:
+        if kwargs or not isinstance(X, np.ndarray) or X.dtype not in _DTYPES:
+            return self.booster.predict(X, **kwargs)
+        X = np.ascontiguousarray(X.reshape(-1, self.num_features) if X.ndim == 1 else X)
+        if X.shape[1] != self.num_features:
+            return self.booster.predict(X)
+        if X.shape[0] == 1 and X.dtype == np.float32:
+            return self._predict_row(X)
+        return self._predict_matrix(X)
+
+    def _predict_row(self, row: np.ndarray) -> np.ndarray:
+        scorer = self._scorer()
+        _safe_call(_LIB.LGBM_BoosterPredictForMatSingleRowFast(
+            scorer.config,
+            ctypes.c_void_p(row.ctypes.data),
+            ctypes.byref(scorer.out_len),
+            scorer.out_ptr
+        ))
+        return scorer.out.copy()
+
+    def _predict_matrix(self, X: np.ndarray) -> np.ndarray:
+        preds = np.empty(X.shape[0], dtype=np.float64)
+        out_len = ctypes.c_int64(0)
+        _safe_call(_LIB.LGBM_BoosterPredictForMat(
+            self.booster._handle,
+            ctypes.c_void_p(X.ctypes.data),
+            ctypes.c_int(_DTYPES[X.dtype]),
+            ctypes.c_int32(X.shape[0]),
+            ctypes.c_int32(X.shape[1]),
+            ctypes.c_int(_ROW_MAJOR),
+            ctypes.c_int(_PREDICT_NORMAL),
+            ctypes.c_int(0),
+            ctypes.c_int(self.num_iteration),
+            self._params,
+            ctypes.byref(out_len),
+            preds.ctypes.data_as(ctypes.POINTER(ctypes.c_double))
+        ))
+        return preds
+
+    def probe_rows(self, n_rows: int, seed: int = 0) -> np.ndarray:
+        """Random float32 rows spanning each feature's training range (from the model's feature_infos), 5% missing."""
+        infos = re.search(r"^feature_infos=(.*)$", self.booster.model_to_string(num_iteration=1), re.M).group(1).split()
+        rng = np.random.default_rng(seed)
+        rows = np.zeros((n_rows, self.num_features), dtype=np.float32)
+        for col, info in enumerate(infos):
+            bounds = re.fullmatch(r"\[(.+):(.+)\]", info)
+            if bounds:
+                low, high = float(bounds.group(1)), float(bounds.group(2))
+                rows[:, col] = rng.uniform(low, high, n_rows)
+            else:
+                # Categorical ("a:b:c") or unused ("none") feature
+                values = [float(v) for v in info.split(":") if v != "none"] or [0.0]
+                rows[:, col] = rng.choice(values, n_rows)
+        rows[rng.random(rows.shape) < 0.05] = np.nan
+        return rows
+
+    def verify_parity(self, rows: np.ndarray):
+        """Raises unless single-row and batch scoring match Booster.predict exactly on `rows`."""
+        expected = self.booster.predict(rows)
+        singles = np.concatenate([self._predict_row(rows[i:i + 1]) for i in range(len(rows))])
+        batch = self._predict_matrix(np.ascontiguousarray(rows))
+        if not (np.array_equal(singles, expected) and np.array_equal(batch, expected)):
+            worst = max(np.abs(singles - expected).max(), np.abs(batch - expected).max())
+            raise ValueError(f"Fast predictor differs from Booster.predict (max abs diff {worst:.3e})")
+        self.logger.info(f"Fast predictor matches Booster.predict exactly on {len(rows)} probe rows")
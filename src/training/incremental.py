@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+import mlflow
+from typing import Any, Dict, Optional
+from src.common.logger import get_logger
+from src.common.mlflow_tracker import MLflowTracker, resolve_latest_version
+from src.training.model import LGBMModel
+from src.training.dataset import take_rows
+from src.training.serving_bundle import SERVING_BUNDLE_ARTIFACT, export_serving_bundle
+from src.monitoring.drift import build_drift_monitor
+from src.database.connection import DBClient
+
+class IncrementalTrainer:
+    """
+    Warm-start retraining: continues boosting the latest registered booster
+    on the most recent data window plus a replay sample of older rows, and
+    records the parent model version as lineage in MLflow. A full retrain is
+    requested instead when the schedule is due or inference drift is high.
+    """
+
+    def __init__(self, config: dict, tracker: MLflowTracker):
+        self.logger = get_logger("IncrementalTrainer")
+        self.config = config
+        self.inc_cfg = config['training'].get('incremental') or {}
+        self.model_name = config['mlflow']['model_name']
+        self.tracker = tracker
+        self.model_wrapper = LGBMModel()
+
+    def full_retrain_reason(self) -> Optional[str]:
+        """Why this run must be a full retrain, or None if warm-starting is allowed."""
+        latest = resolve_latest_version(self.model_name)
+        if latest is None:
+            return "no registered model to warm-start from"
+
+        flavors = mlflow.models.get_model_info(f"models:/{self.model_name}/{latest.version}").flavors
+        if "lightgbm" not in flavors:
+            return f"registered version {latest.version} is not a single LightGBM booster"
+
+        every_days = self.inc_cfg.get('full_retrain_every_days')
+        if every_days:
+            last_full = self.tracker.last_run_time({"training_type": "full"})
+            if last_full is None:
+                return "no previous full training run found"
+            age_days = (pd.Timestamp.now(tz=last_full.tz) - last_full).total_seconds() / 86400
+            if age_days >= every_days:
+                return f"scheduled full retrain due (last one {age_days:.1f} days ago)"
+
+        threshold = self.inc_cfg.get('drift_threshold')
+        if threshold is not None:
+            drift_share = self._drift_share()
+            if drift_share is not None and drift_share >= threshold:
+                return f"drift share {drift_share:.2f} crossed threshold {threshold}"
+
+        return None
+
+    def _drift_share(self) -> Optional[float]:
+        """Drift of the latest logged inferences: histogram scores against the
+        reference profile when one exists, otherwise a full Evidently run."""
+        try:
+            drift_monitor = build_drift_monitor(self.config)
+            if drift_monitor is not None:
+                query = f"SELECT * FROM inference_logs ORDER BY logged_at DESC LIMIT {drift_monitor.window_size}"
+                drift_monitor.observe_frame(pd.read_sql(query, con=DBClient(self.config['db']).get_engine()))
+                return drift_monitor.drift_share()
+
+            from src.monitoring.monitor import ModelMonitor
+            return ModelMonitor(self.config).compute_drift_share()
+        except Exception as e:
+            self.logger.warning(f"Drift check unavailable, not forcing a full retrain: {e}")
+            return None
+
+    def run(self, X, y, timestamps: np.ndarray, params: Dict[str, Any]):
+        self.logger.info("--- STARTING INCREMENTAL (WARM-START) TRAINING ---")
+
+        parent = resolve_latest_version(self.model_name)
+        parent_uri = f"models:/{self.model_name}/{parent.version}"
+        init_model = mlflow.lightgbm.load_model(parent_uri)
+        self.logger.info(f"Warm-starting from {parent_uri} ({init_model.num_trees()} trees)")
+
+        train_idx, val_idx, n_new, n_replay = self._select_rows(timestamps)
+        inc_params = {**params, **(self.inc_cfg.get('params_override') or {})}
+
+        dataset_params = dict(self.config['training'].get('dataset_params') or {})
+        dataset_params.setdefault('verbosity', -1)
+        y = np.asarray(y)
+        X_val, y_val = take_rows(X, val_idx), y[val_idx]
+        train_set = lgb.Dataset(take_rows(X, train_idx), label=y[train_idx], params=dataset_params)
+        val_set = lgb.Dataset(X_val, label=y_val, reference=train_set)
+
+        lineage = {
+            "training_type": "incremental",
+            "parent_model_name": self.model_name,
+            "parent_model_version": str(parent.version),
+            "parent_run_id": parent.run_id
+        }
+
+        with self.tracker.start_run(run_name="ASHRAE_Incremental_Training", tags=lineage):
+            self.tracker.log_metadata(
+                params={
+                    **inc_params,
+                    "init_model_uri": parent_uri,
+                    "window_days": self.inc_cfg.get('window_days', 7),
+                    "new_rows": n_new,
+                    "replay_rows": n_replay
+                },
+                metrics={}
+            )
+
+            baseline = self.model_wrapper.evaluate(y_val, self.model_wrapper.predict(init_model, X_val))
+
+            model = self.model_wrapper.train_fold(
+                train_set, val_set, inc_params,
+                num_boost_round=self.inc_cfg.get('num_boost_round', 200),
+                early_stopping_rounds=self.config['training'].get('early_stopping_rounds', 50),
+                init_model=init_model
+            )
+            metrics = self.model_wrapper.evaluate(y_val, self.model_wrapper.predict(model, X_val))
+
+            avg_metrics = {
+                "avg_rmse": metrics['RMSE'],
+                "avg_mae": metrics['MAE'],
+                "avg_r2": metrics['R2'],
+                "baseline_rmse": baseline['RMSE'],
+                "added_trees": model.num_trees() - init_model.num_trees()
+            }
+            self.tracker.log_metadata(params={}, metrics=avg_metrics)
+
+            model_path = self.config['training']['model_save_path']
+            self.model_wrapper.save_model(model, model_path)
+            self.tracker.log_artifact(model_path)
+            serving_bundle = export_serving_bundle(model, self.config)
+            if serving_bundle:
+                self.tracker.log_artifact(serving_bundle, artifact_path=SERVING_BUNDLE_ARTIFACT)
+            self.tracker.log_model(model, model_type="lightgbm", input_example=X.head(5))
+
+            self.logger.info(
+                f"Incremental Training Complete. RMSE {baseline['RMSE']} -> {metrics['RMSE']} "
+                f"on the newest {len(val_idx)} window rows"
+            )
+
+        return avg_metrics
+
+    def _select_rows(self, timestamps: np.ndarray):
+        """
+        New-window rows plus a replay sample of history, split into train/validation
+        indices. Validation is the newest slice of the window, so the model is scored
+        on rows later than everything it trained on and never on replayed history.
+        """
+        rng = np.random.default_rng(self.inc_cfg.get('seed', 42))
+        window_days = self.inc_cfg.get('window_days', 7)
+
+        window_start = timestamps.max() - np.timedelta64(window_days, 'D')
+        is_new = timestamps >= window_start
+        new_idx = np.flatnonzero(is_new)
+        old_idx = np.flatnonzero(~is_new)
+
+        # Cut on a timestamp boundary, so no hour is split between training and validation
+        new_idx = new_idx[np.argsort(timestamps[new_idx], kind='stable')]
+        n_val = max(1, int(len(new_idx) * self.inc_cfg.get('validation_fraction', 0.1)))
+        val_start = timestamps[new_idx[-n_val]]
+        is_val = timestamps[new_idx] >= val_start
+        if is_val.all():
+            raise ValueError(f"Need more than one timestamp since {window_start} to train and validate")
+        train_new, val_idx = new_idx[~is_val], new_idx[is_val]
+
+        n_replay = min(len(old_idx), int(len(new_idx) * self.inc_cfg.get('replay_ratio', 1.0)))
+        replay_idx = rng.choice(old_idx, size=n_replay, replace=False) if n_replay else old_idx[:0]
+
+        self.logger.info(
+            f"Window since {window_start}: training on {len(train_new)} new rows + {n_replay} replay rows, "
+            f"validating on the newest {len(val_idx)} rows (from {val_start})"
+        )
+        return np.sort(np.concatenate([train_new, replay_idx])), np.sort(val_idx), len(new_idx), n_replay
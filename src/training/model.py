@@ -3,8 +3,10 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score, median_absolute_error
+from typing import Dict
 from src.training.base import BaseModel
+from src.training.dataset import take_rows
+from src.evaluation.metrics import RegressionMetricsAccumulator, OVERALL
 from src.common.logger import get_logger
 
 class LGBMModel(BaseModel):
@@ -20,14 +22,20 @@ class LGBMModel(BaseModel):
         lgb_train = lgb.Dataset(X_train, label=y_train)
         lgb_eval = lgb.Dataset(X_val, label=y_val, reference=lgb_train)
 
+        return self.train_fold(lgb_train, lgb_eval, params)
+
+    def train_fold(self, lgb_train: lgb.Dataset, lgb_eval: lgb.Dataset, params,
+                   num_boost_round: int = 1000, early_stopping_rounds: int = 50, init_model=None):
+        """Trains a single fold on pre-binned (e.g. subset) Datasets, optionally warm-started."""
         model = lgb.train(
             params,
             lgb_train,
-            num_boost_round=1000, 
+            num_boost_round=num_boost_round,
+            init_model=init_model,
             valid_sets=[lgb_train, lgb_eval],
             valid_names=['train', 'eval'],
             callbacks=[
-                lgb.early_stopping(stopping_rounds=50),
+                lgb.early_stopping(stopping_rounds=early_stopping_rounds),
                 lgb.log_evaluation(period=500)
             ]
         )
@@ -37,23 +45,40 @@ class LGBMModel(BaseModel):
         """Predicts using a specific fold model."""
         return model.predict(X, num_iteration=model.best_iteration)
 
+    def evaluate_rows(self, model, X, y, indices, segment_keys=(), columns=None,
+                      chunk_rows: int = 1_000_000) -> Dict[str, RegressionMetricsAccumulator]:
+        """
+        Scores the rows of X at `indices` chunk by chunk (so out-of-core X is
+        never fully loaded) into metric accumulators: "overall" plus one per
+        segment key, grouped by that column's integer codes.
+        """
+        indices = np.asarray(indices)
+        y = np.asarray(y)
+        columns = list(columns if columns is not None else X.columns)
+        breakdown = {OVERALL: RegressionMetricsAccumulator()}
+        breakdown.update({key: RegressionMetricsAccumulator() for key in segment_keys})
+
+        for start in range(0, len(indices), chunk_rows):
+            chunk = indices[start:start + chunk_rows]
+            rows = take_rows(X, chunk)
+            y_pred = self.predict(model, rows)
+            breakdown[OVERALL].update(y[chunk], y_pred)
+            for key in segment_keys:
+                codes = rows[key] if isinstance(rows, pd.DataFrame) else rows[:, columns.index(key)]
+                breakdown[key].update(y[chunk], y_pred, groups=codes)
+
+        return breakdown
+
     def save_model(self, model, path: str):
         os.makedirs(os.path.dirname(path), exist_ok=True)
         joblib.dump(model, path)
         self.logger.info(f"Fold model saved locally at: {path}")
 
     def evaluate(self, y_true, y_pred):
-        """Calculates regression metrics for MLflow logging."""
-        mse = mean_squared_error(y_true, y_pred)
-        rmse = np.sqrt(mse)
-        mae = mean_absolute_error(y_true, y_pred)
-        r2 = r2_score(y_true, y_pred)
-        med_ae = median_absolute_error(y_true, y_pred)
-
-        return {
-            "RMSE": round(float(rmse), 4),
-            "MSE": round(float(mse), 4),
-            "MAE": round(float(mae), 4),
-            "R2": round(float(r2), 4),
-            "Median_AE": round(float(med_ae), 4)
-        }
\ No newline at end of file
+        """Calculates regression metrics for MLflow logging in one pass over the arrays."""
+        metrics = RegressionMetricsAccumulator().evaluate(y_true, y_pred)
+        return self.round_metrics(metrics)
+
+    @staticmethod
+    def round_metrics(metrics: Dict[str, float]) -> Dict[str, float]:
+        return {name: round(float(value), 4) for name, value in metrics.items()}
@@ -0,0 +1,221 @@
+import os
+import time
+import shutil
+import tempfile
+import multiprocessing as mp
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from src.training.base import FoldResult
+from src.training.dataset import DatasetBuilder
+from src.training.shards import ParquetShardStore
+from src.evaluation.metrics import OVERALL
+from src.common.logger import get_logger
+
+def resolve_core_budget(parallel_cfg: dict) -> int:
+    """Cores the executor may use; `core_budget` <= 0 or missing means all cores."""
+    budget = parallel_cfg.get('core_budget') or 0
+    available = os.cpu_count() or 1
+    return available if budget <= 0 else min(int(budget), available)
+
+def split_core_budget(core_budget: int, n_tasks: int, max_workers: Optional[int] = None) -> Tuple[int, int]:
+    """Splits a core budget into (worker processes, LightGBM threads per worker)."""
+    workers = max(1, min(n_tasks, core_budget, max_workers or n_tasks))
+    return workers, max(1, core_budget // workers)
+
+def _fit_and_score(full_set: lgb.Dataset, X, y, train_idx: np.ndarray,
+                   val_idx: np.ndarray, task: Dict[str, Any]) -> FoldResult:
+    """Trains one task on index subsets of the binned Dataset and scores its validation rows."""
+    from src.training.model import LGBMModel
+
+    start_time = time.time()
+    model_wrapper = LGBMModel()
+
+    train_set = DatasetBuilder.subset(full_set, train_idx)
+    val_set = DatasetBuilder.subset(full_set, val_idx)
+
+    model = model_wrapper.train_fold(
+        train_set, val_set, task['params'],
+        num_boost_round=task.get('num_boost_round', 1000),
+        early_stopping_rounds=task.get('early_stopping_rounds', 50)
+    )
+    del train_set, val_set
+
+    breakdown = model_wrapper.evaluate_rows(
+        model, X, y, val_idx,
+        segment_keys=task.get('segment_keys', ()), columns=task.get('columns')
+    )
+    metrics = model_wrapper.round_metrics(breakdown[OVERALL].result())
+
+    return FoldResult(
+        fold=task['fold'],
+        model=model,
+        metrics=metrics,
+        train_rows=int(len(train_idx)),
+        val_rows=int(len(val_idx)),
+        execution_time_seconds=round(time.time() - start_time, 2),
+        breakdown=breakdown
+    )
+
+def _train_fold_worker(task: Dict[str, Any]) -> FoldResult:
+    """
+    Runs in a separate process: loads the binned Dataset and the memory-mapped
+    feature matrix (or the Parquet shard store) from the shared cache, trains
+    one fold and scores it.
+    """
+    train_idx = np.load(task['train_idx_path'])
+    val_idx = np.load(task['val_idx_path'])
+
+    full_set = lgb.Dataset(task['dataset_path'], params=task['dataset_params']).construct()
+
+    X = task['x_store'] if task.get('x_store') is not None else np.load(task['x_path'], mmap_mode='r')
+    y = np.load(task['y_path'], mmap_mode='r')
+    return _fit_and_score(full_set, X, y, train_idx, val_idx, task)
+
+
+class ParallelFoldExecutor:
+    """
+    Runs CV folds in separate processes under a configurable core budget.
+    Workers share the training data through an on-disk cache: the binary
+    LightGBM Dataset plus a memory-mapped float32 copy of X for scoring.
+    Each run stages into its own directory under `cache_dir`, so concurrent
+    runs sharing a cache never see or delete each other's files.
+    """
+
+    def __init__(self, config: dict, parallel_cfg: Optional[dict] = None):
+        self.logger = get_logger("ParallelFoldExecutor")
+        self.training_cfg = config['training']
+        self.parallel_cfg = parallel_cfg if parallel_cfg is not None else (self.training_cfg.get('parallel') or {})
+        self.enabled = bool(self.parallel_cfg.get('enabled', False))
+        self.cache_dir = Path(self.parallel_cfg.get('cache_dir', "saved_models/cache/folds"))
+        self.chunk_rows = int(self.parallel_cfg.get('chunk_rows', 1_000_000))
+        self.dataset_params = dict(self.training_cfg.get('dataset_params') or {})
+        self.dataset_params.setdefault('verbosity', -1)
+        self.segment_keys = list((self.training_cfg.get('metrics') or {}).get('segment_keys') or [])
+
+    def plan(self, n_tasks: int) -> Tuple[int, int]:
+        """Returns (workers, threads per worker) for the configured core budget."""
+        core_budget = resolve_core_budget(self.parallel_cfg)
+        return split_core_budget(core_budget, n_tasks, self.parallel_cfg.get('max_workers'))
+
+    def fold_tasks(self, folds: List[Tuple[int, np.ndarray, np.ndarray]],
+                   params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Turns (fold, train_idx, val_idx) splits into executor tasks with the configured rounds."""
+        return [{
+            'fold': fold,
+            'train_idx': train_idx,
+            'val_idx': val_idx,
+            'params': params,
+            'num_boost_round': self.training_cfg.get('num_boost_round', 1000),
+            'early_stopping_rounds': self.training_cfg.get('early_stopping_rounds', 50)
+        } for fold, train_idx, val_idx in folds]
+
+    def run(self, X: pd.DataFrame, y: pd.Series, full_set: lgb.Dataset,
+            tasks: List[Dict[str, Any]], dataset_path: Optional[str] = None) -> List[FoldResult]:
+        """Trains every task in parallel worker processes; results are returned in task order."""
+        with self.staged(X, y, full_set, dataset_path) as shared:
+            return self.map_tasks(shared, tasks)
+
+    def run_inline(self, X: pd.DataFrame, y: pd.Series, full_set: lgb.Dataset,
+                   tasks: List[Dict[str, Any]]) -> List[FoldResult]:
+        """Sequential, in-process counterpart of `map_tasks` (used when parallel is disabled)."""
+        results = []
+        for task in tasks:
+            self.logger.info(f"--- Processing Task {task['fold']} ---")
+            train_idx = np.asarray(task['train_idx'], dtype=np.int32)
+            val_idx = np.asarray(task['val_idx'], dtype=np.int32)
+            task = {**task, 'segment_keys': self._segment_keys(X.columns), 'columns': list(X.columns)}
+            results.append(_fit_and_score(full_set, X, y, train_idx, val_idx, task))
+        return sorted(results, key=lambda r: r.fold)
+
+    @contextmanager
+    def staged(self, X: pd.DataFrame, y: pd.Series, full_set: lgb.Dataset,
+               dataset_path: Optional[str] = None):
+        """Stages the shared cache once for any number of `map_tasks` calls."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        run_dir = Path(tempfile.mkdtemp(prefix="run-", dir=self.cache_dir))
+        try:
+            yield self._stage_shared_data(X, y, full_set, dataset_path, run_dir)
+        finally:
+            self._cleanup(run_dir)
+
+    def map_tasks(self, shared: Dict[str, Any], tasks: List[Dict[str, Any]]) -> List[FoldResult]:
+        """
+        Trains each task in a worker process. A task carries its own `fold` id,
+        train/val indices and params, plus optional `num_boost_round` and
+        `early_stopping_rounds`. Results are returned sorted by task id.
+        """
+        workers, threads = self.plan(len(tasks))
+        self.logger.info(f"Running {len(tasks)} tasks on {workers} workers x {threads} threads")
+
+        run_dir = Path(shared['run_dir'])
+        worker_tasks = []
+        for task in tasks:
+            task_id = task['fold']
+            train_idx_path = run_dir / f"task_{task_id}_train_idx.npy"
+            val_idx_path = run_dir / f"task_{task_id}_val_idx.npy"
+            np.save(train_idx_path, np.asarray(task['train_idx'], dtype=np.int32))
+            np.save(val_idx_path, np.asarray(task['val_idx'], dtype=np.int32))
+
+            worker_task = {k: v for k, v in task.items() if k not in ('train_idx', 'val_idx')}
+            worker_task.update({
+                **shared,
+                'train_idx_path': str(train_idx_path),
+                'val_idx_path': str(val_idx_path),
+                'params': {**task['params'], 'num_threads': threads},
+                'segment_keys': self._segment_keys(shared['columns']),
+                'dataset_params': self.dataset_params
+            })
+            worker_tasks.append(worker_task)
+
+        ctx = mp.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            results = list(pool.map(_train_fold_worker, worker_tasks))
+
+        for task in worker_tasks:
+            Path(task['train_idx_path']).unlink(missing_ok=True)
+            Path(task['val_idx_path']).unlink(missing_ok=True)
+
+        return sorted(results, key=lambda r: r.fold)
+
+    def _stage_shared_data(self, X, y, full_set: lgb.Dataset,
+                           dataset_path: Optional[str], run_dir: Path) -> Dict[str, Any]:
+        """
+        Writes the data workers need once, so each fold only maps it in.
+        Shard-backed X is already on disk, so workers get the store itself.
+        """
+        if not dataset_path or not Path(dataset_path).exists():
+            dataset_path = str(run_dir / "full_dataset.bin")
+            full_set.save_binary(dataset_path)
+
+        y_path = run_dir / "y.npy"
+        np.save(y_path, np.asarray(y, dtype=np.float32))
+        shared = {'run_dir': str(run_dir), 'dataset_path': dataset_path, 'y_path': str(y_path),
+                  'x_store': None, 'columns': list(X.columns)}
+
+        if isinstance(X, ParquetShardStore):
+            shared['x_store'] = X
+            return shared
+
+        x_path = run_dir / "X.npy"
+        X_map = np.lib.format.open_memmap(x_path, mode="w+", dtype=np.float32, shape=X.shape)
+        for start in range(0, len(X), self.chunk_rows):
+            end = start + self.chunk_rows
+            X_map[start:end] = X.iloc[start:end].to_numpy(dtype=np.float32)
+        X_map.flush()
+        del X_map
+
+        shared['x_path'] = str(x_path)
+        return shared
+
+    def _segment_keys(self, columns) -> List[str]:
+        """Configured metric breakdown keys that are actually feature columns."""
+        return [key for key in self.segment_keys if key in set(columns)]
+
+    def _cleanup(self, run_dir: Path):
+        """Removes this run's staging directory; a configured Dataset cache lives outside it and is kept."""
+        shutil.rmtree(run_dir, ignore_errors=True)
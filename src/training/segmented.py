@@ -0,0 +1,170 @@
+import numpy as np
+import pandas as pd
+import lightgbm as lgb
+from typing import Any, Dict, List, Tuple
+from src.common.logger import get_logger
+from src.common.mlflow_tracker import MLflowTracker
+from src.training.bundle import SegmentedModel, FALLBACK_SEGMENT
+from src.training.dataset import DatasetBuilder
+from src.evaluation.metrics import breakdown_tables, merge_accumulators, OVERALL
+from src.training.model import LGBMModel
+from src.training.parallel import ParallelFoldExecutor
+from src.training.serving_bundle import SERVING_BUNDLE_ARTIFACT, export_serving_bundle
+
+# A model needs at least one training and one validation row
+MIN_TASK_ROWS = 2
+
+class SegmentedTrainer:
+    """
+    Trains one LightGBM model per segment (`meter`, optionally `site_id`)
+    plus a fallback model for small or unseen segments, in parallel under
+    the training core budget, and registers them as one SegmentedModel.
+    """
+
+    def __init__(self, config: dict, tracker: MLflowTracker, dataset_builder: DatasetBuilder,
+                 executor: ParallelFoldExecutor):
+        self.logger = get_logger("SegmentedTrainer")
+        self.config = config
+        self.seg_cfg = config['training'].get('segmentation') or {}
+        self.segment_keys = self.seg_cfg.get('keys', ['meter'])
+        self.tracker = tracker
+        self.dataset_builder = dataset_builder
+        self.executor = executor
+        self.model_wrapper = LGBMModel()
+
+    def run(self, X: pd.DataFrame, y: pd.Series, full_set: lgb.Dataset, params: Dict[str, Any]):
+        self.logger.info(f"--- STARTING SEGMENTED TRAINING (keys: {self.segment_keys}) ---")
+
+        segments, fallback_idx = self._split_segments(X)
+        tasks, names = self._build_tasks(segments, fallback_idx, params)
+
+        with self.tracker.start_run(run_name="ASHRAE_Segmented_Training", tags={"training_type": "full"}):
+            self.tracker.log_metadata(
+                params={**params, "segment_keys": ",".join(self.segment_keys), "n_segments": len(segments)},
+                metrics={}
+            )
+
+            if self.executor.enabled:
+                results = self.executor.run(X, y, full_set, tasks, dataset_path=self.dataset_builder.cache_path)
+            else:
+                results = self.executor.run_inline(X, y, full_set, tasks)
+
+            models, fallback = {}, None
+            for result in results:
+                name = names[result.fold]
+                safe_name = name.replace("|", "_").replace("=", "")
+                self.tracker.log_metadata(
+                    params={},
+                    metrics={f"{safe_name}_{k}": v for k, v in result.metrics.items()}
+                )
+                self.logger.info(f"Segment {name}: {result.val_rows} val rows | RMSE: {result.metrics['RMSE']}")
+
+                if name == FALLBACK_SEGMENT:
+                    fallback = result.model
+                else:
+                    models[segments[result.fold][0]] = result.model
+
+            bundle = SegmentedModel(self.segment_keys, models, fallback)
+            segment_results = [r for r in results if names[r.fold] != FALLBACK_SEGMENT]
+            avg_metrics = self._aggregate(segment_results)
+            self.tracker.log_metadata(params={}, metrics=avg_metrics)
+            for name, table in breakdown_tables(segment_results, task_labels=names).items():
+                self.tracker.log_table(table, f"metrics/segmented_{name}.json")
+
+            model_path = self.config['training']['model_save_path']
+            self.model_wrapper.save_model(bundle, model_path)
+            self.tracker.log_artifact(model_path)
+            serving_bundle = export_serving_bundle(bundle, self.config)
+            if serving_bundle:
+                self.tracker.log_artifact(serving_bundle, artifact_path=SERVING_BUNDLE_ARTIFACT)
+
+            bundle_dir = bundle.save(self.seg_cfg.get('bundle_dir', "saved_models/segmented_bundle"))
+            self.tracker.log_model(bundle, model_type="segmented", input_example=X.head(5), bundle_dir=bundle_dir)
+
+            self.logger.info(f"Segmented Training Complete. Weighted RMSE: {avg_metrics['avg_rmse']:.4f}")
+
+        return avg_metrics
+
+    def _split_segments(self, X: pd.DataFrame) -> Tuple[List[Tuple[Tuple, np.ndarray]], np.ndarray]:
+        """Groups row indices by segment key; undersized segments are left to the fallback model."""
+        min_rows = max(MIN_TASK_ROWS, self.seg_cfg.get('min_rows', 1000))
+        key_values = X[self.segment_keys].to_numpy(dtype=np.int64)
+        uniques, inverse = np.unique(key_values, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order], np.arange(len(uniques) + 1))
+
+        segments, small = [], []
+        for group_id, segment in enumerate(uniques):
+            rows = order[bounds[group_id]:bounds[group_id + 1]]
+            if len(rows) < min_rows:
+                small.append(rows)
+            else:
+                segments.append((tuple(int(v) for v in segment), rows))
+
+        fallback_idx = np.concatenate(small) if small else np.empty(0, dtype=np.int64)
+        if small:
+            self.logger.warning(
+                f"{len(small)} segment(s) below {min_rows} rows ({len(fallback_idx)} rows in total) "
+                f"merged into the fallback model"
+            )
+        self.logger.info(f"{len(segments)} segments trained separately, {len(small)} routed to fallback")
+        return segments, fallback_idx
+
+    def _build_tasks(self, segments, fallback_idx, params):
+        """Segment tasks with their own train/validation split, plus the fallback model task."""
+        rng = np.random.default_rng(self.seg_cfg.get('seed', 42))
+        val_fraction = self.seg_cfg.get('validation_fraction', 0.2)
+        training_cfg = self.config['training']
+
+        def split(rows):
+            rows = rng.permutation(rows)
+            n_val = max(1, int(len(rows) * val_fraction))
+            return np.sort(rows[n_val:]), np.sort(rows[:n_val])
+
+        tasks, names = [], {}
+        for task_id, (segment, rows) in enumerate(segments):
+            train_idx, val_idx = split(rows)
+            names[task_id] = SegmentedModel.segment_name(self.segment_keys, segment)
+            tasks.append({
+                'fold': task_id,
+                'train_idx': train_idx,
+                'val_idx': val_idx,
+                'params': params,
+                'num_boost_round': training_cfg.get('num_boost_round', 1000),
+                'early_stopping_rounds': training_cfg.get('early_stopping_rounds', 50)
+            })
+
+        fallback_fraction = self.seg_cfg.get('fallback_sample_fraction', 0.2)
+        all_rows = np.concatenate([rows for _, rows in segments] + [fallback_idx])
+        if len(all_rows) < MIN_TASK_ROWS:
+            # Every segment has at least MIN_TASK_ROWS rows, so there is nothing to train at all
+            raise ValueError(f"Segmented training needs at least {MIN_TASK_ROWS} rows, got {len(all_rows)}")
+
+        n_sample = min(len(all_rows), max(MIN_TASK_ROWS, int(len(all_rows) * fallback_fraction)))
+        sample = rng.choice(all_rows, size=n_sample, replace=False)
+        sample = np.unique(np.concatenate([sample, fallback_idx]))
+        train_idx, val_idx = split(sample)
+
+        fallback_id = len(tasks)
+        names[fallback_id] = FALLBACK_SEGMENT
+        tasks.append({
+            'fold': fallback_id,
+            'train_idx': train_idx,
+            'val_idx': val_idx,
+            'params': params,
+            'num_boost_round': training_cfg.get('num_boost_round', 1000),
+            'early_stopping_rounds': training_cfg.get('early_stopping_rounds', 50)
+        })
+        return tasks, names
+
+    @staticmethod
+    def _aggregate(results) -> Dict[str, float]:
+        """Metrics pooled over every segment model's validation rows."""
+        pooled = merge_accumulators([r.breakdown for r in results])[OVERALL].result()
+        return {
+            "avg_rmse": pooled['RMSE'],
+            "avg_mae": pooled['MAE'],
+            "avg_r2": pooled['R2']
+        }
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import time
+import joblib
+import lightgbm as lgb
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, Optional
+from src.common.logger import get_logger
+from src.preprocessing.preprocessing import MLPreprocessor
+from src.training.base import ServingBundle
+from src.training.bundle import SegmentedModel
+
+BUNDLE_FORMAT = 1
+MANIFEST_FILE = "manifest.json"
+SPEC_FILE = "preprocessor.json"
+SCALER_FILE = "scaler.npy"
+BOOSTER_FILE = "model.txt"
+SEGMENTED_DIR = "model"
+CURRENT_FILE = "CURRENT"
+# MLflow artifact path of the bundle logged with a training run
+SERVING_BUNDLE_ARTIFACT = "serving_bundle"
+LEGACY_FILES = (MANIFEST_FILE, SPEC_FILE, SCALER_FILE, BOOSTER_FILE, SEGMENTED_DIR)
+
+logger = get_logger("ServingBundle")
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    if path.stat().st_size == 0:
+        return digest.hexdigest()
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        digest.update(view)
+    return digest.hexdigest()
+
+def _content_hash(files: Dict[str, str]) -> str:
+    return hashlib.sha256("\n".join(f"{name}:{sha}" for name, sha in sorted(files.items())).encode()).hexdigest()
+
+def write_serving_bundle(model: Any, preprocessor: MLPreprocessor, path: str) -> str:
+    """
+    Writes a self-contained serving bundle: the model in LightGBM's native
+    text format (one file per booster for a SegmentedModel), the fitted
+    preprocessing as a JSON spec plus a .npy array of scaler parameters,
+    and a manifest with the feature order, per-file SHA-256 and a content
+    hash. Each bundle is written to its own version directory under `path`
+    and published by replacing the CURRENT pointer file with os.replace, so
+    a serving process polling `path` sees either the previous bundle or the
+    new one, never a missing or half-written one. The previous version is
+    kept for readers still loading it; older ones are removed. Returns the
+    published version directory.
+    """
+    root = Path(path)
+    root.mkdir(parents=True, exist_ok=True)
+    staging = root / f".tmp-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir()
+
+    if isinstance(model, SegmentedModel):
+        model.save(str(staging / SEGMENTED_DIR))
+        model_type = "segmented"
+    elif isinstance(model, lgb.Booster):
+        model.save_model(str(staging / BOOSTER_FILE))
+        model_type = "lightgbm"
+    else:
+        raise TypeError(f"Cannot bundle model of type {type(model).__name__}")
+
+    spec, scaler_params = preprocessor.to_spec()
+    with open(staging / SPEC_FILE, "w") as f:
+        json.dump(spec, f)
+    np.save(staging / SCALER_FILE, scaler_params)
+
+    files = {
+        str(p.relative_to(staging)): _file_sha256(p)
+        for p in sorted(staging.rglob("*")) if p.is_file()
+    }
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "model_type": model_type,
+        "feature_columns": spec["feature_columns"],
+        "files": files,
+        "content_hash": _content_hash(files),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S")
+    }
+    with open(staging / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Content-addressed, so re-exporting an identical bundle reuses its directory
+    version = f"v-{manifest['content_hash'][:16]}"
+    bundle_dir = root / version
+    if bundle_dir.exists():
+        shutil.rmtree(staging)
+    else:
+        staging.rename(bundle_dir)
+
+    previous = _current_version(root)
+    pointer = root / f"{CURRENT_FILE}.tmp-{os.getpid()}"
+    pointer.write_text(version)
+    os.replace(pointer, root / CURRENT_FILE)
+    _prune_versions(root, keep={version, previous})
+
+    logger.info(f"Serving bundle {manifest['content_hash'][:12]} published to {bundle_dir}")
+    return str(bundle_dir)
+
+def _current_version(root: Path) -> Optional[str]:
+    try:
+        return (root / CURRENT_FILE).read_text().strip() or None
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+def _prune_versions(root: Path, keep: set):
+    """Removes unpublished versions and files of a bundle written before versioning."""
+    for child in root.glob("v-*"):
+        if child.name not in keep:
+            shutil.rmtree(child, ignore_errors=True)
+    for name in LEGACY_FILES:
+        legacy = root / name
+        if legacy.is_dir():
+            shutil.rmtree(legacy, ignore_errors=True)
+        elif legacy.exists():
+            legacy.unlink()
+
+def resolve_bundle_dir(path: str) -> Path:
+    """Directory of the bundle published at `path`: the version CURRENT points to, or `path` itself for a bundle written before versioning."""
+    root = Path(path)
+    version = _current_version(root)
+    return root / version if version else root
+
+def read_manifest(path: str) -> Optional[dict]:
+    """The manifest of the bundle published at `path`, or None if there is none."""
+    manifest_path = resolve_bundle_dir(path) / MANIFEST_FILE
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, "r") as f:
+        return json.load(f)
+
+def load_serving_bundle(path: str, verify: bool = True) -> ServingBundle:
+    """
+    Loads a bundle in one step: the model file is read once and parsed by
+    LightGBM (no pickle, no sklearn objects to unpickle), the scaler
+    parameters are memory-mapped and the preprocessor is rebuilt from its
+    spec. With `verify`, every file is checked against the manifest hashes.
+    The published version is resolved once, so a bundle published
+    meanwhile cannot mix files from two versions.
+    """
+    bundle_dir = resolve_bundle_dir(path)
+    manifest = read_manifest(str(bundle_dir))
+    if manifest is None:
+        raise FileNotFoundError(f"No serving bundle at {path}")
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported serving bundle format {manifest.get('format')}")
+
+    if manifest["model_type"] == "segmented":
+        model = SegmentedModel.load(str(bundle_dir / SEGMENTED_DIR))
+        model_text = None
+    else:
+        # Read once: the same bytes are hashed and handed to LightGBM's parser
+        model_text = (bundle_dir / BOOSTER_FILE).read_bytes()
+        model = lgb.Booster(model_str=model_text.decode())
+
+    if verify:
+        for name, sha in manifest["files"].items():
+            if name == BOOSTER_FILE and model_text is not None:
+                actual = hashlib.sha256(model_text).hexdigest()
+            else:
+                actual = _file_sha256(bundle_dir / name)
+            if actual != sha:
+                raise ValueError(f"Serving bundle file {name} does not match its manifest hash")
+
+    with open(bundle_dir / SPEC_FILE, "r") as f:
+        spec = json.load(f)
+    scaler_params = np.load(bundle_dir / SCALER_FILE, mmap_mode="r")
+    preprocessor = MLPreprocessor.from_spec(spec, scaler_params)
+
+    return ServingBundle(
+        model=model,
+        preprocessor=preprocessor,
+        feature_columns=manifest["feature_columns"],
+        content_hash=manifest["content_hash"],
+        manifest=manifest
+    )
+
+def export_serving_bundle(model: Any, config: dict) -> Optional[str]:
+    """Writes the serving bundle for a freshly trained model, using the fitted preprocessor on disk."""
+    training_cfg = config['training']
+    bundle_path = training_cfg.get('serving_bundle_path')
+    prep_path = training_cfg.get('preprocessor_path', "saved_models/preprocessor.joblib")
+    if not bundle_path:
+        return None
+    if not os.path.exists(prep_path):
+        logger.warning(f"No fitted preprocessor at {prep_path}; serving bundle not written")
+        return None
+    return write_serving_bundle(model, joblib.load(prep_path), bundle_path)
@@ -0,0 +1,184 @@
+import lightgbm as lgb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import List, Optional, Union
+from src.common.logger import get_logger
+
+TARGET_COLUMN = "target"
+TIMESTAMP_COLUMN = "timestamp"
+
+class ShardWriter:
+    """
+    Writes the preprocessed training matrix as Parquet shards so training can
+    stream it instead of loading everything from Redis. Each shard holds the
+    feature columns plus the target and reading timestamp.
+    """
+
+    def __init__(self, training_cfg: dict):
+        self.logger = get_logger("ShardWriter")
+        self.shard_dir = Path(training_cfg.get('shard_dir', "saved_models/cache/shards"))
+        self.shard_rows = int(training_cfg.get('shard_rows', 2_000_000))
+        self.row_group_rows = int(training_cfg.get('shard_row_group_rows', 100_000))
+
+    def write(self, X: pd.DataFrame, y: np.ndarray, timestamps: Optional[pd.Series] = None) -> List[str]:
+        self.shard_dir.mkdir(parents=True, exist_ok=True)
+        for stale in self.shard_dir.glob("part-*.parquet"):
+            stale.unlink()
+
+        paths = []
+        for shard_id, start in enumerate(range(0, len(X), self.shard_rows)):
+            end = min(start + self.shard_rows, len(X))
+            table = pa.Table.from_pandas(X.iloc[start:end], preserve_index=False)
+            table = table.append_column(TARGET_COLUMN, pa.array(np.asarray(y[start:end], dtype=np.float32)))
+            if timestamps is not None:
+                table = table.append_column(TIMESTAMP_COLUMN, pa.array(np.asarray(timestamps[start:end])))
+
+            path = self.shard_dir / f"part-{shard_id:05d}.parquet"
+            pq.write_table(table, path, row_group_size=self.row_group_rows)
+            paths.append(str(path))
+
+        self.logger.info(f"Wrote {len(X)} rows as {len(paths)} Parquet shards to {self.shard_dir}")
+        return paths
+
+
+class ParquetShardStore:
+    """
+    Row-addressable, read-only view over Parquet training shards. Reads
+    whole row groups on demand, so memory is bounded by the rows asked for
+    rather than the dataset. Supports the bits of the DataFrame API the
+    training stage needs (len, shape, columns, column access, head).
+    """
+
+    def __init__(self, shard_dir: str, max_rows: Optional[int] = None):
+        self.paths = sorted(str(p) for p in Path(shard_dir).glob("part-*.parquet"))
+        if not self.paths:
+            raise FileNotFoundError(f"No Parquet shards found in {shard_dir}")
+
+        schema = pq.read_schema(self.paths[0])
+        reserved = {TARGET_COLUMN, TIMESTAMP_COLUMN}
+        self.columns = [name for name in schema.names if name not in reserved]
+
+        rg_starts, rg_sizes, rg_locations = [], [], []
+        offset = 0
+        for shard_id, path in enumerate(self.paths):
+            metadata = pq.ParquetFile(path).metadata
+            for rg in range(metadata.num_row_groups):
+                rg_starts.append(offset)
+                rg_sizes.append(metadata.row_group(rg).num_rows)
+                rg_locations.append((shard_id, rg))
+                offset += metadata.row_group(rg).num_rows
+
+        self.rg_starts = np.asarray(rg_starts, dtype=np.int64)
+        self.rg_sizes = np.asarray(rg_sizes, dtype=np.int64)
+        self.rg_locations = rg_locations
+        self.n_rows = offset if max_rows is None else min(offset, int(max_rows))
+        self._files = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_files'] = {}
+        return state
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @property
+    def shape(self):
+        return (self.n_rows, len(self.columns))
+
+    def __getitem__(self, key: Union[str, List[str]]):
+        """Column access like a DataFrame: a name gives a Series, a list gives a DataFrame."""
+        columns = [key] if isinstance(key, str) else list(key)
+        frame = self._read_columns(columns)
+        return frame[key] if isinstance(key, str) else frame
+
+    def load_labels(self) -> np.ndarray:
+        return self._read_columns([TARGET_COLUMN])[TARGET_COLUMN].to_numpy(dtype=np.float32)
+
+    def load_timestamps(self) -> np.ndarray:
+        return self._read_columns([TIMESTAMP_COLUMN])[TIMESTAMP_COLUMN].to_numpy()
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        return pd.DataFrame(self.take(np.arange(min(n, self.n_rows))), columns=self.columns)
+
+    def take(self, indices: np.ndarray) -> np.ndarray:
+        """Rows at `indices` (any order) as a float32 matrix, reading only the row groups involved."""
+        indices = np.asarray(indices, dtype=np.int64)
+        out = np.empty((len(indices), len(self.columns)), dtype=np.float32)
+        if len(indices) == 0:
+            return out
+
+        order = np.argsort(indices, kind='stable')
+        sorted_idx = indices[order]
+        rg_of_row = np.searchsorted(self.rg_starts, sorted_idx, side='right') - 1
+        boundaries = np.flatnonzero(np.diff(rg_of_row)) + 1
+
+        for chunk in np.split(np.arange(len(sorted_idx)), boundaries):
+            rg = rg_of_row[chunk[0]]
+            block = self.read_row_group(rg)
+            out[order[chunk]] = block[sorted_idx[chunk] - self.rg_starts[rg]]
+        return out
+
+    def read_row_group(self, rg: int) -> np.ndarray:
+        """One row group's feature columns as a float32 matrix."""
+        shard_id, local_rg = self.rg_locations[rg]
+        table = self._file(shard_id).read_row_group(local_rg, columns=self.columns)
+        return np.column_stack([
+            table.column(i).to_numpy(zero_copy_only=False).astype(np.float32, copy=False)
+            for i in range(table.num_columns)
+        ])
+
+    def sequences(self) -> List["ParquetShardSequence"]:
+        """One LightGBM Sequence per shard, truncated to `max_rows` if set."""
+        seqs, remaining = [], self.n_rows
+        for shard_id in range(len(self.paths)):
+            rgs = [rg for rg, loc in enumerate(self.rg_locations) if loc[0] == shard_id]
+            shard_rows = int(self.rg_sizes[rgs].sum())
+            if remaining <= 0:
+                break
+            seqs.append(ParquetShardSequence(self, rgs, min(shard_rows, remaining)))
+            remaining -= shard_rows
+        return seqs
+
+    def _read_columns(self, columns: List[str]) -> pd.DataFrame:
+        frames = [self._file(i).read(columns=columns).to_pandas() for i in range(len(self.paths))]
+        return pd.concat(frames, ignore_index=True).iloc[:self.n_rows]
+
+    def _file(self, shard_id: int) -> pq.ParquetFile:
+        if shard_id not in self._files:
+            self._files[shard_id] = pq.ParquetFile(self.paths[shard_id])
+        return self._files[shard_id]
+
+
+class ParquetShardSequence(lgb.Sequence):
+    """
+    LightGBM Sequence over one shard, so the binned Dataset is built batch by
+    batch: LightGBM first samples rows (in increasing order) for bin
+    construction, then pushes the shard one row group at a time.
+    """
+
+    def __init__(self, store: ParquetShardStore, row_groups: List[int], n_rows: int):
+        self.store = store
+        self.row_groups = row_groups
+        self.base = int(store.rg_starts[row_groups[0]])
+        self.n_rows = n_rows
+        self.batch_size = int(store.rg_sizes[row_groups[0]])
+        self._cached_rg = None
+        self._cached_block = None
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, _ = idx.indices(self.n_rows)
+            return self.store.take(np.arange(self.base + start, self.base + stop)).astype(np.float64)
+
+        global_row = self.base + int(idx)
+        rg = int(np.searchsorted(self.store.rg_starts, global_row, side='right') - 1)
+        if rg != self._cached_rg:
+            self._cached_rg, self._cached_block = rg, self.store.read_row_group(rg).astype(np.float64)
+        return self._cached_block[global_row - self.store.rg_starts[rg]]
@@ -1,7 +1,17 @@
+import json
 import time
 import numpy as np
+from pathlib import Path
 from src.common.redis_client import RedisClient
 from src.training.model import LGBMModel
+from src.training.ensemble import merge_fold_boosters
+from src.evaluation.metrics import breakdown_tables
+from src.training.dataset import DatasetBuilder, load_training_data, load_training_timestamps
+from src.training.parallel import ParallelFoldExecutor
+from src.training.segmented import SegmentedTrainer
+from src.training.incremental import IncrementalTrainer
+from src.training.backtest import RollingOriginBacktester
+from src.training.serving_bundle import SERVING_BUNDLE_ARTIFACT, export_serving_bundle
 from sklearn.model_selection import StratifiedKFold
 from src.common.mlflow_tracker import MLflowTracker 
 from src.common.logger import get_logger
@@ -12,54 +22,95 @@ class TrainingStage:
         self.config = config
         self.redis_client = RedisClient(config['redis'])
         self.model_wrapper = LGBMModel()
+        self.dataset_builder = DatasetBuilder(config)
+        self.fold_executor = ParallelFoldExecutor(config)
         self.tracker = MLflowTracker(config) 
 
     def run(self):
         self.logger.info("--- STARTING TRACKED TRAINING ---")
 
-        X = self.redis_client.load_dataframe("ashrae_pipeline_X_train")
-        y = self.redis_client.load_dataframe("ashrae_pipeline_y_train").iloc[:, 0]
-
-        if self.config['training']['use_sample']:
-            size = self.config['training']['sample_size']
-            X, y = X.iloc[:size], y.iloc[:size]
+        X, y = load_training_data(self.config, self.redis_client)
 
         print("TRAINING SIZE", X.shape)
 
+        params = self._resolve_params()
+
+        mode = self.config['training'].get('mode', 'cv')
+        if mode == "incremental":
+            incremental = IncrementalTrainer(self.config, self.tracker)
+            reason = incremental.full_retrain_reason()
+            if reason is None:
+                timestamps = load_training_timestamps(self.config, self.redis_client)
+                return incremental.run(X, y, timestamps, params)
+            self.logger.warning(f"Full retrain forced instead of incremental: {reason}")
+
+        full_set = self.dataset_builder.build(X, y)
+
+        if mode == "backtest":
+            timestamps = load_training_timestamps(self.config, self.redis_client)
+            backtester = RollingOriginBacktester(
+                self.config, self.tracker, self.dataset_builder, self.fold_executor
+            )
+            return backtester.run(X, y, full_set, timestamps, params)
+
+        if mode == "segmented":
+            segment_trainer = SegmentedTrainer(
+                self.config, self.tracker, self.dataset_builder, self.fold_executor
+            )
+            return segment_trainer.run(X, y, full_set, params)
+
+        return self._run_cv(X, y, full_set, params)
+
+    def _run_cv(self, X, y, full_set, params):
+        """Stratified K-Fold training of one global model."""
         skf = StratifiedKFold(n_splits=3, shuffle=True, random_state=42)
 
-        strat_target = X['building_id']
+        strat_target = X['building_id'].to_numpy()
 
-        params = {
-            'boosting_type': 'gbdt',
-            'objective': 'regression',
-            'metric': 'rmse',
-            'learning_rate': 0.3,
-            'verbosity': -1
-        }
+        folds = [(fold, train_idx, val_idx)
+                 for fold, (train_idx, val_idx)
+                 in enumerate(skf.split(np.zeros(len(strat_target)), strat_target), 1)]
 
         all_fold_metrics = []
 
-        with self.tracker.start_run(run_name="ASHRAE_KFold_Training"):
+        with self.tracker.start_run(run_name="ASHRAE_KFold_Training", tags={"training_type": "full"}):
             self.tracker.log_metadata(params=params, metrics={})
 
-            for fold, (train_idx, val_idx) in enumerate(skf.split(X, strat_target), 1):
-                self.logger.info(f"--- Processing Fold {fold} ---")
-                
-                X_train, X_val = X.iloc[train_idx], X.iloc[val_idx]
-                y_train, y_val = y.iloc[train_idx], y.iloc[val_idx]
-
-                fold_model = self.model_wrapper.train(X_train, y_train, X_val, y_val, params)
+            tasks = self.fold_executor.fold_tasks(folds, params)
+            if self.fold_executor.enabled:
+                workers, threads = self.fold_executor.plan(len(tasks))
+                self.tracker.log_metadata(
+                    params={"cv_workers": workers, "cv_threads_per_worker": threads}, metrics={}
+                )
+                fold_results = self.fold_executor.run(
+                    X, y, full_set, tasks, dataset_path=self.dataset_builder.cache_path
+                )
+            else:
+                fold_results = self.fold_executor.run_inline(X, y, full_set, tasks)
+
+            for result in fold_results:
+                fold, metrics = result.fold, result.metrics
 
-                y_pred = self.model_wrapper.predict(fold_model, X_val)
-                metrics = self.model_wrapper.evaluate(y_val, y_pred)
-                
                 fold_logged_metrics = {f"F{fold}_{k}": v for k, v in metrics.items()}
+                fold_logged_metrics[f"F{fold}_train_seconds"] = result.execution_time_seconds
                 self.tracker.log_metadata(params={}, metrics=fold_logged_metrics)
-                
+
                 all_fold_metrics.append(metrics)
                 self.logger.info(f"Fold {fold} RMSE: {metrics['RMSE']} | R2: {metrics['R2']}")
 
+            for name, table in breakdown_tables(fold_results).items():
+                self.tracker.log_table(table, f"metrics/cv_{name}.json")
+
+            ensemble_folds = self.config['training'].get('ensemble_folds', True)
+            if ensemble_folds:
+                fold_model = merge_fold_boosters([r.model for r in fold_results])
+                self.logger.info(
+                    f"Merged {len(fold_results)} fold models into one ensemble of {fold_model.num_trees()} trees"
+                )
+            else:
+                fold_model = fold_results[-1].model
+            self.tracker.log_metadata(params={"ensemble_folds": ensemble_folds}, metrics={})
+
             avg_metrics = {
                 "avg_rmse": np.mean([m['RMSE'] for m in all_fold_metrics]),
                 "avg_mae": np.mean([m['MAE'] for m in all_fold_metrics]),
@@ -71,8 +122,11 @@ class TrainingStage:
             model_path = self.config['training']['model_save_path']
             self.model_wrapper.save_model(fold_model, model_path)
             self.tracker.log_artifact(model_path)
+            serving_bundle = export_serving_bundle(fold_model, self.config)
+            if serving_bundle:
+                self.tracker.log_artifact(serving_bundle, artifact_path=SERVING_BUNDLE_ARTIFACT)
 
-            input_example = X_train.head(5)
+            input_example = X.head(5)
             self.tracker.log_model(
                 fold_model,
                 model_type="lightgbm",
@@ -83,6 +137,20 @@ class TrainingStage:
 
         return avg_metrics
 
+    def _resolve_params(self) -> dict:
+        """Base LightGBM params from config, overlaid with tuned params when enabled."""
+        training_cfg = self.config['training']
+        params = dict(training_cfg['params'])
+
+        tuned_path = self.config.get('tuning', {}).get('best_params_path')
+        if training_cfg.get('use_tuned_params') and tuned_path and Path(tuned_path).exists():
+            with open(tuned_path, "r") as f:
+                tuned = json.load(f)
+            self.logger.info(f"Applying tuned params from {tuned_path}: {tuned}")
+            params.update(tuned)
+
+        return params
+
 
 def run_training_stage(config: dict):
     stage = TrainingStage(config)
@@ -0,0 +1,176 @@
+import json
+import math
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict, List
+from src.common.redis_client import RedisClient
+from src.common.mlflow_tracker import MLflowTracker
+from src.common.logger import get_logger
+from src.training.dataset import DatasetBuilder, load_training_data
+from src.training.parallel import ParallelFoldExecutor
+
+class SearchSpace:
+    """
+    Samples LightGBM params from the `tuning.search_space` block of the config.
+    Supported types: uniform, loguniform, int, choice.
+    """
+
+    def __init__(self, space: Dict[str, Dict[str, Any]], seed: int = 42):
+        self.space = space
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self) -> Dict[str, Any]:
+        return {name: self._sample_one(name, spec) for name, spec in self.space.items()}
+
+    def _sample_one(self, name: str, spec: Dict[str, Any]):
+        kind = spec.get('type', 'uniform')
+        if kind == 'uniform':
+            return float(self.rng.uniform(spec['low'], spec['high']))
+        if kind == 'loguniform':
+            return float(math.exp(self.rng.uniform(math.log(spec['low']), math.log(spec['high']))))
+        if kind == 'int':
+            return int(self.rng.integers(spec['low'], spec['high'] + 1))
+        if kind == 'choice':
+            values = spec['values']
+            return values[int(self.rng.integers(0, len(values)))]
+        raise ValueError(f"Unsupported search space type '{kind}' for param '{name}'")
+
+
+class TuningStage:
+    """
+    Hyperparameter search with successive halving: every sampled config is
+    trained on a small data fraction for few boosting rounds, and only the
+    best 1/eta of each rung is promoted to more data and more rounds.
+    Trials within a rung run in parallel under the tuning core budget, and
+    each trial is tracked as a nested MLflow run.
+    """
+
+    def __init__(self, config: dict):
+        self.logger = get_logger("TuningOrchestrator")
+        self.config = config
+        self.tuning_cfg = config['tuning']
+        self.redis_client = RedisClient(config['redis'])
+        self.dataset_builder = DatasetBuilder(config)
+        self.executor = ParallelFoldExecutor(config, parallel_cfg=self.tuning_cfg.get('parallel') or {})
+        self.tracker = MLflowTracker(config)
+
+    def run(self) -> Dict[str, Any]:
+        self.logger.info("--- STARTING HYPERPARAMETER SEARCH (SUCCESSIVE HALVING) ---")
+
+        X, y = load_training_data(self.config, self.redis_client)
+        full_set = self.dataset_builder.build(X, y)
+
+        cfg = self.tuning_cfg
+        seed = cfg.get('seed', 42)
+        eta = cfg.get('eta', 3)
+        n_trials = cfg['n_trials']
+
+        rng = np.random.default_rng(seed)
+        order = rng.permutation(len(X)).astype(np.int32)
+        n_val = int(len(order) * cfg.get('validation_fraction', 0.2))
+        val_idx, train_pool = order[:n_val], order[n_val:]
+
+        space = SearchSpace(cfg['search_space'], seed=seed)
+        base_params = dict(self.config['training']['params'])
+        trials = {trial_id: {**base_params, **space.sample()} for trial_id in range(n_trials)}
+
+        rungs = self._rung_schedule(n_trials, eta)
+        trial_run_ids: Dict[int, str] = {}
+        survivors = list(trials)
+        scores: Dict[int, float] = {}
+
+        with self.tracker.start_run(run_name="ASHRAE_HPO_SuccessiveHalving"):
+            self.tracker.log_metadata(
+                params={"n_trials": n_trials, "eta": eta, "n_rungs": len(rungs)}, metrics={}
+            )
+
+            with self.executor.staged(X, y, full_set, self.dataset_builder.cache_path) as shared:
+                for rung, (fraction, rounds) in enumerate(rungs):
+                    n_train = max(1, int(len(train_pool) * fraction))
+                    train_idx = np.sort(train_pool[:n_train])
+                    self.logger.info(
+                        f"Rung {rung}: {len(survivors)} trials | {fraction:.0%} of data | {rounds} rounds"
+                    )
+
+                    tasks = [{
+                        'fold': trial_id,
+                        'train_idx': train_idx,
+                        'val_idx': val_idx,
+                        'params': trials[trial_id],
+                        'num_boost_round': rounds,
+                        'early_stopping_rounds': cfg.get('early_stopping_rounds', 50)
+                    } for trial_id in survivors]
+
+                    results = self.executor.map_tasks(shared, tasks)
+                    scores = {r.fold: r.metrics['RMSE'] for r in results}
+                    self._log_rung(results, trials, trial_run_ids, rung, fraction, rounds)
+
+                    ranked = sorted(survivors, key=lambda t: scores[t])
+                    keep = max(1, math.ceil(len(ranked) / eta))
+                    survivors = ranked[:keep]
+
+            best_id = min(survivors, key=lambda t: scores[t])
+            best_params = {k: trials[best_id][k] for k in cfg['search_space']}
+
+            self.tracker.log_metadata(
+                params={f"best_{k}": v for k, v in best_params.items()},
+                metrics={"best_rmse": scores[best_id]}
+            )
+            best_path = self._save_best_params(best_params)
+            self.tracker.log_artifact(best_path)
+
+        self.logger.info(f"Search complete. Best trial {best_id} RMSE: {scores[best_id]} | {best_params}")
+        return best_params
+
+    def _rung_schedule(self, n_trials: int, eta: int) -> List[tuple]:
+        """(data fraction, boosting rounds) per rung, growing by eta until one trial is left."""
+        cfg = self.tuning_cfg
+        n_rungs, remaining = 1, n_trials
+        while remaining > 1:
+            remaining = math.ceil(remaining / eta)
+            n_rungs += 1
+
+        rungs = []
+        for rung in range(n_rungs):
+            fraction = min(1.0, cfg.get('min_data_fraction', 0.1) * eta ** rung)
+            rounds = int(min(cfg.get('max_rounds', 1000), cfg.get('min_rounds', 100) * eta ** rung))
+            rungs.append((fraction, rounds))
+        return rungs
+
+    def _log_rung(self, results, trials, trial_run_ids, rung, fraction, rounds):
+        """Logs each trial's rung result to its own nested run, in trial order."""
+        for result in results:
+            trial_id = result.fold
+            run_id = trial_run_ids.get(trial_id)
+
+            with self.tracker.start_run(
+                run_name=None if run_id else f"trial_{trial_id:03d}", nested=True, run_id=run_id
+            ) as trial_run:
+                if run_id is None:
+                    trial_run_ids[trial_id] = trial_run.info.run_id
+                    self.tracker.log_metadata(params=trials[trial_id], metrics={})
+
+                self.tracker.log_metadata(
+                    params={},
+                    metrics={
+                        "rmse": result.metrics['RMSE'],
+                        "data_fraction": fraction,
+                        "num_boost_round": rounds,
+                        "best_iteration": result.model.best_iteration,
+                        "train_seconds": result.execution_time_seconds
+                    },
+                    step=rung
+                )
+
+    def _save_best_params(self, best_params: Dict[str, Any]) -> str:
+        path = Path(self.tuning_cfg['best_params_path'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(best_params, f, indent=2)
+        self.logger.info(f"Best params saved to {path}")
+        return str(path)
+
+
+def run_tuning_stage(config: dict):
+    stage = TuningStage(config)
+    return stage.run()
@@ -0,0 +1,62 @@
+import asyncio
+import datetime
+import pytest
+from pydantic import ValidationError
+from app.backend.schemas.request_schema import PredictionInput
+from app.backend.services.batcher import MicroBatcher
+
+RECORD = {
+    "building_id": 10, "meter": 0, "site_id": 0, "primary_use": "Education", "square_feet": 50000,
+    "air_temperature": 22.5, "cloud_coverage": 2.0, "dew_temperature": 10.0, "precip_depth_1_hr": 0.0,
+    "sea_level_pressure": 1012.0, "wind_direction": 160.0, "wind_speed": 4.0,
+    "day": 1, "month": 5, "week": 18, "hour": 12, "is_weekend": 0
+}
+
+def _predict(records, version):
+    # Like the feature pipeline: one impossible date fails the whole vectorised call
+    return [float(datetime.date(2025, r["month"], r["day"]).day) for r in records]
+
+def test_bad_record_fails_only_its_own_caller():
+    calls = []
+
+    def predict_fn(records, version):
+        calls.append(len(records))
+        return _predict(records, version)
+
+    async def run():
+        batcher = MicroBatcher(predict_fn, max_batch_size=8, max_wait_ms=50)
+        records = [{"month": 5, "day": d} for d in (1, 2, 3)] + [{"month": 2, "day": 30}] + [{"month": 5, "day": 4}]
+        results = await asyncio.gather(*[batcher.submit(r) for r in records], return_exceptions=True)
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+    assert results[:3] == [1.0, 2.0, 3.0] and results[4] == 4.0
+    assert isinstance(results[3], ValueError)
+    # One batched call, then one retry per record
+    assert calls == [5, 1, 1, 1, 1, 1]
+
+def test_full_batch_is_dispatched_before_the_window_ends():
+    async def run():
+        batcher = MicroBatcher(_predict, max_batch_size=4, max_wait_ms=5000)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await asyncio.gather(*[batcher.submit({"month": 5, "day": 1}) for _ in range(4)])
+        elapsed = loop.time() - start
+        await batcher.close()
+        return elapsed
+
+    assert asyncio.run(run()) < 1.0
+
+@pytest.mark.parametrize("field, value", [("month", 13), ("month", 0), ("day", 0), ("day", 32), ("hour", 24), ("hour", -1)])
+def test_out_of_range_time_fields_are_rejected(field, value):
+    with pytest.raises(ValidationError):
+        PredictionInput(**{**RECORD, field: value})
+
+@pytest.mark.parametrize("month, day", [(2, 29), (2, 30), (4, 31)])
+def test_impossible_dates_are_rejected(month, day):
+    with pytest.raises(ValidationError):
+        PredictionInput(**{**RECORD, "month": month, "day": day})
+
+def test_valid_record_is_accepted():
+    assert PredictionInput(**{**RECORD, "month": 12, "day": 31, "hour": 23}).day == 31
@@ -0,0 +1,154 @@
+import threading
+import lightgbm as lgb
+import lightgbm.basic
+import numpy as np
+import pytest
+from src.training import fast_predict
+from src.training.fast_predict import REQUIRED_SYMBOLS, FastBoosterPredictor
+
+N_FEATURES = 4
+CATEGORICAL = 3
+
+@pytest.fixture(scope="module")
+def booster() -> lgb.Booster:
+    """Small regressor with a learned missing direction (feature 0) and a categorical feature (3)."""
+    rng = np.random.default_rng(7)
+    n = 4000
+    X = np.column_stack([
+        rng.normal(size=n),
+        rng.integers(0, 20, n).astype(np.float64),
+        rng.uniform(-5, 5, n),
+        rng.integers(0, 8, n).astype(np.float64),
+    ])
+    y = X[:, 0] * 2 + np.sin(X[:, 1]) + (X[:, 3] % 3) + rng.normal(scale=0.1, size=n)
+    X[rng.random(n) < 0.1, 0] = np.nan
+    # Missing rows get their own target, so the trees learn a non-default missing direction
+    y[np.isnan(X[:, 0])] = -10
+    params = {"objective": "regression", "num_leaves": 15, "min_data_in_leaf": 5, "verbose": -1, "seed": 7}
+    return lgb.train(params, lgb.Dataset(X, label=y, categorical_feature=[CATEGORICAL]), num_boost_round=30)
+
+def _thresholds(booster: lgb.Booster) -> dict:
+    """Numeric split thresholds per feature, read from the model dump."""
+    found = {}
+    stack = [tree["tree_structure"] for tree in booster.dump_model()["tree_info"]]
+    while stack:
+        node = stack.pop()
+        if "split_feature" not in node:
+            continue
+        if node["decision_type"] == "<=":
+            found.setdefault(node["split_feature"], set()).add(float(node["threshold"]))
+        stack += [node["left_child"], node["right_child"]]
+    return found
+
+def _threshold_rows(booster: lgb.Booster, dtype) -> np.ndarray:
+    """Rows placing each feature exactly on, and one ulp either side of, every split threshold."""
+    base = np.array([0.5, 10.0, 0.0, 1.0])
+    rows = []
+    for feature, thresholds in _thresholds(booster).items():
+        for threshold in sorted(thresholds):
+            t = dtype(threshold)
+            for value in (t, np.nextafter(t, dtype(-np.inf)), np.nextafter(t, dtype(np.inf))):
+                row = base.copy()
+                row[feature] = value
+                rows.append(row)
+    return np.asarray(rows, dtype=dtype)
+
+def _assert_parity(predictor: FastBoosterPredictor, booster: lgb.Booster, rows: np.ndarray):
+    expected = booster.predict(rows)
+    np.testing.assert_array_equal(predictor.predict(rows), expected)
+    singles = np.concatenate([predictor.predict(rows[i:i + 1]) for i in range(len(rows))])
+    np.testing.assert_array_equal(singles, expected)
+
+def test_private_lightgbm_api_is_available(booster):
+    # The predictor calls LightGBM's C API through these private names; an upgrade
+    # that drops them would silently send serving back through Booster.predict
+    for name in ("_LIB", "_safe_call", "_c_str"):
+        assert hasattr(lightgbm.basic, name), name
+    for symbol in REQUIRED_SYMBOLS:
+        assert hasattr(lightgbm.basic._LIB, symbol), symbol
+    FastBoosterPredictor(booster)
+
+def test_parity_at_split_thresholds(booster):
+    predictor = FastBoosterPredictor(booster, parity_rows=0)
+    for dtype in (np.float32, np.float64):
+        rows = _threshold_rows(booster, dtype)
+        assert len(rows) > 100
+        _assert_parity(predictor, booster, rows)
+
+def test_parity_on_missing_values(booster):
+    predictor = FastBoosterPredictor(booster, parity_rows=0)
+    rows = np.tile(np.array([0.5, 10.0, 0.0, 1.0], dtype=np.float32), (N_FEATURES + 1, 1))
+    for feature in range(N_FEATURES):
+        rows[feature, feature] = np.nan
+    rows[-1, :] = np.nan
+    # Missing feature 0 follows its learned direction to the -10 leaves
+    assert booster.predict(rows[:1])[0] < -5
+    _assert_parity(predictor, booster, rows)
+    _assert_parity(predictor, booster, rows.astype(np.float64))
+
+def test_parity_on_categorical_values(booster):
+    predictor = FastBoosterPredictor(booster, parity_rows=0)
+    # Seen categories, unseen ones, a negative code and a non-integer value
+    categories = [*range(8), 8, 100, -1, 2.5]
+    rows = np.tile(np.array([0.5, 10.0, 0.0, 0.0], dtype=np.float32), (len(categories), 1))
+    rows[:, CATEGORICAL] = categories
+    _assert_parity(predictor, booster, rows)
+    _assert_parity(predictor, booster, rows.astype(np.float64))
+
+def test_parity_with_best_iteration(booster):
+    truncated = lgb.Booster(model_str=booster.model_to_string())
+    truncated.best_iteration = 5
+    predictor = FastBoosterPredictor(truncated)
+    assert predictor.num_iteration == 5
+
+    rows = predictor.probe_rows(64, seed=3)
+    _assert_parity(predictor, truncated, rows)
+    assert not np.array_equal(predictor.predict(rows), truncated.predict(rows, num_iteration=-1))
+
+def test_one_dimensional_and_float64_inputs(booster):
+    predictor = FastBoosterPredictor(booster, parity_rows=0)
+    rows = predictor.probe_rows(16, seed=5)
+
+    for dtype in (np.float32, np.float64):
+        row = rows[0].astype(dtype)
+        np.testing.assert_array_equal(predictor.predict(row), booster.predict(row.reshape(1, -1)))
+    np.testing.assert_array_equal(predictor.predict(rows.astype(np.float64)), booster.predict(rows.astype(np.float64)))
+
+def test_unsupported_inputs_are_delegated(booster):
+    predictor = FastBoosterPredictor(booster, parity_rows=0)
+    rows = predictor.probe_rows(8, seed=9)
+    int_rows = np.nan_to_num(rows).astype(np.int64)
+    np.testing.assert_array_equal(predictor.predict(int_rows), booster.predict(int_rows))
+    np.testing.assert_array_equal(predictor.predict(rows, pred_contrib=True), booster.predict(rows, pred_contrib=True))
+
+def test_missing_symbols_raise_so_callers_fall_back(booster, monkeypatch):
+    class PartialLib:
+        LGBM_BoosterPredictForMat = None
+
+    monkeypatch.setattr(fast_predict, "_LIB", PartialLib())
+    with pytest.raises(RuntimeError, match="LGBM_BoosterPredictForMatSingleRowFast"):
+        FastBoosterPredictor(booster)
+
+def test_threads_score_single_rows_concurrently(booster):
+    predictor = FastBoosterPredictor(booster, parity_rows=0)
+    rows = predictor.probe_rows(200, seed=11)
+    expected = booster.predict(rows)
+    results, configs = {}, set()
+    # Keeps every thread (and so its FastConfig) alive until all have scored
+    done = threading.Barrier(4)
+
+    def score(worker: int):
+        results[worker] = np.concatenate([predictor.predict(rows[i:i + 1]) for i in range(len(rows))])
+        configs.add(predictor._scorer().config.value)
+        done.wait()
+
+    threads = [threading.Thread(target=score, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for worker in range(4):
+        np.testing.assert_array_equal(results[worker], expected)
+    # Each thread scored through its own FastConfig rather than queueing on a shared one
+    assert len(configs) == 4
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import httpx
+from fastapi import FastAPI
+from app.backend.services.admission import AdmissionMiddleware, ConcurrencyLimiter
+from app.backend.services.metrics import REQUESTS, Counter, MetricsMiddleware, MetricsRegistry
+from src.monitoring.base import FeatureProfile
+from src.monitoring.drift import StreamingDriftMonitor
+
+def _app(release: asyncio.Event) -> FastAPI:
+    """Same middleware order as server.py: admission added first, metrics last (outermost)."""
+    app = FastAPI()
+
+    @app.post("/api/v1/predict")
+    async def predict():
+        await release.wait()
+        return {"status": "success"}
+
+    app.add_middleware(AdmissionMiddleware, limiters={"/api/v1/predict": ConcurrencyLimiter(max_concurrent=1)})
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+def _count(status: str) -> float:
+    return REQUESTS.collect().get(("POST", "/api/v1/predict", status), [0.0])[0]
+
+def test_shed_requests_are_counted_as_503():
+    before_ok, before_shed = _count("200"), _count("503")
+
+    async def run():
+        release = asyncio.Event()
+        transport = httpx.ASGITransport(app=_app(release))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.create_task(client.post("/api/v1/predict"))
+            await asyncio.sleep(0.05)
+            # The only slot is taken and there is no queue: shed
+            shed = await client.post("/api/v1/predict")
+            release.set()
+            return (await first).status_code, shed.status_code
+
+    assert asyncio.run(run()) == (200, 503)
+    assert _count("200") == before_ok + 1
+    assert _count("503") == before_shed + 1
+
+def test_exited_threads_do_not_leave_shards():
+    counter = Counter("test_thread_counter", "Counter written from short-lived threads.")
+    for _ in range(200):
+        thread = threading.Thread(target=counter.inc)
+        thread.start()
+        thread.join()
+
+    child = counter.labels()
+    assert child.total() == [200.0]
+    assert len(child._shards) == 0
+
+def test_drift_windows_are_pooled_across_live_workers(tmp_path):
+    profile = FeatureProfile("air_temperature", "numeric", [0.5, 0.5, 0.0], edges=[20.0])
+    monitor = StreamingDriftMonitor([profile], window_size=100, min_rows=1)
+    for value in (10.0, 10.0, 30.0):
+        monitor.observe({"air_temperature": value})
+
+    registry = MetricsRegistry()
+    registry.configure(str(tmp_path))
+    registry.share("drift", monitor.window_state)
+    registry.write_snapshot()
+    assert (tmp_path / f"{os.getpid()}.drift.json").exists()
+
+    # Another live worker (the test runner's parent) and one that has exited
+    live = {"counts": [0, 5, 0], "rows": 5, "observed": 7}
+    (tmp_path / f"{os.getppid()}.drift.json").write_text(json.dumps(live))
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    (tmp_path / f"{exited.pid}.drift.json").write_text(json.dumps(live))
+
+    states = registry.gather("drift")
+    assert len(states) == 2
+    assert not (tmp_path / f"{exited.pid}.drift.json").exists()
+
+    report = monitor.report(states)
+    assert report["processes"] == 2 and report["window_rows"] == 8 and report["observed"] == 10
+    assert monitor.report()["window_rows"] == 3
+    # Metric snapshots ignore the shared files
+    assert registry._merged() == {}